@@ -1,16 +1,38 @@
 # =====================================================
 # app.py — Main Entry for Mai Shan Yun Dashboard
 # =====================================================
+import sys
+import time
+
+_import_start = time.perf_counter()
+
 import dash
 from dash import html, dcc, Output, Input
 import dash_bootstrap_components as dbc
 
+from data_access import data_version
+from figure_cache import metrics_text
+import figure_json
+
 # =====================================================
-# IMPORT PAGE LAYOUTS & CALLBACKS
+# IMPORT PAGE BUILDERS & CALLBACKS
 # =====================================================
-from page1_revenue import layout as page1_layout, register_callbacks as register_page1_callbacks
-from page2_ingredients_shipments import layout as page2_layout, register_callbacks as register_page2_callbacks
-from page3_forecasts import layout as page3_layout, register_callbacks as register_page3_callbacks
+# Pages load their data and build their figures on first navigation (and
+# again only when the data files change), so importing them is cheap.
+from page1_revenue import build_layout as build_page1, register_callbacks as register_page1_callbacks
+from page2_ingredients_shipments import build_layout as build_page2, register_callbacks as register_page2_callbacks
+from page3_forecasts import build_layout as build_page3, register_callbacks as register_page3_callbacks
+from page3_forecasts import forecast_result, page_data as page3_data
+
+PAGES = {
+    "nav-page1": ("Revenue Overview", build_page1),
+    "nav-page2": ("Ingredients & Shipments", build_page2),
+    "nav-page3": ("Forecasts & Predictions", build_page3),
+}
+
+# Pages that render background-job state (see forecast_jobs) are rebuilt on
+# every navigation; their builds are cheap and must show the latest result.
+LIVE_PAGES = {"nav-page3"}
 
 # =====================================================
 # INITIALIZE DASH APP
@@ -22,6 +44,7 @@ app = dash.Dash(
 )
 app.title = "Mai Shan Yun Dashboard"
 server = app.server
+figure_json.install(server)
 
 # =====================================================
 # APP LAYOUT (Header + Navigation + Dynamic Page Content)
@@ -138,7 +161,7 @@ app.layout = html.Div([
 
     # ---------- PAGE CONTENT ----------
     dbc.Container([
-        html.Div(id="page-content", children=page1_layout)
+        html.Div(id="page-content")
     ])
 ])
 
@@ -154,19 +177,47 @@ app.layout = html.Div([
 def display_page(page1, page2, page3):
     ctx = dash.callback_context
 
-    if not ctx.triggered:
-        return page1_layout
+    button_id = ctx.triggered[0]["prop_id"].split(".")[0] if ctx.triggered else "nav-page1"
+    if button_id not in PAGES:
+        button_id = "nav-page1"
+    return get_page(button_id)
+
+
+# =====================================================
+# LAZY PAGE CACHE + BUILD TIMINGS
+# =====================================================
+_page_cache = {}
+PAGE_BUILD_MS = {}
 
-    button_id = ctx.triggered[0]["prop_id"].split(".")[0]
 
-    if button_id == "nav-page1":
-        return page1_layout
-    elif button_id == "nav-page2":
-        return page2_layout
-    elif button_id == "nav-page3":
-        return page3_layout
-    else:
-        return page1_layout
+def get_page(page_id):
+    """Return the layout for ``page_id``, building it on first use or when the data changed."""
+    version = data_version()
+    hit = _page_cache.get(page_id)
+    if hit is not None and hit[0] == version:
+        return hit[1]
+
+    name, build = PAGES[page_id]
+    start = time.perf_counter()
+    layout = build()
+    PAGE_BUILD_MS[page_id] = (time.perf_counter() - start) * 1000
+    if page_id in LIVE_PAGES:
+        return layout
+    print(f"⏱️  Built {name} page in {PAGE_BUILD_MS[page_id]:.0f} ms")
+    _page_cache[page_id] = (version, layout)
+    return layout
+
+
+def startup_report():
+    """Print import time, then build every page once and print how long each took."""
+    print(f"\n⏱️  Startup — app import {IMPORT_MS:.0f} ms")
+    for page_id, (name, _) in PAGES.items():
+        get_page(page_id)
+    page3_data(wait=True)
+    print("-" * 40)
+    for page_id, (name, _) in PAGES.items():
+        print(f"{name:<26} {PAGE_BUILD_MS[page_id]:>8.0f} ms")
+    print(f"{'Forecast job (background)':<26} {forecast_result().seconds * 1000:>8.0f} ms")
 
 # =====================================================
 # REGISTER CALLBACKS FOR ALL PAGES
@@ -175,8 +226,21 @@ register_page1_callbacks(app)
 register_page2_callbacks(app)
 register_page3_callbacks(app)
 
+IMPORT_MS = (time.perf_counter() - _import_start) * 1000
+
+
+# =====================================================
+# METRICS (figure cache hit/miss counters, Prometheus text format)
+# =====================================================
+@server.route("/metrics")
+def metrics():
+    return metrics_text(), 200, {"Content-Type": "text/plain; version=0.0.4"}
+
 # =====================================================
 # RUN APP
 # =====================================================
 if __name__ == "__main__":
+    if "--startup-report" in sys.argv:
+        startup_report()
+        sys.exit(0)
     app.run_server(host="0.0.0.0", port=10000, debug=False)
\ No newline at end of file
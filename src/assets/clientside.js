@@ -0,0 +1,47 @@
+// =====================================================
+// Clientside month switching (see clientside_months.py)
+// =====================================================
+// Only used when the app runs with DASHBOARD_CLIENTSIDE_MONTHS=1. Each store
+// holds one server-built bar figure as a template plus the x/y values for
+// every month; switching months swaps those values in without a request.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    months: {
+        barFigure: function (month, store) {
+            if (!store || !month || !store.months[month]) {
+                return {data: [], layout: store ? store.figure.layout : {}};
+            }
+            var values = store.months[month];
+            var figure = JSON.parse(JSON.stringify(store.figure));
+            var trace = figure.data[0];
+            trace.x = values.x;
+            trace.y = values.y;
+            if (trace.text !== undefined) {
+                trace.text = values.y;
+            }
+            if (trace.marker && trace.marker.color !== undefined) {
+                trace.marker.color = values.y;
+            }
+            return figure;
+        },
+
+        categoryInsight: function (month, store) {
+            var values = store && store.months[month];
+            var text;
+            if (!month) {
+                return "⚠️ No month selected.";
+            } else if (!values || values.x.length === 0) {
+                text = "⚠️ No data for " + month + ".";
+            } else {
+                var amount = values.y[0].toLocaleString("en-US", {
+                    minimumFractionDigits: 2, maximumFractionDigits: 2
+                });
+                text = "In **" + month + "**, highest-earning category: **" + values.x[0] + "** ($" + amount + ").";
+            }
+            return {
+                namespace: "dash_core_components",
+                type: "Markdown",
+                props: {children: text, style: {fontSize: "16px", fontWeight: "500"}}
+            };
+        }
+    }
+});
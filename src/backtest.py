@@ -0,0 +1,207 @@
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+# forecast_service imports statsmodels on the first fit; importing it here keeps that out of Fit_ms
+import statsmodels.tsa.holtwinters  # noqa: F401
+
+from forecast_service import HOLT_WINTERS, college_town_adjust, fit_holt_winters
+from holt_batch import fit_holt, forecast_holt, forecast_matrix
+from ingredient_usage import DEMAND_MIN_POINTS, recipe_counts
+from job_outputs import BACKTEST_RESULTS, RESULT_COLUMNS, write_results
+from monthly_store import month_label
+
+# ==========================================
+# Rolling-origin backtest of the page 3 forecast models
+# ==========================================
+# For every origin k from --min-train to the last month, each model is fitted
+# on months [0, k) and asked for up to --horizon months ahead; every forecast
+# that lands on a month we have is scored. MAPE/RMSE are pooled over all
+# (origin, step) pairs, next to the mean wall time of one fit and one
+# predict, so a model change can be judged on accuracy and on cost.
+#
+# Revenue models forecast monthly revenue from its own history. Ingredient
+# models forecast total monthly ingredient usage with the page's
+# revenue -> usage LinearRegression, fed either actual or forecast revenue,
+# or as forecast item volumes pushed through the recipe matrix.
+# Results go to data/backtest_results.csv (see job_outputs), shown on page 3.
+DEFAULT_HORIZON = HOLT_WINTERS["horizon"]
+DEFAULT_MIN_TRAIN = 3
+
+
+# -----------------------------
+#  Revenue models: fit(history) -> predict(months ahead) -> values
+# -----------------------------
+def _holt_winters(history, months):
+    entry = fit_holt_winters(history, {**HOLT_WINTERS, "horizon": len(months)})
+    return lambda: np.array(entry["values"])
+
+
+def _holt_winters_college(history, months):
+    entry = fit_holt_winters(history, {**HOLT_WINTERS, "horizon": len(months)})
+    return lambda: college_town_adjust(months, entry["values"])
+
+
+def _holt_numpy(history, months):
+    fit = fit_holt(history.to_numpy())
+    return lambda: forecast_holt(fit, len(months))[0]
+
+
+def _naive(history, months):
+    last = float(history.iloc[-1])
+    return lambda: np.full(len(months), last)
+
+
+def _mean(history, months):
+    mean = float(history.mean())
+    return lambda: np.full(len(months), mean)
+
+
+REVENUE_MODELS = {
+    "Holt-Winters (page 3 fallback)": _holt_winters,
+    "Holt-Winters + college-town factors": _holt_winters_college,
+    "Holt, batched NumPy engine": _holt_numpy,
+    "Naive (last month)": _naive,
+    "Mean of history": _mean,
+}
+
+
+def monthly_series(cube_df, usage):
+    """Revenue and total ingredient usage per period, indexed by month start."""
+    summary = cube_df[cube_df["Sheet_Type"] == "Summary"]
+    revenue = summary.groupby("Period", observed=True)["Amount"].sum()
+    revenue.index = pd.to_datetime(revenue.index.astype(str))
+    used = usage.groupby("Period")["Total_Used"].sum()
+    used.index = pd.to_datetime(used.index.astype(str))
+    return revenue.asfreq("MS"), used.reindex(revenue.index)
+
+
+def _origins(n, min_train, horizon):
+    """(train length, steps scored) for every rolling origin."""
+    return [(k, min(horizon, n - k)) for k in range(min_train, n)]
+
+
+def _score(target, model, actual, predicted, fit_s, predict_s, fits):
+    actual, predicted = np.asarray(actual, dtype="float64"), np.asarray(predicted, dtype="float64")
+    nonzero = actual != 0
+    errors = predicted - actual
+    return {
+        "Target": target, "Model": model, "Forecasts": len(actual),
+        "MAPE_%": float(np.mean(np.abs(errors[nonzero] / actual[nonzero])) * 100) if nonzero.any() else np.nan,
+        "RMSE": float(np.sqrt(np.mean(errors ** 2))) if len(actual) else np.nan,
+        "Fit_ms": fit_s * 1000 / max(fits, 1), "Predict_ms": predict_s * 1000 / max(fits, 1),
+    }
+
+
+def backtest_revenue(revenue, horizon=DEFAULT_HORIZON, min_train=DEFAULT_MIN_TRAIN, models=REVENUE_MODELS):
+    """One result row per revenue model; also returns each model's forecasts per origin."""
+    rows, forecasts = [], {}
+    origins = _origins(len(revenue), min_train, horizon)
+    for name, model in models.items():
+        actual, predicted, fit_s, predict_s = [], [], 0.0, 0.0
+        forecasts[name] = {}
+        for k, steps in origins:
+            history = revenue.iloc[:k]
+            months = [ts.strftime("%B") for ts in revenue.index[k:k + steps]]
+            start = time.perf_counter()
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                predict = model(history, months)
+            fit_s += time.perf_counter() - start
+            start = time.perf_counter()
+            values = predict()[:steps]
+            predict_s += time.perf_counter() - start
+            forecasts[name][k] = values
+            actual.extend(revenue.iloc[k:k + steps])
+            predicted.extend(values)
+        rows.append(_score("Revenue", name, actual, predicted, fit_s, predict_s, len(origins)))
+    return rows, forecasts
+
+
+def backtest_ingredients(revenue, used, revenue_forecasts, horizon=DEFAULT_HORIZON, min_train=DEFAULT_MIN_TRAIN):
+    """Revenue -> usage LinearRegression, fed actual revenue and each revenue model's forecast."""
+    from sklearn.linear_model import LinearRegression
+
+    rows = []
+    origins = _origins(len(revenue), min_train, horizon)
+    inputs = {"actual revenue": None, **{f"{name} revenue": f for name, f in revenue_forecasts.items()}}
+    for label, forecasts in inputs.items():
+        actual, predicted, fit_s, predict_s = [], [], 0.0, 0.0
+        for k, steps in origins:
+            start = time.perf_counter()
+            reg = LinearRegression().fit(revenue.iloc[:k].to_numpy()[:, None], used.iloc[:k].to_numpy())
+            fit_s += time.perf_counter() - start
+            x = revenue.iloc[k:k + steps].to_numpy() if forecasts is None else forecasts[k]
+            start = time.perf_counter()
+            predicted.extend(reg.predict(np.asarray(x, dtype="float64")[:, None]))
+            predict_s += time.perf_counter() - start
+            actual.extend(used.iloc[k:k + steps])
+        rows.append(_score("Ingredient usage", f"LinearRegression on {label}",
+                           actual, predicted, fit_s, predict_s, len(origins)))
+    return rows
+
+
+def backtest_recipe_demand(cube_df, ingredient_df, used, horizon=DEFAULT_HORIZON, min_train=DEFAULT_MIN_TRAIN):
+    """Item volumes forecast with the batched Holt engine, pushed through the recipe matrix
+    (ingredient_usage.demand_forecast), scored on total usage."""
+    details = cube_df[cube_df["Sheet_Type"] == "Details"].reset_index(drop=True)
+    counted = recipe_counts(details, ingredient_df)
+    if counted is None:
+        return []
+    _, item_counts, _, matrix = counted
+    R = matrix.to_numpy()
+
+    actual, predicted, fit_s, predict_s = [], [], 0.0, 0.0
+    origins = _origins(len(used), min_train, horizon)
+    for k, steps in origins:
+        start = time.perf_counter()
+        volumes = forecast_matrix(item_counts[:k].T, steps, DEMAND_MIN_POINTS).clip(min=0.0)
+        fit_s += time.perf_counter() - start
+        start = time.perf_counter()
+        predicted.extend((volumes.T @ R).sum(axis=1))
+        predict_s += time.perf_counter() - start
+        actual.extend(used.iloc[k:k + steps])
+    return [_score("Ingredient usage", "Recipe matrix × batched Holt item volumes",
+                   actual, predicted, fit_s, predict_s, len(origins))]
+
+
+def run_backtest(cube_df, usage, ingredient_df=None, horizon=DEFAULT_HORIZON, min_train=DEFAULT_MIN_TRAIN):
+    """Backtest every model; returns the results table (RESULT_COLUMNS)."""
+    revenue, used = monthly_series(cube_df, usage)
+    if len(revenue) <= min_train:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    rows, revenue_forecasts = backtest_revenue(revenue, horizon, min_train)
+    if used.notna().all():
+        rows += backtest_ingredients(revenue, used, revenue_forecasts, horizon, min_train)
+        if ingredient_df is not None:
+            rows += backtest_recipe_demand(cube_df, ingredient_df, used, horizon, min_train)
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS).round({"MAPE_%": 2, "RMSE": 2, "Fit_ms": 3, "Predict_ms": 3})
+
+
+def main():
+    from data_access import get_cube, get_ingredients, get_usage
+
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest of the page 3 forecast models.")
+    parser.add_argument("--horizon", type=int, default=DEFAULT_HORIZON,
+                        help=f"months ahead scored from each origin (default: {DEFAULT_HORIZON})")
+    parser.add_argument("--min-train", type=int, default=DEFAULT_MIN_TRAIN,
+                        help=f"months of history at the first origin (default: {DEFAULT_MIN_TRAIN})")
+    args = parser.parse_args()
+
+    cube_df = get_cube()
+    periods = list(cube_df["Period"].cat.categories)
+    print(f"\n🧪 Backtesting on {len(periods)} months "
+          f"({month_label(periods[0])}–{month_label(periods[-1])}), "
+          f"origins from month {args.min_train + 1}, horizon {args.horizon}")
+
+    results = run_backtest(cube_df, get_usage(), get_ingredients(), args.horizon, args.min_train)
+    with pd.option_context("display.width", 160, "display.max_colwidth", 60):
+        print(results.to_string(index=False))
+    write_results(results)
+    print(f"\n✅ Backtest results saved to: {BACKTEST_RESULTS}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import argparse
+import os
+import signal
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from forecast_service import HOLT_WINTERS, forecast
+from holt_batch import fit_holt, forecast_holt
+from job_outputs import FORECAST_TABLE, TABLE_COLUMNS, level_frames, write_table
+from monthly_store import month_label
+
+# ==========================================
+# Batch forecasts for every category and menu item
+# ==========================================
+# Page 3 forecasts aggregate revenue inline. Purchasing needs a forecast per
+# category (revenue) and per menu item (units sold), which is hundreds of
+# series, too many to fit inside a request. This job fits them all on a
+# process pool and writes one table, data/forecast_table.csv, which the page
+# reads through data_access.get_forecast_table().
+#
+# Each series goes through forecast_service.forecast() (so unchanged series
+# are read from the on-disk fit cache) under a per-series time limit. A
+# series that is too sparse, times out or fails to fit gets the mean of its
+# history instead, and its Status column says why. The table's path,
+# columns and loader live in job_outputs.
+DEFAULT_TIMEOUT = 10.0
+MIN_POINTS = 4  # months with sales below which a series gets the mean
+
+
+class SeriesTimeout(Exception):
+    pass
+
+
+@contextmanager
+def time_limit(seconds):
+    """Raise SeriesTimeout in this thread after ``seconds`` (no-op where SIGALRM is unavailable)."""
+    if not seconds or not hasattr(signal, "setitimer"):
+        yield
+        return
+
+    def expire(signum, frame):
+        raise SeriesTimeout(f"no fit within {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def series_tasks(cube_df, timeout=DEFAULT_TIMEOUT):
+    """One ``(level, name, measure, series, timeout)`` task per category and item."""
+    tasks = []
+    for level, (measure, wide) in level_frames(cube_df).items():
+        index = pd.to_datetime(wide.index)
+        for name in wide.columns:
+            tasks.append((level, name, measure, pd.Series(wide[name].to_numpy(), index=index, name=name), timeout))
+    return tasks
+
+
+def forecast_task(task):
+    """Forecast one series; returns its table rows. Runs in a worker process."""
+    level, name, measure, series, timeout = task
+    horizon = HOLT_WINTERS["horizon"]
+    dates = pd.date_range(series.index[-1] + pd.offsets.MonthBegin(), periods=horizon, freq="MS")
+    variant, fit_ms, status = "mean", 0.0, "sparse"
+
+    if (series > 0).sum() >= MIN_POINTS:
+        try:
+            with warnings.catch_warnings(), time_limit(timeout):
+                warnings.simplefilter("ignore")
+                values, info = forecast(series, verbose=False)
+            variant, fit_ms = info["variant"], info["fit_ms"]
+            status = "cached" if info["cached"] else "fitted"
+        except SeriesTimeout:
+            status = "timeout"
+        except Exception:
+            status = "error"
+
+    if variant == "mean":
+        values = pd.Series(float(series.mean()), index=dates)
+    return _rows(level, name, measure, dates, values.to_numpy(), variant, fit_ms, status)
+
+
+def _rows(level, name, measure, dates, values, variant, fit_ms, status):
+    return [
+        {"Level": level, "Name": name, "Measure": measure, "Period": ts.strftime("%Y-%m"),
+         "Month": month_label(ts.strftime("%Y-%m")), "Forecast": max(float(v), 0.0),
+         "Variant": variant, "Fit_ms": fit_ms, "Status": status}
+        for ts, v in zip(dates, values)
+    ]
+
+
+def run_numpy(tasks):
+    """Forecast every task in one batched Holt fit (see holt_batch); no pool needed."""
+    horizon = HOLT_WINTERS["horizon"]
+    Y = np.vstack([task[3].to_numpy() for task in tasks]) if tasks else np.empty((0, 0))
+    dense = (Y > 0).sum(axis=1) >= MIN_POINTS
+
+    start = time.perf_counter()
+    forecasts = forecast_holt(fit_holt(Y[dense]), horizon) if dense.any() else np.empty((0, horizon))
+    fit_ms = round((time.perf_counter() - start) * 1000 / max(dense.sum(), 1), 3)
+
+    rows = []
+    fitted = iter(forecasts)
+    for (level, name, measure, series, _), is_dense in zip(tasks, dense):
+        dates = pd.date_range(series.index[-1] + pd.offsets.MonthBegin(), periods=horizon, freq="MS")
+        if is_dense:
+            rows.extend(_rows(level, name, measure, dates, next(fitted), "trend", fit_ms, "batched"))
+        else:
+            rows.extend(_rows(level, name, measure, dates, [series.mean()] * horizon, "mean", 0.0, "sparse"))
+    table = pd.DataFrame(rows, columns=TABLE_COLUMNS)
+    return table.sort_values(["Level", "Name", "Period"], kind="stable").reset_index(drop=True)
+
+
+def run_batch(tasks, jobs=1):
+    """Forecast every task, on ``jobs`` worker processes when > 1; prints progress."""
+    rows = []
+    step = max(len(tasks) // 10, 1)
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(forecast_task, task) for task in tasks]
+            for done, future in enumerate(as_completed(futures), start=1):
+                rows.extend(future.result())
+                if done % step == 0 or done == len(tasks):
+                    print(f"   … {done}/{len(tasks)} series")
+    else:
+        for done, task in enumerate(tasks, start=1):
+            rows.extend(forecast_task(task))
+            if done % step == 0 or done == len(tasks):
+                print(f"   … {done}/{len(tasks)} series")
+
+    table = pd.DataFrame(rows, columns=TABLE_COLUMNS)
+    return table.sort_values(["Level", "Name", "Period"], kind="stable").reset_index(drop=True)
+
+
+def main():
+    from data_access import get_cube
+
+    parser = argparse.ArgumentParser(description="Forecast every category and menu item into forecast_table.csv.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, metavar="N",
+                        help="fit series on N worker processes (default: all CPUs)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, metavar="SECONDS",
+                        help=f"per-series fit time limit before falling back to the mean (default: {DEFAULT_TIMEOUT:g})")
+    parser.add_argument("--engine", choices=["statsmodels", "numpy"], default="statsmodels",
+                        help="statsmodels fits per series on the pool; numpy fits all series "
+                             "in one batched Holt pass (see holt_batch)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    tasks = series_tasks(get_cube(), args.timeout)
+    if args.engine == "numpy":
+        print(f"\n📈 Forecasting {len(tasks)} series with the batched NumPy Holt engine")
+        table = run_numpy(tasks)
+    else:
+        print(f"\n📈 Forecasting {len(tasks)} series on {args.jobs} process(es)")
+        table = run_batch(tasks, args.jobs)
+    write_table(table)
+
+    per_series = table.drop_duplicates(["Level", "Name"])
+    fitted = per_series.loc[per_series["Status"].isin(["fitted", "batched"]), "Fit_ms"]
+    counts = ", ".join(f"{status}: {n}" for status, n in per_series["Status"].value_counts().items())
+    print(f"\n✅ Forecast table saved to: {FORECAST_TABLE} ({len(per_series)} series — {counts})")
+    print(f"⏱️  Done in {time.perf_counter() - start:.2f} s "
+          f"(fit time {fitted.sum() / 1000:.2f} s summed over newly fitted series)")
+
+
+if __name__ == "__main__":
+    main()
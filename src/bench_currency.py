@@ -0,0 +1,66 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from currency import parse_currency
+
+
+# -----------------------------
+#  Old path: every cell through Python strings
+# -----------------------------
+def legacy_clean(series):
+    cleaned = (
+        series.astype(str)
+        .replace(r"[\$,]", "", regex=True)
+        .replace(",", "", regex=True)
+    )
+    return pd.to_numeric(cleaned, errors="coerce").fillna(0)
+
+
+def make_column(rows, string_share, seed=0):
+    """Synthetic Amount column: mostly floats (as openpyxl returns them),
+    with a share of "$1,234.56"-style strings, negatives and blanks."""
+    rng = np.random.default_rng(seed)
+    amounts = np.round(rng.uniform(0, 20_000, rows), 2)
+    values = amounts.astype(object)
+
+    as_text = rng.random(rows) < string_share
+    idx = np.flatnonzero(as_text)
+    values[idx] = [f"${v:,.2f}" for v in amounts[idx]]
+    values[idx[::50]] = [f"(${v:,.2f})" for v in amounts[idx[::50]]]
+    values[idx[1::97]] = ""
+    values[rng.random(rows) < 0.001] = None
+    return pd.Series(values, dtype=object)
+
+
+def best_of(fn, series, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(series)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark currency cleaning of the Amount column.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"\n⏱️  Currency cleaning — {args.rows:,} rows, best of {args.repeat}\n")
+    print(f"{'string cells':>13} | {'legacy (s)':>10} | {'parse_currency (s)':>18} | {'speedup':>7}")
+    print("-" * 58)
+    for share in (0.0, 0.1, 0.5, 1.0):
+        column = make_column(args.rows, share)
+        legacy = best_of(legacy_clean, column, args.repeat)
+        fast = best_of(parse_currency, column, args.repeat)
+        print(f"{share:>12.0%} | {legacy:>10.3f} | {fast:>18.3f} | {legacy / fast:>6.1f}x")
+
+    # All-float column, as openpyxl returns for numeric cells
+    floats = pd.Series(np.round(np.random.default_rng(1).uniform(0, 20_000, args.rows), 2))
+    legacy = best_of(legacy_clean, floats, args.repeat)
+    fast = best_of(parse_currency, floats, args.repeat)
+    print(f"{'float64':>12} | {legacy:>10.3f} | {fast:>18.3f} | {legacy / fast:>6.1f}x")
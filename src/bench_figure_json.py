@@ -0,0 +1,99 @@
+import argparse
+import json
+import re
+import time
+import warnings
+
+warnings.filterwarnings("ignore")
+
+import app as dashboard
+import figure_cache
+import figure_json
+import forecast_jobs
+import page1_revenue
+import page2_ingredients_shipments
+import page3_forecasts
+
+NAV = ["nav-page1", "nav-page2", "nav-page3"]
+
+
+def navigate(button):
+    """Body of the request the browser sends when a nav button is clicked."""
+    return {
+        "output": "page-content.children",
+        "outputs": {"id": "page-content", "property": "children"},
+        "inputs": [{"id": b, "property": "n_clicks", "value": int(b == button)} for b in NAV],
+        "changedPropIds": [f"{button}.n_clicks"],
+        "state": [],
+    }
+
+
+def pick_month(month):
+    return {
+        "output": "..category-bar-chart.figure...category-insights.children..",
+        "outputs": [{"id": "category-bar-chart", "property": "figure"},
+                    {"id": "category-insights", "property": "children"}],
+        "inputs": [{"id": "month-dropdown", "property": "value", "value": month}],
+        "changedPropIds": ["month-dropdown.value"],
+        "state": [],
+    }
+
+
+def reset(enabled):
+    """Switch freezing on/off and drop every cache that holds figures."""
+    figure_json.ENABLED = enabled
+    for page in (page1_revenue, page2_ingredients_shipments):
+        page._page_data.cache_clear()
+    # Page 3 is computed by a background job (see forecast_jobs): recompute it now
+    forecast_jobs.forget(page3_forecasts.JOB_NAME)
+    page3_forecasts.page_data(wait=True)
+    dashboard._page_cache.clear()
+    for entries, _, _ in figure_cache._caches.values():
+        entries.clear()
+
+
+def comparable(response):
+    """Decoded response minus what changes run to run: page 3's status line and timings."""
+    def strip(node):
+        if isinstance(node, dict):
+            if node.get("props", {}).get("id") == "forecast-status":
+                return {**node, "props": {**node["props"], "children": None}}
+            return {k: strip(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [strip(v) for v in node]
+        if isinstance(node, str):
+            return re.sub(r"[\d,.]+ m?s\b", "… ms", node)
+        return node
+    return strip(json.loads(response))
+
+
+def measure(client, body, repeat):
+    client.post("/_dash-update-component", json=body)  # build + warm caches
+    wall, cpu = time.perf_counter(), time.process_time()
+    for _ in range(repeat):
+        response = client.post("/_dash-update-component", json=body)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    return wall / repeat * 1000, cpu / repeat * 1000, response.get_data()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark callback responses with and without frozen figures.")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    client = dashboard.server.test_client()
+    month = page1_revenue.page_data().month_options[0]["value"]
+    requests = [(f"open {b}", navigate(b)) for b in NAV] + [(f"pick {month}", pick_month(month))]
+
+    print(f"\n⏱️  Callback responses — mean of {args.repeat} requests, JSON engine: {figure_json.ENGINE}\n")
+    print(f"{'request':<16} | {'before ms':>9} | {'after ms':>8} | {'before CPU':>10} | {'after CPU':>9} | {'KB':>6}")
+    print("-" * 72)
+    for name, body in requests:
+        reset(False)
+        before_wall, before_cpu, before = measure(client, body, args.repeat)
+        reset(True)
+        after_wall, after_cpu, after = measure(client, body, args.repeat)
+        assert comparable(before) == comparable(after), f"{name}: responses differ"
+        print(f"{name:<16} | {before_wall:>9.2f} | {after_wall:>8.2f} | "
+              f"{before_cpu:>10.2f} | {after_cpu:>9.2f} | {len(after) / 1024:>6.0f}")
+    print("\n✅ Responses identical with and without frozen figures.")
@@ -0,0 +1,109 @@
+import argparse
+import time
+import warnings
+
+import numpy as np
+
+warnings.filterwarnings("ignore")
+
+from forecast_service import college_town_adjust, forecast
+from ingredient_usage import DEMAND_MIN_POINTS, demand_forecast, recipe_counts
+from prediction_bands import BUDGET_MS, holt_error_model, series_bands, simulate_paths
+
+
+def loop_paths(point, residuals, alpha, beta, n_paths, rng):
+    """Reference: the same draws as simulate_paths, pushed through the Holt recursion path by path."""
+    n, horizon = point.shape
+    centred = residuals - residuals.mean(axis=1, keepdims=True)
+    spread = centred.std(axis=1)
+    bandwidth = 1.06 * residuals.shape[1] ** -0.2
+    months = rng.integers(0, residuals.shape[1], size=(n_paths, horizon))
+    jitter = rng.standard_normal((n, n_paths, horizon))
+
+    paths = np.empty((n_paths, n, horizon))
+    for p in range(n_paths):
+        for s in range(n):
+            # Final state from the point forecasts (point_h = level + h * trend)
+            trend = point[s, 1] - point[s, 0]
+            level = point[s, 0] - trend
+            for h in range(horizon):
+                e = (centred[s, months[p, h]] + bandwidth * spread[s] * jitter[s, p, h]) / np.sqrt(1 + bandwidth ** 2)
+                paths[p, s, h] = level + trend + e
+                new_level = level + trend + alpha[s] * e
+                trend = trend + alpha[s] * beta[s] * e
+                level = new_level
+    return paths
+
+
+def dashboard_inputs():
+    """Details rows, ingredient.csv and the page 3 revenue series with its cached fit."""
+    import pandas as pd
+
+    from data_access import get_cube, get_ingredients
+
+    cube = get_cube()
+    details = cube[cube["Sheet_Type"] == "Details"].reset_index(drop=True)
+    revenue = cube[cube["Sheet_Type"] == "Summary"].groupby("Period", observed=True)["Amount"].sum()
+    revenue.index = pd.to_datetime(revenue.index.astype(str))
+    values, info = forecast(revenue.asfreq("MS"), verbose=False)
+    return details, get_ingredients(), values, info
+
+
+def latency(label, run, repeats, budget_ms):
+    """Time ``run()`` (returns the simulation info) ``repeats`` times against the budget."""
+    infos = [run() for _ in range(repeats)]
+    ms = np.array([info["ms"] for info in infos])
+    paths = np.array([info["paths"] for info in infos])
+    print(f"{label:<28} p50 {np.median(ms):>6.1f} ms   p95 {np.percentile(ms, 95):>6.1f} ms   "
+          f"max {ms.max():>6.1f} ms   paths {int(np.median(paths)):>6,}   "
+          f"over budget {np.mean(ms > budget_ms):>4.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized bootstrap prediction bands.")
+    parser.add_argument("--paths", type=int, default=5_000, help="paths for the loop vs vectorized comparison")
+    parser.add_argument("--sample", type=int, default=200,
+                        help="paths the Python loop simulates (extrapolated to --paths)")
+    parser.add_argument("--repeats", type=int, default=20, help="runs per latency measurement")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    args = parser.parse_args()
+
+    details, ingredient_df, revenue_forecast, revenue_info = dashboard_inputs()
+    _, item_counts, _, _ = recipe_counts(details, ingredient_df)
+    Y = item_counts.T
+    point, residuals, weights = holt_error_model(Y, 3, DEMAND_MIN_POINTS)
+    # weights[h, j] = alpha * (1 + (h - j) * beta) below the diagonal
+    alpha = 2 * weights[:, 1, 0] - weights[:, 2, 0]
+    beta = np.where(alpha > 0, weights[:, 1, 0] / np.maximum(alpha, 1e-12) - 1, 0.0)
+    print(f"\n⏱️  Bootstrap prediction bands — {len(Y)} recipes × {Y.shape[1]} months, horizon 3\n")
+
+    # Closed-form error weights against the recursion, on identical draws
+    vectorized = simulate_paths(point, residuals, weights, args.sample, np.random.default_rng(1))
+    reference = loop_paths(point, residuals, alpha, beta, args.sample, np.random.default_rng(1))
+    gap = np.abs(vectorized - reference).max() / max(np.abs(reference).max(), 1.0)
+    print(f"Vectorized vs recursion on {args.sample} paths: max relative difference {gap:.2e}")
+    assert gap < 1e-9, "closed-form error weights disagree with the Holt recursion"
+
+    start = time.perf_counter()
+    loop_paths(point, residuals, alpha, beta, args.sample, np.random.default_rng(2))
+    looped = (time.perf_counter() - start) * args.paths / args.sample
+
+    start = time.perf_counter()
+    simulate_paths(point, residuals, weights, args.paths, np.random.default_rng(2))
+    batched = time.perf_counter() - start
+
+    print(f"\n{args.paths:,} paths")
+    print(f"{'Python loop (est.)':<24} {looped * 1000:>9.1f} ms")
+    print(f"{'one NumPy operation':<24} {batched * 1000:>9.1f} ms   {looped / batched:>6.0f}x")
+
+    print(f"\nLatency budget {args.budget_ms:g} ms, {args.repeats} runs each")
+    params = revenue_info["params"]
+    factors = college_town_adjust(revenue_forecast.index.strftime("%B"), np.ones(len(revenue_forecast)))
+    latency("Revenue bands",
+            lambda: series_bands(revenue_forecast.to_numpy(), revenue_info["resid"], params["smoothing_level"],
+                                 params.get("smoothing_trend") or 0.0, factors, args.budget_ms)[1],
+            args.repeats, args.budget_ms)
+    latency("Ingredient demand bands",
+            lambda: demand_forecast(details, ingredient_df, budget_ms=args.budget_ms).attrs["bands"],
+            args.repeats, args.budget_ms)
+    print("\n✅ Vectorized paths identical to the Holt recursion on the same draws.")
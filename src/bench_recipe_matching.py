@@ -0,0 +1,87 @@
+import argparse
+import tempfile
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+import numpy as np
+
+from recipe_matching import MATCH_THRESHOLD, match_keys, match_recipes
+
+WORDS = [
+    "beef", "chicken", "pork", "braised", "fried", "rice", "ramen", "tossed", "noodle",
+    "spicy", "wonton", "dumpling", "milk", "tea", "jasmine", "green", "mango", "egg",
+    "cabbage", "pickled", "wings", "thigh", "curry", "soup", "combo", "large", "small",
+    "sesame", "garlic", "scallion", "pancake", "bao", "tofu", "mapo", "shrimp", "lamb",
+]
+
+
+# -----------------------------
+#  Old path: every key against every recipe
+# -----------------------------
+def brute_force(keys, recipe_keys, threshold=MATCH_THRESHOLD):
+    matches = {key: [] for key in keys}
+    for recipe in recipe_keys:
+        for key in keys:
+            if SequenceMatcher(None, key, recipe).ratio() >= threshold:
+                matches[key].append(recipe)
+    return matches
+
+
+def make_names(n, rng, typo_share=0.3):
+    """n distinct 2–4 word menu names; a share get a one-character typo."""
+    names = set()
+    while len(names) < n:
+        name = " ".join(rng.choice(WORDS, size=rng.integers(2, 5)))
+        if rng.random() < typo_share:
+            i = rng.integers(len(name))
+            name = name[:i] + "abcdefghijklmnopqrstuvwxyz"[rng.integers(26)] + name[i + 1:]
+        names.add(name)
+    return sorted(names)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark recipe-to-menu-item fuzzy matching.")
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--recipes", type=int, default=500)
+    parser.add_argument("--sample", type=int, default=50,
+                        help="recipes the brute-force loop runs on (extrapolated to --recipes)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    keys = make_names(args.items, rng)
+    recipe_keys = make_names(args.recipes, rng, typo_share=0.0)
+
+    print(f"\n⏱️  Recipe matching — {len(keys):,} menu keys × {len(recipe_keys):,} recipes\n")
+
+    start = time.perf_counter()
+    expected = brute_force(keys, recipe_keys[:args.sample])
+    legacy = (time.perf_counter() - start) * len(recipe_keys) / args.sample
+
+    start = time.perf_counter()
+    sampled = match_keys(keys, recipe_keys[:args.sample])
+    assert sampled == expected, "indexed matcher disagrees with brute force"
+
+    start = time.perf_counter()
+    matches = match_keys(keys, recipe_keys)
+    indexed = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        table = Path(tmp) / "recipe_matches.json"
+        match_recipes(keys, recipe_keys, path=table)
+        start = time.perf_counter()
+        cached = match_recipes(keys, recipe_keys, path=table)
+        warm = time.perf_counter() - start
+        assert cached == matches
+
+        new_keys = make_names(100, np.random.default_rng(1))
+        start = time.perf_counter()
+        match_recipes(keys + new_keys, recipe_keys, path=table)
+        incremental = time.perf_counter() - start
+
+    matched = sum(bool(found) for found in matches.values())
+    print(f"{'brute force (est.)':<24} {legacy:>9.3f} s")
+    print(f"{'indexed, cold':<24} {indexed:>9.3f} s   {legacy / indexed:>6.0f}x")
+    print(f"{'persisted table, warm':<24} {warm:>9.3f} s")
+    print(f"{'+100 unseen keys':<24} {incremental:>9.3f} s")
+    print(f"\n✅ Matches identical to brute force on {args.sample} recipes; {matched:,} keys matched a recipe.")
@@ -0,0 +1,40 @@
+import json
+import os
+
+from dash import ClientsideFunction, Input, Output, State, dcc
+
+from figure_json import encode
+
+# =====================================================
+# Optional clientside month switching
+# =====================================================
+# With DASHBOARD_CLIENTSIDE_MONTHS=1 the month dropdowns stop calling the
+# server. Each page ships its per-month top-N slices once in a dcc.Store,
+# alongside one fully built bar figure used as a template, and the
+# functions in assets/clientside.js swap the month's values into that
+# template in the browser. With the flag off (the default) the dropdowns
+# use the cached server callbacks.
+ENABLED = os.environ.get("DASHBOARD_CLIENTSIDE_MONTHS", "0") == "1"
+
+
+def month_store(store_id, slices, x, y, template_figure):
+    """dcc.Store holding ``{"figure": template, "months": {month: {"x": [...], "y": [...]}}}``.
+
+    ``slices`` maps month -> DataFrame already sorted and cut to top-N;
+    ``template_figure`` is a single-trace bar figure built the server way.
+    """
+    months = {
+        str(month): {"x": df[x].astype(str).tolist(), "y": df[y].astype(float).tolist()}
+        for month, df in slices.items()
+    }
+    return dcc.Store(id=store_id, data={"figure": json.loads(encode(template_figure)), "months": months})
+
+
+def register_bar_switch(app, graph_id, dropdown_id, store_id):
+    """Render ``graph_id`` from ``store_id`` in the browser when ``dropdown_id`` changes."""
+    app.clientside_callback(
+        ClientsideFunction(namespace="months", function_name="barFigure"),
+        Output(graph_id, "figure"),
+        Input(dropdown_id, "value"),
+        State(store_id, "data"),
+    )
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+# ==========================================
+# Shared currency parsing for POS Amount columns
+# ==========================================
+# openpyxl already returns floats for numeric cells, so only the cells that
+# are still strings ("$3,783.26", "(12.50)", " ") go through the string pass.
+
+
+def parse_currency(series):
+    """Parse a currency column to float64.
+
+    Numeric cells are kept as-is. String cells get one vectorized pass
+    that drops ``$`` and thousands separators; the few strings that still
+    fail to parse are retried as parenthesised negatives (``(12.50)``).
+    Blank or unparseable cells become 0.
+
+    Returns ``(values, n_coerced)`` where ``n_coerced`` counts the cells
+    that were coerced to 0.
+    """
+    if is_numeric_dtype(series.dtype):
+        values = series.astype("float64")
+        missing = values.isna()
+        return values.mask(missing, 0.0), int(missing.sum())
+
+    cells = series.to_numpy(dtype=object)
+    is_text = np.fromiter((isinstance(v, str) for v in cells), dtype=bool, count=len(cells))
+
+    values = np.full(len(cells), np.nan)
+    if not is_text.all():
+        values[~is_text] = pd.to_numeric(cells[~is_text], errors="coerce")
+
+    if is_text.any():
+        text = pd.Series(cells[is_text], dtype=object)
+        text = text.str.replace("$", "", regex=False).str.replace(",", "", regex=False)
+        parsed = pd.to_numeric(text, errors="coerce").to_numpy(dtype="float64")
+
+        failed = np.flatnonzero(np.isnan(parsed))
+        if len(failed):
+            leftover = text.iloc[failed].str.strip()
+            negative = (leftover.str.startswith("(") & leftover.str.endswith(")")).to_numpy()
+            if negative.any():
+                parsed[failed[negative]] = -pd.to_numeric(
+                    leftover[negative].str[1:-1], errors="coerce"
+                ).to_numpy(dtype="float64")
+        values[is_text] = parsed
+
+    missing = np.isnan(values)
+    values[missing] = 0.0
+    return pd.Series(values, index=series.index, name=series.name), int(missing.sum())
@@ -0,0 +1,209 @@
+import hashlib
+import threading
+import pandas as pd
+
+from ingredient_prices import PRICES_CSV, load_prices
+from ingredient_usage import demand_forecast, monthly_usage
+from job_outputs import BACKTEST_RESULTS, FORECAST_TABLE, load_backtest_results, load_forecast_table
+from monthly_store import CUBE_FILE, DATA_DIR, MONTHLY_CSV, display_periods, load_cube, load_monthly_data, period_path
+from supply_projection import (
+    SHIPMENT_MAP_CSV, UNIT_CONVERSIONS_CSV, load_shipment_map, load_unit_conversions, project_supply,
+    shipment_supply,
+)
+
+# =====================================================
+# Shared, memoized data access for the dashboard pages
+# =====================================================
+# Every page used to read and clean cleaned_monthly_data.csv on its own at
+# import. This module loads each source once per process and re-loads it
+# only when the files behind it change (size/mtime fingerprint), so all
+# pages in a gunicorn worker share one copy.
+#
+# The row-level frames and the cube are large, so they are handed out as
+# shallow copies of read-only data: callers may add, drop or rename
+# columns freely, and an in-place write into existing values raises
+# ValueError instead of changing what every other page sees. Small frames
+# are handed out as full copies.
+INGREDIENT_CSV = DATA_DIR / "ingredient.csv"
+SHIPMENT_CSV = DATA_DIR / "shipment.csv"
+
+_lock = threading.RLock()
+_cache = {}
+
+
+def _stat(path):
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return (str(path), None, None)
+    return (str(path), st.st_size, st.st_mtime_ns)
+
+
+def _monthly_sources():
+    periods = display_periods()
+    paths = [period_path(p) for p in periods] if periods else []
+    return periods, tuple(_stat(p) for p in [MONTHLY_CSV, *paths])
+
+
+def _read_only(df):
+    """``df`` rebuilt on read-only views of its arrays (categoricals keep their categories).
+
+    No data is copied, so ``df`` must be a freshly loaded frame that nothing
+    else holds on to.
+    """
+    columns = {}
+    for column in df.columns:
+        values = df[column].array
+        if isinstance(values, pd.Categorical):
+            codes = values.codes.view()
+            codes.flags.writeable = False
+            values = pd.Categorical.from_codes(codes, dtype=values.dtype, validate=False)
+        else:
+            values = df[column].to_numpy(copy=False).view()
+            values.flags.writeable = False
+        columns[column] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def _memoized(name, fingerprint, loader):
+    """Return the cached value for ``name``, re-running ``loader`` if the fingerprint changed."""
+    with _lock:
+        hit = _cache.get(name)
+        if hit is not None and hit[0] == fingerprint:
+            return hit[1]
+        value = loader()
+        _cache[name] = (fingerprint, value)
+        return value
+
+
+def _monthly():
+    periods, fingerprint = _monthly_sources()
+
+    def load():
+        monthly_df = load_monthly_data(periods)
+        return {
+            "monthly": _read_only(monthly_df),
+            "summary": _read_only(monthly_df[monthly_df["Sheet_Type"] == "Summary"].reset_index(drop=True)),
+            "details": _read_only(monthly_df[monthly_df["Sheet_Type"] == "Details"].reset_index(drop=True)),
+        }
+
+    return _memoized("monthly", fingerprint, load)
+
+
+def _cube():
+    periods, fingerprint = _monthly_sources()
+    return _memoized("cube", (*fingerprint, _stat(CUBE_FILE)), lambda: _read_only(load_cube(periods)))
+
+
+def _usage():
+    periods, fingerprint = _monthly_sources()
+
+    def load():
+        cube = _cube()
+        details = cube[cube["Sheet_Type"] == "Details"].reset_index(drop=True)
+        return monthly_usage(details, _csv("ingredients", INGREDIENT_CSV))
+
+    return _memoized("usage", (*fingerprint, _stat(CUBE_FILE), _stat(INGREDIENT_CSV)), load)
+
+
+def _demand():
+    periods, fingerprint = _monthly_sources()
+
+    def load():
+        cube = _cube()
+        details = cube[cube["Sheet_Type"] == "Details"].reset_index(drop=True)
+        return demand_forecast(details, _csv("ingredients", INGREDIENT_CSV))
+
+    return _memoized("demand", (*fingerprint, _stat(CUBE_FILE), _stat(INGREDIENT_CSV)), load)
+
+
+def _supply():
+    periods, fingerprint = _monthly_sources()
+    sources = (*fingerprint, _stat(CUBE_FILE), _stat(INGREDIENT_CSV),
+               _stat(SHIPMENT_CSV), _stat(SHIPMENT_MAP_CSV), _stat(UNIT_CONVERSIONS_CSV))
+
+    def load():
+        shipment_map = load_shipment_map()
+        supply = shipment_supply(_csv("shipments", SHIPMENT_CSV), shipment_map, load_unit_conversions())
+        return project_supply(_usage(), supply, shipment_map)
+
+    return _memoized("supply", sources, load)
+
+
+def _csv(name, path):
+    return _memoized(name, _stat(path), lambda: pd.read_csv(path))
+
+
+# =====================================================
+# PUBLIC ACCESSORS
+# =====================================================
+def data_version():
+    """Short hash of every source file's fingerprint; changes when any file does."""
+    _, monthly = _monthly_sources()
+    parts = [*monthly, _stat(CUBE_FILE), _stat(INGREDIENT_CSV), _stat(SHIPMENT_CSV), _stat(PRICES_CSV),
+             _stat(SHIPMENT_MAP_CSV), _stat(UNIT_CONVERSIONS_CSV), _stat(FORECAST_TABLE),
+             _stat(BACKTEST_RESULTS)]
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:12]
+
+
+def get_monthly():
+    """Typed monthly rows for the displayed periods (see monthly_store)."""
+    return _monthly()["monthly"].copy(deep=False)
+
+
+def get_summary():
+    """Summary-sheet rows (one per Group per month)."""
+    return _monthly()["summary"].copy(deep=False)
+
+
+def get_details():
+    """Details-sheet rows (per Category and per Item Name)."""
+    return _monthly()["details"].copy(deep=False)
+
+
+def get_cube():
+    """Amount/Count sums per Period, Month, Sheet_Type, Group, Category and Item Name
+    for the displayed periods (see monthly_store.build_cube)."""
+    return _cube().copy(deep=False)
+
+
+def get_ingredients():
+    """ingredient.csv as read (recipe grams/counts per menu item)."""
+    return _csv("ingredients", INGREDIENT_CSV).copy()
+
+
+def get_usage():
+    """Month x Ingredient usage (Month, Ingredient, Total_Used) from Details item
+    counts through the recipe matrix (see ingredient_usage)."""
+    return _usage().copy()
+
+
+def get_demand_forecast():
+    """Next months' usage per ingredient: forecast item volumes through the recipe
+    matrix (see ingredient_usage.demand_forecast)."""
+    return _demand().copy()
+
+
+def get_prices():
+    """ingredient_prices.csv: unit price per ingredient with effective-date ranges."""
+    return _memoized("prices", _stat(PRICES_CSV), load_prices).copy()
+
+
+def get_shipments():
+    """shipment.csv as read."""
+    return _csv("shipments", SHIPMENT_CSV).copy()
+
+
+def get_supply_projection():
+    """Days of supply and stockout date per shipped ingredient and month (see supply_projection)."""
+    return _supply().copy()
+
+
+def get_forecast_table():
+    """Per-category and per-item forecasts written by batch_forecast.py (empty until it runs)."""
+    return _memoized("forecast_table", _stat(FORECAST_TABLE), load_forecast_table).copy()
+
+
+def get_backtest_results():
+    """Rolling-origin accuracy and cost per forecast model, written by backtest.py (empty until it runs)."""
+    return _memoized("backtest", _stat(BACKTEST_RESULTS), load_backtest_results).copy()
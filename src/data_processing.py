@@ -1,109 +1,561 @@
+import argparse
+import hashlib
+import json
+import time
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from openpyxl import load_workbook
 from pathlib import Path
 
+from currency import parse_currency
+from monthly_store import CUBE_FILE, atomic_path, discover_workbooks, month_label, write_cube, write_partitions
+
 # ==========================================
 # 1️⃣ Setup
 # ==========================================
 DATA_DIR = Path(__file__).resolve().parents[1] / "data"
 OUTPUT_FILE = DATA_DIR / "cleaned_monthly_data.csv"
 
-# Excel files for each month
-monthly_files = [
-    ("May", "May_Data_Matrix (1).xlsx"),
-    ("June", "June_Data_Matrix.xlsx"),
-    ("July", "July_Data_Matrix (1).xlsx"),
-    ("August", "August_Data_Matrix (1).xlsx"),
-    ("September", "September_Data_Matrix.xlsx"),
-    ("October", "October_Data_Matrix_20251103_214000.xlsx"),
+# Incremental ingestion cache: one cleaned CSV partition per workbook
+# plus a manifest recording the fingerprint each partition was built from.
+CACHE_DIR = DATA_DIR / ".ingest_cache"
+MANIFEST_FILE = CACHE_DIR / "manifest.json"
+
+# Bump whenever the cleaning logic or output schema changes so that
+# cached partitions built by older code are never reused.
+MANIFEST_VERSION = 3
+
+OUTPUT_COLUMNS = [
+    "source_page", "source_table", "Group", "Count", "Amount", "Month", "Sheet_Type",
+    "Category", "Item Name", "Period",
 ]
 
-all_data = []
+# Monthly workbooks are discovered in DATA_DIR by monthly_store.discover_workbooks(),
+# which infers each one's year-month period key from its filename.
+
 
 # ==========================================
-# 2️⃣ Read All Sheets per File
+# 2️⃣ Sheet Cleaning
 # ==========================================
-for month_name, filename in monthly_files:
-    file_path = DATA_DIR / filename
-    print(f"\n📘 Loading {month_name} — {filename}")
+# Rename common columns
+RENAME_MAP = {
+    "group": "Group",
+    "category": "Category",
+    "item_name": "Item Name",
+    "count": "Count",
+    "amount": "Amount",
+}
+
+# Only keep relevant columns
+KEEP_COLUMNS = ["Group", "Category", "Item Name", "Count", "Amount"]
+
+
+def standardize_columns(columns):
+    """Normalize raw header names and map them onto the output names."""
+    return (
+        pd.Index(columns).astype(str).str.strip()
+        .str.replace(" ", "_")
+        .str.replace("-", "_")
+        .str.replace(r"[^\w\s]", "", regex=True)
+        .str.lower()
+        .map(lambda c: RENAME_MAP.get(c, c))
+    )
+
+
+def finish_rows(df, period, idx):
+    """Clean currency values and add metadata to already-projected rows."""
+    # Clean currency column
+    coerced = 0
+    if "Amount" in df.columns:
+        df["Amount"], coerced = parse_currency(df["Amount"])
+    df.attrs["amount_coerced"] = coerced
+
+    # Add metadata columns
+    df["source_page"] = 1
+    df["source_table"] = idx
+    df["Month"] = month_label(period)
+    df["Period"] = period
+
+    # Sheet type
+    if idx == 1:
+        df["Sheet_Type"] = "Summary"
+    else:
+        df["Sheet_Type"] = "Details"
+
+    return df
+
+
+def coerced_note(n):
+    return f" ({n} Amount cells coerced to 0)" if n else ""
+
+
+def clean_sheet(df, period, idx):
+    """Normalize one raw sheet into the cleaned output schema."""
+    df.columns = standardize_columns(df.columns)
+    available_cols = [c for c in KEEP_COLUMNS if c in df.columns]
+    df = df[available_cols].copy()
+    return finish_rows(df, period, idx)
+
+
+def parse_sheet(period, file_path, idx, sheet_name, xls=None):
+    """Read and clean one sheet. Runs inside pool workers when ``--jobs`` > 1."""
+    start = time.perf_counter()
+    df = pd.read_excel(xls if xls is not None else file_path, sheet_name=sheet_name)
+    df = clean_sheet(df, period, idx)
+    df.attrs["parse_seconds"] = time.perf_counter() - start
+    return df
+
+
+def combine_sheets(frames):
+    combined = pd.concat(frames, ignore_index=True)
+    return combined.reindex(columns=OUTPUT_COLUMNS)
+
+
+def parse_workbook(period, file_path):
+    """Read every sheet of one monthly workbook into a single cleaned frame."""
+    start = time.perf_counter()
+    xls = pd.ExcelFile(file_path)
+    sheets = xls.sheet_names
+    print(f"   Found sheets: {sheets}")
+
+    frames = []
+    for idx, sheet_name in enumerate(sheets, start=1):
+        df = parse_sheet(period, file_path, idx, sheet_name, xls=xls)
+        frames.append(df)
+        print(f"   ✅ Loaded sheet {idx}: {sheet_name} — {len(df)} rows{coerced_note(df.attrs['amount_coerced'])}")
+
+    combined = combine_sheets(frames)
+    combined.attrs["parse_seconds"] = time.perf_counter() - start
+    return combined
+
 
+def parse_workbooks_parallel(pending, jobs):
+    """Fan (workbook, sheet) tasks out to a process pool.
+
+    ``pending`` is a list of ``(filename, period, file_path)``. Results
+    are gathered in submission order — workbook order, then sheet index —
+    so the output matches the serial path row for row. Returns a dict of
+    filename -> cleaned frame, or the exception that workbook raised.
+    """
+    results = {}
+    tasks = []
+    for filename, period, file_path in pending:
+        try:
+            sheets = pd.ExcelFile(file_path).sheet_names
+        except Exception as e:
+            results[filename] = e
+            continue
+        tasks.append((filename, period, file_path, sheets))
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        submitted = [
+            (filename, period, sheets, [
+                pool.submit(parse_sheet, period, file_path, idx, sheet_name)
+                for idx, sheet_name in enumerate(sheets, start=1)
+            ])
+            for filename, period, file_path, sheets in tasks
+        ]
+
+        for filename, period, sheets, futures in submitted:
+            print(f"\n📘 Loaded {period} — {filename}")
+            print(f"   Found sheets: {sheets}")
+            try:
+                frames = []
+                for idx, (sheet_name, future) in enumerate(zip(sheets, futures), start=1):
+                    df = future.result()
+                    frames.append(df)
+                    print(f"   ✅ Loaded sheet {idx}: {sheet_name} — {len(df)} rows"
+                          f"{coerced_note(df.attrs['amount_coerced'])}")
+                # Worker time summed over the workbook's sheets
+                seconds = sum(df.attrs["parse_seconds"] for df in frames)
+                results[filename] = combine_sheets(frames)
+                results[filename].attrs["parse_seconds"] = seconds
+            except Exception as e:
+                results[filename] = e
+
+    return results
+
+
+# ==========================================
+# 3️⃣ Streaming Reader (very large exports)
+# ==========================================
+# Rows per cleaned chunk; bounds peak memory when streaming a sheet.
+STREAM_CHUNK_ROWS = 50_000
+
+
+def iter_sheet_chunks(ws, period, idx, chunk_rows=STREAM_CHUNK_ROWS):
+    """Yield cleaned frames of at most ``chunk_rows`` rows from a read-only sheet.
+
+    The header row is resolved once and only the output columns are
+    projected out of each row, so memory is bounded by the chunk size
+    rather than the sheet size. Blank rows are skipped, as read_excel does.
+    """
+    rows = ws.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return
+
+    names = standardize_columns(["" if h is None else h for h in header])
+    positions = {}
+    for pos, name in enumerate(names):
+        if name in KEEP_COLUMNS and name not in positions:
+            positions[name] = pos
+    columns = [c for c in KEEP_COLUMNS if c in positions]
+    picks = [positions[c] for c in columns]
+
+    buffer = []
+    for row in rows:
+        if all(v is None or v == "" for v in row):
+            continue
+        buffer.append([row[i] if i < len(row) else None for i in picks])
+        if len(buffer) >= chunk_rows:
+            yield finish_rows(pd.DataFrame(buffer, columns=columns), period, idx)
+            buffer = []
+    if buffer:
+        yield finish_rows(pd.DataFrame(buffer, columns=columns), period, idx)
+
+
+def stream_workbook(period, file_path, part, chunk_rows=STREAM_CHUNK_ROWS):
+    """Stream every sheet of a workbook into partition ``part``.
+
+    Uses openpyxl's read-only row iterator and appends each cleaned chunk
+    to the partition as soon as it is ready. Runs inside pool workers
+    when ``--jobs`` > 1. Returns ``(rows, parse_seconds)``.
+    """
+    start = time.perf_counter()
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    total = 0
     try:
-        # Load the workbook
-        xls = pd.ExcelFile(file_path)
-        sheets = xls.sheet_names
-        print(f"   Found sheets: {sheets}")
-
-        # Loop through all sheets
-        for idx, sheet_name in enumerate(sheets, start=1):
-            df = pd.read_excel(xls, sheet_name=sheet_name)
-
-            # Standardize column names
-            df.columns = (
-                df.columns.str.strip()
-                .str.replace(" ", "_")
-                .str.replace("-", "_")
-                .str.replace(r"[^\w\s]", "", regex=True)
-                .str.lower()
-            )
-
-            # Rename common columns
-            rename_map = {
-                "group": "Group",
-                "category": "Group",
-                "count": "Count",
-                "amount": "Amount",
-            }
-            df = df.rename(columns=rename_map)
-
-            # Only keep relevant columns
-            expected_cols = ["Group", "Count", "Amount"]
-            available_cols = [c for c in expected_cols if c in df.columns]
-            df = df[available_cols]
-
-            # Clean currency column
-            if "Amount" in df.columns:
-                df["Amount"] = (
-                    df["Amount"]
-                    .astype(str)
-                    .replace("[\$,]", "", regex=True)
-                    .replace(",", "", regex=True)
-                )
-                df["Amount"] = pd.to_numeric(df["Amount"], errors="coerce").fillna(0)
-
-            # Add metadata columns
-            df["source_page"] = 1
-            df["source_table"] = idx
-            df["Month"] = month_name
-
-            # Sheet type
-            if idx == 1:
-                df["Sheet_Type"] = "Summary"
-            else:
-                df["Sheet_Type"] = "Details"
-
-            all_data.append(df)
-
-            print(f"   ✅ Loaded sheet {idx}: {sheet_name} — {len(df)} rows")
-
-    except Exception as e:
-        print(f"⚠️ Error reading {filename}: {e}")
+        with atomic_path(part) as tmp, open(tmp, "w", newline="", encoding="utf-8") as out:
+            out.write(",".join(OUTPUT_COLUMNS) + "\n")
+            for idx, ws in enumerate(wb.worksheets, start=1):
+                sheet_rows = coerced = 0
+                for chunk in iter_sheet_chunks(ws, period, idx, chunk_rows):
+                    coerced += chunk.attrs["amount_coerced"]
+                    chunk.reindex(columns=OUTPUT_COLUMNS).to_csv(out, header=False, index=False)
+                    sheet_rows += len(chunk)
+                print(f"   ✅ Streamed sheet {idx}: {ws.title} — {sheet_rows} rows{coerced_note(coerced)}")
+                total += sheet_rows
+    finally:
+        wb.close()
+    return total, time.perf_counter() - start
+
 
 # ==========================================
-# 3️⃣ Combine Everything
+# 4️⃣ Fingerprint Manifest
 # ==========================================
-combined_df = pd.concat(all_data, ignore_index=True)
+def file_fingerprint(file_path, previous=None):
+    """Return size, mtime and SHA-256 of a workbook.
 
-# Reorder columns for readability
-combined_df = combined_df[
-    ["source_page", "source_table", "Group", "Count", "Amount", "Month", "Sheet_Type"]
-]
+    When size and mtime match ``previous`` the recorded hash is reused,
+    so unchanged workbooks are never re-read.
+    """
+    stat = file_path.stat()
+    fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if previous and all(previous.get(k) == v for k, v in fingerprint.items()):
+        fingerprint["sha256"] = previous["sha256"]
+        return fingerprint
+
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    fingerprint["sha256"] = digest.hexdigest()
+    return fingerprint
+
+
+def load_manifest():
+    """Load the ingestion manifest, discarding it if written by older code."""
+    if not MANIFEST_FILE.exists():
+        return {}
+    try:
+        manifest = json.loads(MANIFEST_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("workbooks", {})
+
+
+def save_manifest(workbooks):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = {"version": MANIFEST_VERSION, "workbooks": workbooks}
+    with atomic_path(MANIFEST_FILE) as tmp:
+        tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def partition_path(filename):
+    return CACHE_DIR / f"{Path(filename).stem}.csv"
+
+
+def merge_partitions(partitions, output_file):
+    """Concatenate cached partition CSVs (same header) into the output file.
+
+    Written to a temp file and renamed into place, so a running dashboard
+    never sees a half-written CSV.
+    """
+    with atomic_path(output_file) as tmp, open(tmp, "w", newline="", encoding="utf-8") as out:
+        out.write(",".join(OUTPUT_COLUMNS) + "\n")
+        for part in partitions:
+            with open(part, "r", newline="", encoding="utf-8") as fh:
+                fh.readline()  # skip header
+                for line in fh:
+                    out.write(line)
+
+
+# ==========================================
+# 5️⃣ Incremental Ingestion
+# ==========================================
+def stream_pending(pending, jobs, chunk_rows):
+    """Stream each pending workbook into its partition, one pool task per workbook.
+
+    Returns filename -> ``(rows, parse_seconds)`` or the exception raised.
+    """
+    results = {}
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [
+                (filename, period, pool.submit(
+                    stream_workbook, period, file_path, partition_path(filename), chunk_rows))
+                for filename, period, file_path, _ in pending
+            ]
+            for filename, period, future in futures:
+                try:
+                    results[filename] = future.result()
+                    print(f"\n📘 Streamed {period} — {filename} ({results[filename][0]} rows)")
+                except Exception as e:
+                    results[filename] = e
+        return results
+
+    for filename, period, file_path, _ in pending:
+        print(f"\n📘 Streaming {period} — {filename}")
+        try:
+            results[filename] = stream_workbook(period, file_path, partition_path(filename), chunk_rows)
+        except Exception as e:
+            results[filename] = e
+    return results
+
+
+def ingest(full=False, jobs=1, stream=False, chunk_rows=STREAM_CHUNK_ROWS):
+    """Re-parse new or changed workbooks and merge with cached partitions.
+
+    With ``jobs`` > 1 the workbooks that need parsing are split into
+    per-sheet tasks on a process pool. With ``stream`` each workbook is
+    read through openpyxl's read-only iterator and written chunk by chunk.
+    Returns the list of partition files in period order.
+
+    A workbook that fails to (re-)parse keeps its previous manifest entry
+    and partition, so a corrupt re-save never drops a month; only workbooks
+    that are no longer discovered lose theirs.
+    """
+    previous = {} if full else load_manifest()
+    workbooks = {}
+    pending = []
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    def keep_previous(filename):
+        entry = previous.get(filename)
+        if entry and partition_path(filename).exists():
+            print(f"   ↩️  Keeping the last good partition of {filename} ({entry['period']}, {entry['rows']} rows)")
+            workbooks[filename] = entry
+
+    discovered = discover_workbooks(DATA_DIR)
+    for period, file_path in discovered:
+        filename = file_path.name
+        try:
+            entry = previous.get(filename)
+            fingerprint = file_fingerprint(file_path, entry)
+        except Exception as e:
+            print(f"⚠️ Error reading {filename}: {e}")
+            keep_previous(filename)
+            continue
+
+        if (
+            entry
+            and entry.get("sha256") == fingerprint["sha256"]
+            and entry.get("period") == period
+            and partition_path(filename).exists()
+        ):
+            print(f"\n♻️  Reusing {period} — {filename} ({entry['rows']} cached rows)")
+            workbooks[filename] = {**entry, **fingerprint}
+        else:
+            pending.append((filename, period, file_path, fingerprint))
+
+    # Parse new or changed workbooks
+    results = {}
+    if stream:
+        results = stream_pending(pending, jobs, chunk_rows)
+    elif jobs > 1 and pending:
+        parsed = parse_workbooks_parallel(
+            [(filename, period, file_path) for filename, period, file_path, _ in pending], jobs
+        )
+    else:
+        parsed = {}
+        for filename, period, file_path, _ in pending:
+            print(f"\n📘 Loading {period} — {filename}")
+            try:
+                parsed[filename] = parse_workbook(period, file_path)
+            except Exception as e:
+                parsed[filename] = e
+
+    if not stream:
+        for filename, df in parsed.items():
+            if isinstance(df, Exception):
+                results[filename] = df
+                continue
+            with atomic_path(partition_path(filename)) as tmp:
+                df.to_csv(tmp, index=False)
+            results[filename] = (len(df), df.attrs["parse_seconds"])
+
+    for filename, period, _, fingerprint in pending:
+        result = results[filename]
+        if isinstance(result, Exception):
+            print(f"⚠️ Error reading {filename}: {result}")
+            keep_previous(filename)
+            continue
+        rows, seconds = result
+        print(f"⏱️  Parsed {filename}: {rows} rows in {seconds:.2f}s")
+        workbooks[filename] = {
+            **fingerprint,
+            "period": period,
+            "rows": rows,
+            "parse_seconds": round(seconds, 3),
+            "partition": partition_path(filename).name,
+        }
+
+    save_manifest(workbooks)
+
+    # Drop partitions for workbooks that are no longer discovered
+    partitions = [partition_path(path.name) for _, path in discovered if path.name in workbooks]
+    for stale in set(previous) - {path.name for _, path in discovered}:
+        stale_part = partition_path(stale)
+        if stale_part.exists() and stale_part not in partitions:
+            stale_part.unlink()
+
+    return partitions
+
+
+# ==========================================
+# 6️⃣ Combine Everything
+# ==========================================
+def build(full=False, jobs=1, stream=False, chunk_rows=STREAM_CHUNK_ROWS):
+    """Ingest, then atomically replace the cleaned CSV, the period partitions and the aggregate cube."""
+    partitions = ingest(full=full, jobs=jobs, stream=stream, chunk_rows=chunk_rows)
+    if not partitions:
+        print("❌ No workbooks could be loaded.")
+        return None
+
+    merge_partitions(partitions, OUTPUT_FILE)
+    combined_df = pd.read_csv(OUTPUT_FILE)
+
+    print(f"\n✅ Cleaned dataset saved to: {OUTPUT_FILE}")
+    periods = write_partitions(combined_df)
+    if periods:
+        print(f"✅ Typed Arrow partitions saved for periods: {', '.join(periods)}")
+    cube_rows = write_cube(combined_df)
+    if cube_rows:
+        print(f"✅ Aggregate cube saved to: {CUBE_FILE} ({cube_rows} cells)")
+    print(f"📏 Rows: {len(combined_df)} | Columns: {len(combined_df.columns)}")
+    return combined_df
+
+
+# ==========================================
+# 7️⃣ Watch Mode
+# ==========================================
+def workbook_snapshot():
+    """(size, mtime_ns) of every workbook in DATA_DIR, keyed by path."""
+    snapshot = {}
+    for path in DATA_DIR.glob("*.xlsx"):
+        if path.name.startswith("~$"):  # Excel lock files
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:  # removed between listing and stat
+            continue
+        snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+def rebuild(build_kwargs):
+    """``build()`` for watch mode: a ValueError (e.g. two workbooks for one month) is printed, not raised."""
+    try:
+        build(**build_kwargs)
+    except ValueError as e:
+        print(f"❌ Rebuild skipped: {e}", flush=True)
+        return False
+    return True
+
+
+def watch(interval, settle, **build_kwargs):
+    """Poll DATA_DIR and rebuild whenever workbooks are added, changed or removed.
+
+    A change is only ingested once the workbooks have stopped changing for
+    ``settle`` seconds, so an export that is still being copied in is never
+    parsed half-written. Only new or changed workbooks are re-parsed. A
+    rebuild that fails on ambiguous workbook names is reported and retried
+    after the next change.
+    """
+    print(f"👀 Watching {DATA_DIR} (poll every {interval}s, settle {settle}s) — Ctrl+C to stop", flush=True)
+    ingested = workbook_snapshot()
+    rebuild(build_kwargs)
+    last_seen, last_change = ingested, time.monotonic()
+
+    try:
+        while True:
+            time.sleep(interval)
+            current = workbook_snapshot()
+            if current != last_seen:
+                last_seen, last_change = current, time.monotonic()
+                print(f"\n📥 Change detected in {DATA_DIR}; waiting {settle}s for writes to finish", flush=True)
+                continue
+            if current == ingested or time.monotonic() - last_change < settle:
+                continue
+
+            start = time.perf_counter()
+            ingested = current
+            if rebuild(build_kwargs):
+                print(f"⏱️  Rebuild finished in {time.perf_counter() - start:.2f}s", flush=True)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clean and merge the monthly POS workbooks.")
+    parser.add_argument("--full", action="store_true",
+                        help="ignore the ingestion cache and re-parse every workbook")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="parse workbooks and their sheets on N worker processes (default: 1)")
+    parser.add_argument("--stream", action="store_true",
+                        help="stream sheets with openpyxl's read-only reader to bound peak memory")
+    parser.add_argument("--chunk-rows", type=int, default=STREAM_CHUNK_ROWS, metavar="ROWS",
+                        help=f"rows per cleaned chunk in --stream mode (default: {STREAM_CHUNK_ROWS})")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and ingest workbooks as they land in data/")
+    parser.add_argument("--interval", type=float, default=5.0, metavar="SECONDS",
+                        help="--watch polling interval (default: 5)")
+    parser.add_argument("--settle", type=float, default=10.0, metavar="SECONDS",
+                        help="--watch waits this long after the last change before ingesting (default: 10)")
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.chunk_rows < 1:
+        parser.error("--chunk-rows must be at least 1")
+
+    build_kwargs = dict(full=args.full, jobs=args.jobs, stream=args.stream, chunk_rows=args.chunk_rows)
+    if args.watch:
+        watch(args.interval, args.settle, **build_kwargs)
+        return
+
+    combined_df = build(**build_kwargs)
+    if combined_df is None:
+        raise SystemExit(1)
+    print(f"📋 Columns: {list(combined_df.columns)}")
 
-# Save to CSV
-combined_df.to_csv(OUTPUT_FILE, index=False)
+    # Show sample
+    print("\n🔍 Sample:")
+    print(combined_df.head(10))
 
-print(f"\n✅ Cleaned dataset saved to: {OUTPUT_FILE}")
-print(f"📏 Rows: {len(combined_df)} | Columns: {len(combined_df.columns)}")
-print(f"📋 Columns: {list(combined_df.columns)}")
 
-# Show sample
-print("\n🔍 Sample:")
-print(combined_df.head(10))
\ No newline at end of file
+if __name__ == "__main__":
+    main()
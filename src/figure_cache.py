@@ -0,0 +1,78 @@
+import functools
+import threading
+from collections import OrderedDict
+
+from data_access import data_version
+from figure_json import freeze
+
+# =====================================================
+# Bounded LRU cache for callback figures
+# =====================================================
+# Dropdown callbacks rebuild the same Plotly figure every time a user picks
+# a month. ``cached_figure`` memoizes a figure builder per (data version,
+# arguments) in a small LRU, frozen to JSON bytes (see figure_json), so
+# repeat selections are a dict lookup and a data refresh naturally misses.
+# Hit/miss/eviction counters are kept per cache and exposed in Prometheus
+# text format by ``metrics_text`` (served at /metrics by app.py).
+DEFAULT_MAXSIZE = 64
+
+_lock = threading.Lock()
+_caches = {}
+
+
+def cached_figure(name, maxsize=DEFAULT_MAXSIZE):
+    """Decorator: LRU-cache a figure builder's result under ``name``."""
+    def decorate(build):
+        entries = OrderedDict()
+        stats = {"hits": 0, "misses": 0, "evictions": 0}
+        with _lock:
+            _caches[name] = (entries, stats, maxsize)
+
+        @functools.wraps(build)
+        def wrapper(*args):
+            key = (data_version(), *args)
+            with _lock:
+                if key in entries:
+                    entries.move_to_end(key)
+                    stats["hits"] += 1
+                    return entries[key]
+                stats["misses"] += 1
+
+            value = freeze(build(*args))
+            with _lock:
+                entries[key] = value
+                entries.move_to_end(key)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+                    stats["evictions"] += 1
+            return value
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    return decorate
+
+
+def metrics():
+    """``{cache name: {"hits", "misses", "evictions", "size", "maxsize"}}``."""
+    with _lock:
+        return {
+            name: {**stats, "size": len(entries), "maxsize": maxsize}
+            for name, (entries, stats, maxsize) in _caches.items()
+        }
+
+
+def metrics_text():
+    """The counters in Prometheus text exposition format."""
+    snapshot = metrics()
+    lines = []
+    for metric, kind, help_text in [
+        ("hits", "counter", "Figure cache lookups served from the cache."),
+        ("misses", "counter", "Figure cache lookups that built the figure."),
+        ("evictions", "counter", "Figures evicted to stay within maxsize."),
+        ("size", "gauge", "Figures currently cached."),
+    ]:
+        full = f"dashboard_figure_cache_{metric}" + ("_total" if kind == "counter" else "")
+        lines.append(f"# HELP {full} {help_text}")
+        lines.append(f"# TYPE {full} {kind}")
+        lines.extend(f'{full}{{cache="{name}"}} {values[metric]}' for name, values in snapshot.items())
+    return "\n".join(lines) + "\n"
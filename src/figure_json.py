@@ -0,0 +1,92 @@
+import itertools
+import json
+import re
+
+import plotly.graph_objects as go
+from flask import g, has_request_context
+from plotly.io.json import to_json_plotly
+
+try:
+    import orjson
+except ImportError:  # optional: plotly falls back to the json module
+    orjson = None
+
+# =====================================================
+# Serialize-once figures for callback responses
+# =====================================================
+# Dash re-serializes every figure in a response, even figures like
+# revenue_fig that are identical until the data changes. ``freeze(fig)``
+# encodes a figure to JSON once (with orjson when installed) and returns a
+# stand-in that Dash can place anywhere a figure goes.
+#
+# When ``install(server)`` has run, the stand-in serializes to a short
+# placeholder string. An after_request hook then splices the stored bytes
+# into the JSON response in place of it, so the figure is never walked or
+# encoded again. Outside a request (or without the hook) it serializes to
+# the equivalent plain dict.
+ENGINE = "orjson" if orjson is not None else "json"
+ENABLED = True
+
+_PLACEHOLDER = re.compile(rb'"__frozen_figure_(\d+)__"')
+_ids = itertools.count()
+_installed = False
+
+
+def encode(fig):
+    """Figure -> JSON bytes using the fastest available engine."""
+    return to_json_plotly(fig, engine=ENGINE).encode()
+
+
+class FrozenFigure:
+    """A figure encoded once; see ``freeze``."""
+
+    __slots__ = ("id", "data", "_plain")
+
+    def __init__(self, fig):
+        self.id = next(_ids)
+        self.data = encode(fig)
+        self._plain = None
+
+    def to_plotly_json(self):
+        if _installed and has_request_context():
+            frozen = g.setdefault("frozen_figures", {})
+            frozen[self.id] = self.data
+            return f"__frozen_figure_{self.id}__"
+        if self._plain is None:
+            self._plain = json.loads(self.data)
+        return self._plain
+
+
+def freeze(value):
+    """Freeze a Figure (or the Figures in a tuple/list); other values pass through."""
+    if not ENABLED:
+        return value
+    if isinstance(value, go.Figure):
+        return FrozenFigure(value)
+    if isinstance(value, (tuple, list)):
+        return type(value)(freeze(v) for v in value)
+    return value
+
+
+def _splice(response):
+    frozen = g.pop("frozen_figures", None)
+    if not frozen or response.mimetype != "application/json" or response.direct_passthrough:
+        return response
+    if response.headers.get("Content-Encoding"):  # already compressed: the placeholders are not in the bytes
+        return response
+    body = response.get_data()
+    response.set_data(_PLACEHOLDER.sub(lambda m: frozen.get(int(m.group(1)), m.group(0)), body))
+    return response
+
+
+def install(server):
+    """Register the after_request hook that splices frozen figures into responses.
+
+    Call it after anything that compresses responses (e.g. ``Dash(compress=True)``)
+    is set up: Flask runs after_request hooks in reverse order, so the splice
+    then sees the plain body. Responses that already carry a Content-Encoding
+    are left alone.
+    """
+    global _installed
+    server.after_request(_splice)
+    _installed = True
@@ -0,0 +1,114 @@
+import queue
+import threading
+import time
+from types import SimpleNamespace
+
+# =====================================================
+# Background forecast jobs (stale-while-revalidate)
+# =====================================================
+# Page 3's forecasts are computed on one daemon worker thread fed by a
+# queue, never inside a request. ``latest(name, version, compute)`` returns
+# the last completed result at once — possibly for an older data version —
+# and queues ``compute(version)`` when that result is missing or stale.
+# A (name, version) pair is queued at most once: while it is in flight,
+# or after it completed, further requests for it are no-ops. A failed job
+# is queued again by the next request after a backoff that doubles with
+# every failure of the same version, from RETRY_SECONDS to MAX_RETRY_SECONDS.
+RETRY_SECONDS = 30
+MAX_RETRY_SECONDS = 600
+
+_lock = threading.Lock()
+_done = threading.Condition(_lock)
+_jobs = queue.Queue()
+_results = {}      # name -> SimpleNamespace(value, version, finished_at, seconds)
+_failed = {}       # name -> SimpleNamespace(version, message, attempts, retry_at)
+_in_flight = set()  # (name, version)
+_worker = None
+
+
+def _run():
+    while True:
+        name, version, compute = _jobs.get()
+        start = time.perf_counter()
+        try:
+            value = compute(version)
+        except Exception as e:
+            with _lock:
+                previous = _failed.get(name)
+                attempts = previous.attempts + 1 if previous is not None and previous.version == version else 1
+                backoff = min(RETRY_SECONDS * 2 ** (attempts - 1), MAX_RETRY_SECONDS)
+                _failed[name] = SimpleNamespace(version=version, message=str(e), attempts=attempts,
+                                                retry_at=time.time() + backoff)
+            print(f"⚠️ Forecast job {name} failed for data version {version} "
+                  f"(attempt {attempts}, retry after {backoff} s): {e}")
+        else:
+            seconds = time.perf_counter() - start
+            print(f"✅ Forecast job {name} for data version {version} done in {seconds:.2f} s")
+            with _lock:
+                _results[name] = SimpleNamespace(value=value, version=version, finished_at=time.time(),
+                                                 seconds=seconds)
+                _failed.pop(name, None)
+        finally:
+            with _lock:
+                _in_flight.discard((name, version))
+                _done.notify_all()
+
+
+def _ensure_worker():
+    global _worker
+    with _lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_run, name="forecast-jobs", daemon=True)
+            _worker.start()
+
+
+def submit(name, version, compute):
+    """Queue ``compute(version)`` for ``name`` unless it is done, in flight or backing off. True if queued."""
+    with _lock:
+        done = _results.get(name)
+        if (done is not None and done.version == version) or (name, version) in _in_flight:
+            return False
+        failed = _failed.get(name)
+        if failed is not None and failed.version == version and time.time() < failed.retry_at:
+            return False
+        _in_flight.add((name, version))
+    _ensure_worker()
+    _jobs.put((name, version, compute))
+    return True
+
+
+def latest(name, version, compute):
+    """Last completed result for ``name`` (None before the first one), revalidating if stale."""
+    submit(name, version, compute)
+    with _lock:
+        return _results.get(name)
+
+
+def wait(name, version, timeout=None):
+    """Block until ``name`` has a result for ``version`` (or it failed); returns the latest result."""
+    with _done:
+        _done.wait_for(
+            lambda: getattr(_results.get(name), "version", None) == version
+            or (getattr(_failed.get(name), "version", None) == version and (name, version) not in _in_flight),
+            timeout,
+        )
+        return _results.get(name)
+
+
+def failure(name, version):
+    """The failure (message, attempts, retry_at) of the job for (name, version), or None.
+
+    None while a retry is in flight.
+    """
+    with _lock:
+        failed = _failed.get(name)
+        if failed is None or failed.version != version or (name, version) in _in_flight:
+            return None
+        return failed
+
+
+def forget(name):
+    """Drop the stored result and failure for ``name``; the next ``latest()`` recomputes it."""
+    with _lock:
+        _results.pop(name, None)
+        _failed.pop(name, None)
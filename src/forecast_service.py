@@ -0,0 +1,138 @@
+import hashlib
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from monthly_store import DATA_DIR, atomic_path
+
+# ==========================================
+# Holt-Winters forecasts, fitted once per input
+# ==========================================
+# Fitting ExponentialSmoothing costs tens of milliseconds per series and was
+# repeated in every worker on every data version. Here a fit is keyed by a
+# SHA-256 of the input series (dates + values) and the model config, and
+# its parameters and forecast are stored as JSON under data/.forecast_cache/.
+# Any worker that sees the same series again reads the file instead of
+# refitting; a data change produces a new key. Each entry records which
+# model variant was used, how long the fit took, and the in-sample
+# one-step residuals that prediction_bands resamples.
+FORECAST_CACHE = DATA_DIR / ".forecast_cache"
+FORECAST_CACHE_VERSION = 2
+
+HOLT_WINTERS = {"trend": "add", "seasonal": "add", "seasonal_periods": 6, "freq": "MS", "horizon": 3}
+
+# College-town adjustment applied on top of the model: December & January
+# have fewer students (sales dip), February rebounds with the spring semester.
+COLLEGE_TOWN_FACTORS = {"December": 0.75, "January": 0.80, "February": 1.05}
+
+
+def college_town_adjust(months, values):
+    """``values`` scaled by COLLEGE_TOWN_FACTORS for the matching month names."""
+    factors = pd.Series(list(months)).map(COLLEGE_TOWN_FACTORS).fillna(1.0).to_numpy()
+    return np.asarray(values, dtype="float64") * factors
+
+
+def series_hash(series, config):
+    """Identifies a (series, config) pair; a cached forecast is only reused for the same one."""
+    payload = json.dumps([
+        FORECAST_CACHE_VERSION,
+        sorted(config.items()),
+        [str(ts) for ts in series.index],
+        [float(v) for v in series.to_numpy()],
+    ])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _jsonable(value):
+    if isinstance(value, np.ndarray):
+        return [_jsonable(v) for v in value.tolist()]
+    if isinstance(value, (np.floating, float)):
+        return None if np.isnan(value) else float(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.bool_):
+        return bool(value)
+    return value
+
+
+def _variants(n, config, skipped):
+    """Model variants to try, most specific first: ``[(name, kwargs), ...]``.
+
+    statsmodels needs two full seasonal cycles, so the seasonal variant is
+    skipped outright (not attempted and caught) when the series is too short;
+    the reason is appended to ``skipped``.
+    """
+    variants = []
+    periods = config.get("seasonal_periods")
+    if config.get("seasonal") and periods:
+        if n >= 2 * periods:
+            variants.append(("seasonal", {"seasonal": config["seasonal"], "seasonal_periods": periods}))
+        else:
+            skipped.append(f"seasonal: needs {2 * periods} points, have {n}")
+    variants.append(("trend", {"seasonal": None}))
+    return variants
+
+
+def fit_holt_winters(series, config=HOLT_WINTERS):
+    """Fit the first variant that succeeds; returns the cache entry (a dict)."""
+    from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+    start = time.perf_counter()
+    skipped = []
+    for name, kwargs in _variants(len(series), config, skipped):
+        try:
+            fit = ExponentialSmoothing(series, trend=config.get("trend"), freq=config.get("freq"), **kwargs).fit()
+        except Exception as e:
+            skipped.append(f"{name}: {e}")
+            continue
+        forecast = fit.forecast(config["horizon"])
+        return {
+            "variant": name,
+            "skipped": skipped,
+            "fit_ms": round((time.perf_counter() - start) * 1000, 2),
+            "params": {k: _jsonable(v) for k, v in fit.params.items()},
+            "resid": [float(v) for v in fit.resid.to_numpy()],
+            "dates": [ts.strftime("%Y-%m-%d") for ts in forecast.index],
+            "values": [float(v) for v in forecast.to_numpy()],
+        }
+    raise ValueError(f"No Holt-Winters variant could be fitted: {skipped}")
+
+
+def load_forecast(key, cache_dir=FORECAST_CACHE):
+    try:
+        with open(cache_dir / f"{key}.json") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def save_forecast(key, entry, cache_dir=FORECAST_CACHE):
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with atomic_path(cache_dir / f"{key}.json") as tmp:
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+
+
+def forecast(series, config=HOLT_WINTERS, cache_dir=FORECAST_CACHE, verbose=True):
+    """Forecast ``series`` (DatetimeIndex) ``config["horizon"]`` steps ahead.
+
+    Returns ``(forecast Series, info)`` where info holds variant, skipped,
+    fit_ms, params, resid and whether the result came from the cache.
+    """
+    key = series_hash(series, config)
+    entry = load_forecast(key, cache_dir)
+    cached = entry is not None
+    if not cached:
+        entry = fit_holt_winters(series, config)
+        if verbose:
+            print(f"🔁 Fitted Holt-Winters ({entry['variant']}) in {entry['fit_ms']:.0f} ms")
+        try:
+            save_forecast(key, entry, cache_dir)
+        except OSError as e:  # read-only deploys still get the forecast
+            print(f"⚠️ Could not persist forecast: {e}")
+
+    values = pd.Series(entry["values"], index=pd.DatetimeIndex(entry["dates"]), name=series.name)
+    info = {k: entry[k] for k in ("variant", "skipped", "fit_ms", "params", "resid")}
+    return values, {**info, "key": key, "cached": cached}
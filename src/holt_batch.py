@@ -0,0 +1,122 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+# ==========================================
+# Batched Holt (additive trend) smoothing in NumPy
+# ==========================================
+# statsmodels fits one series per call, and each call costs tens of
+# milliseconds of Python overhead. Here all series are rows of one
+# (series x periods) array and every recursion step updates all of them,
+# and every candidate (alpha, beta), at once:
+#
+#   level_t = alpha * y_t + (1 - alpha) * (level_{t-1} + trend_{t-1})
+#   trend_t = beta * (level_t - level_{t-1}) + (1 - beta) * trend_{t-1}
+#   fitted_t = level_{t-1} + trend_{t-1}
+#
+# (beta is statsmodels' smoothing_trend). For fixed (alpha, beta) the fitted
+# values are linear in the initial (level, trend), so the SSE-optimal
+# initial state is a 2x2 least-squares solve per series, which is the
+# statsmodels "estimated" initialization done in closed form. Smoothing
+# parameters come from a grid search: the grid point with the lowest SSE
+# wins per series. The grids run from 0 (alpha = beta = 0 is the least-squares
+# line, which statsmodels also picks for most short noisy series) through a
+# log-spaced low end to steps of 0.05, since the SSE changes fastest near 0.
+ALPHAS = np.concatenate([[0.0], np.geomspace(0.005, 0.05, 4, endpoint=False), np.linspace(0.05, 1.0, 20)])
+BETAS = ALPHAS
+CHUNK_CELLS = 2_500_000  # grid points x series x periods per grid-search block (bounds memory)
+
+
+def holt_filter(Y, alpha, beta, level0, trend0):
+    """Run the recursions over the last axis of ``Y``.
+
+    ``alpha``, ``beta``, ``level0`` and ``trend0`` broadcast against
+    ``Y[..., 0]``. Returns ``(fitted, level, trend)``: the one-step-ahead
+    fitted values and the final state.
+    """
+    Y = np.asarray(Y, dtype="float64")
+    shape = np.broadcast_shapes(Y.shape[:-1], np.shape(alpha), np.shape(beta))
+    level = np.broadcast_to(np.asarray(level0, dtype="float64"), shape).copy()
+    trend = np.broadcast_to(np.asarray(trend0, dtype="float64"), shape).copy()
+    fitted = np.empty(shape + Y.shape[-1:])
+    for t in range(Y.shape[-1]):
+        fitted[..., t] = level + trend
+        new_level = alpha * Y[..., t] + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        level = new_level
+    return fitted, level, trend
+
+
+def _fit_block(Y, alpha, beta):
+    """Best grid point and initial state for each row of ``Y`` (series x periods)."""
+    n, periods = Y.shape
+    a, b = alpha[:, None], beta[:, None]  # (grid, 1) against (grid, series)
+
+    # Fitted values = response to the data from a zero start (d) plus the
+    # responses to a unit initial level / trend, which do not depend on the data.
+    d, _, _ = holt_filter(Y[None, :, :], a, b, 0.0, 0.0)                    # (grid, n, T)
+    c_level, _, _ = holt_filter(np.zeros(periods), alpha, beta, 1.0, 0.0)  # (grid, T)
+    c_trend, _, _ = holt_filter(np.zeros(periods), alpha, beta, 0.0, 1.0)
+
+    e = Y[None, :, :] - d
+    s_ll = (c_level * c_level).sum(axis=1)[:, None]
+    s_lt = (c_level * c_trend).sum(axis=1)[:, None]
+    s_tt = (c_trend * c_trend).sum(axis=1)[:, None]
+    v_l = np.einsum("ct,cnt->cn", c_level, e)
+    v_t = np.einsum("ct,cnt->cn", c_trend, e)
+    det = s_ll * s_tt - s_lt * s_lt
+    ok = np.abs(det) > 1e-9 * (s_ll * s_tt)
+    safe = np.where(ok, det, 1.0)
+    level0 = (s_tt * v_l - s_lt * v_t) / safe
+    trend0 = (s_ll * v_t - s_lt * v_l) / safe
+    sse = np.where(ok, (e * e).sum(axis=2) - level0 * v_l - trend0 * v_t, np.inf)
+
+    best = sse.argmin(axis=0)
+    cols = np.arange(n)
+    return alpha[best], beta[best], level0[best, cols], trend0[best, cols]
+
+
+def fit_holt(Y, alphas=ALPHAS, betas=BETAS):
+    """Grid-search (alpha, beta) and solve the initial state for every row of ``Y``.
+
+    ``Y`` is (series x periods) with at least two periods and no NaNs.
+    Returns a namespace of per-series arrays: alpha, beta, level0, trend0,
+    sse, and the final level/trend that ``forecast_holt`` extends.
+    """
+    Y = np.atleast_2d(np.asarray(Y, dtype="float64"))
+    if Y.shape[1] < 2:
+        raise ValueError("Holt smoothing needs at least two periods")
+    grid_a, grid_b = (g.ravel() for g in np.meshgrid(alphas, betas, indexing="ij"))
+    chunk = max(CHUNK_CELLS // (len(grid_a) * Y.shape[1]), 1)
+
+    params = [np.empty(len(Y)) for _ in range(4)]
+    for start in range(0, len(Y), chunk):
+        block = slice(start, start + chunk)
+        for out, values in zip(params, _fit_block(Y[block], grid_a, grid_b)):
+            out[block] = values
+    alpha, beta, level0, trend0 = params
+
+    fitted, level, trend = holt_filter(Y, alpha, beta, level0, trend0)
+    return SimpleNamespace(
+        alpha=alpha, beta=beta, level0=level0, trend0=trend0,
+        sse=((Y - fitted) ** 2).sum(axis=1), level=level, trend=trend,
+    )
+
+
+def forecast_holt(fit, horizon):
+    """(series x horizon) forecasts: final level + h * final trend."""
+    return fit.level[:, None] + np.arange(1, horizon + 1)[None, :] * fit.trend[:, None]
+
+
+def forecast_matrix(Y, horizon, min_points=2):
+    """(series x horizon) Holt forecasts for every row of ``Y``.
+
+    Rows with fewer than ``min_points`` positive periods (or a history too
+    short for a trend) get their mean instead of a fit.
+    """
+    Y = np.atleast_2d(np.asarray(Y, dtype="float64"))
+    out = np.repeat(Y.mean(axis=1, keepdims=True) if Y.shape[1] else np.zeros((len(Y), 1)), horizon, axis=1)
+    dense = (Y > 0).sum(axis=1) >= max(min_points, 2)
+    if dense.any():
+        out[dense] = forecast_holt(fit_holt(Y[dense]), horizon)
+    return out
@@ -0,0 +1,62 @@
+import pandas as pd
+
+from monthly_store import DATA_DIR
+
+# ==========================================
+# Versioned ingredient prices
+# ==========================================
+# data/ingredient_prices.csv holds one row per price version:
+#
+#   ingredient,unit_price,effective_from,effective_to
+#   rice(g),0.0022,2025-01-01,
+#
+# ``ingredient`` uses the snake_case recipe column names from ingredient.csv,
+# ``unit_price`` is dollars per recipe unit, and a blank ``effective_to``
+# means the price is still current. A usage period is priced at the
+# version in effect on its first day. To record a supplier price change,
+# close the old row and add a new one; costing every period again is a
+# single merge.
+PRICES_CSV = DATA_DIR / "ingredient_prices.csv"
+PRICE_COLUMNS = ["ingredient", "unit_price", "effective_from", "effective_to"]
+
+
+def load_prices(path=PRICES_CSV):
+    """Read the price table with parsed dates, sorted for as-of lookups."""
+    prices = pd.read_csv(path)
+    missing = set(PRICE_COLUMNS) - set(prices.columns)
+    if missing:
+        raise ValueError(f"{path} is missing columns: {', '.join(sorted(missing))}")
+    prices["ingredient"] = prices["ingredient"].astype(str).str.strip()
+    prices["unit_price"] = pd.to_numeric(prices["unit_price"], errors="coerce")
+    prices["effective_from"] = pd.to_datetime(prices["effective_from"])
+    prices["effective_to"] = pd.to_datetime(prices["effective_to"])
+    return prices.sort_values("effective_from", kind="stable").reset_index(drop=True)
+
+
+def estimate_costs(usage, prices):
+    """Add ``Unit_Price`` and ``Estimated_Cost`` to a usage table (see ingredient_usage).
+
+    Each (Period, Ingredient) row is joined to the price in effect on the
+    first day of its period. Ingredients without a price in effect cost 0.
+    """
+    usage = usage.copy()
+    if usage.empty:
+        usage["Unit_Price"] = pd.Series(dtype="float64")
+        usage["Estimated_Cost"] = pd.Series(dtype="float64")
+        return usage
+
+    usage["_start"] = pd.PeriodIndex(usage["Period"].astype(str), freq="M").start_time
+    usage["_order"] = range(len(usage))
+    priced = pd.merge_asof(
+        usage.sort_values("_start", kind="stable"),
+        prices.rename(columns={"ingredient": "Ingredient"}),
+        left_on="_start", right_on="effective_from", by="Ingredient", direction="backward",
+    )
+    expired = priced["effective_to"].notna() & (priced["_start"] > priced["effective_to"])
+    priced["Unit_Price"] = priced["unit_price"].mask(expired).fillna(0.0)
+    priced["Estimated_Cost"] = priced["Total_Used"] * priced["Unit_Price"]
+    return (
+        priced.sort_values("_order")
+        .drop(columns=["_start", "_order", *PRICE_COLUMNS[1:]])
+        .reset_index(drop=True)
+    )
@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+
+from monthly_store import month_label
+from prediction_bands import BAND_COLUMNS, BUDGET_MS, band_columns, holt_error_model, simulate_paths, within_budget
+from recipe_matching import match_rows
+
+# ==========================================
+# Bill-of-materials explosion: item counts -> ingredient usage
+# ==========================================
+# ingredient.csv is turned into a numeric recipe matrix R (recipes x
+# ingredients) once. Matched Details rows are summed into a Month x recipe
+# count matrix C, and usage is the single product C @ R instead of a Python
+# loop over every matched row and ingredient column. Demand forecasts use
+# the same matrix: forecast item volumes F, then F @ R, and their prediction
+# bands push bootstrapped volume paths through R the same way.
+DEMAND_MIN_POINTS = 4  # months with sales below which an item's volume forecast is its mean
+
+
+def clean_recipes(ingredient_df):
+    """ingredient.csv with snake_case ingredient columns and an "Item Name" column."""
+    recipes = ingredient_df.copy()
+    recipes.columns = [c.strip().lower().replace(" ", "_") for c in recipes.columns]
+    return recipes.rename(columns={"item_name": "Item Name"}, errors="ignore")
+
+
+def recipe_matrix(recipes):
+    """Recipes x ingredients float matrix; blank, unparseable or non-positive amounts are 0."""
+    cols = [c for c in recipes.columns if c not in ("Item Name", "key")]
+    values = recipes[cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype="float64")
+    return pd.DataFrame(np.where(values > 0, values, 0.0), columns=cols)
+
+
+def recipe_counts(details_df, ingredient_df):
+    """Period x recipe item counts for the matched Details rows.
+
+    Returns ``(periods, item_counts, matched, matrix)``: the sorted period keys,
+    summed item counts and matched-row counts (both periods x recipes), and
+    the recipe matrix. Returns None when nothing can be matched.
+    """
+    if details_df.empty or ingredient_df.empty:
+        return None
+
+    recipes = clean_recipes(ingredient_df)
+    matrix = recipe_matrix(recipes)
+    pairs = match_rows(details_df, recipes)
+    if pairs.empty or matrix.empty:
+        return None
+
+    month_codes, periods = pd.factorize(details_df["Period"].astype(object).to_numpy()[pairs["row"]], sort=True)
+    pairs = pairs[month_codes >= 0]
+    month_codes = month_codes[month_codes >= 0]
+    recipe = pairs["recipe"].to_numpy()
+    counts = details_df["Count"].to_numpy(dtype="float64")[pairs["row"]]
+
+    # Month x recipe: summed item counts, and how many matched rows fed each cell
+    shape = (len(periods), len(recipes))
+    item_counts = np.zeros(shape)
+    np.add.at(item_counts, (month_codes, recipe), counts)
+    matched = np.zeros(shape)
+    np.add.at(matched, (month_codes, recipe), 1.0)
+    return periods, item_counts, matched, matrix
+
+
+def monthly_usage(details_df, ingredient_df):
+    """Month x Ingredient usage from Details item counts and the recipes.
+
+    ``ingredient_df`` is ingredient.csv as read. Returns long-form
+    ``Month, Period, Ingredient, Total_Used`` rows sorted by Period then Ingredient,
+    with a row for every ingredient a matched item in that month uses
+    (even when its count was 0).
+    """
+    counted = recipe_counts(details_df, ingredient_df)
+    if counted is None:
+        return pd.DataFrame(columns=["Month", "Period", "Ingredient", "Total_Used"])
+    periods, item_counts, matched, matrix = counted
+
+    R = matrix.to_numpy()
+    total = item_counts @ R
+    used = (matched @ (R > 0)) > 0
+
+    m, i = np.nonzero(used)
+    usage = pd.DataFrame({
+        "Month": [month_label(p) for p in periods[m]],
+        "Period": periods[m],
+        "Ingredient": matrix.columns[i],
+        "Total_Used": total[m, i],
+    })
+    return usage.sort_values(["Period", "Ingredient"], ignore_index=True)
+
+
+def demand_forecast(details_df, ingredient_df, horizon=3, min_points=DEMAND_MIN_POINTS, budget_ms=BUDGET_MS):
+    """Per-ingredient usage for the next ``horizon`` periods, with prediction bands.
+
+    Every matched recipe's monthly item count is forecast at once with the
+    batched Holt engine (items sold in fewer than ``min_points`` months get
+    their mean), and the (horizon x recipes) forecast is pushed through the
+    recipe matrix in one product. Bands come from residual-bootstrap volume
+    paths (see prediction_bands) pushed through the same matrix, simulated
+    within ``budget_ms``. Returns ``Month, Period, Ingredient, Forecast_Used``
+    plus ``Lower_80 .. Upper_95`` for every ingredient a matched item uses;
+    ``attrs["bands"]`` holds the simulation's path count and time.
+    """
+    demand = pd.DataFrame(columns=["Month", "Period", "Ingredient", "Forecast_Used", *BAND_COLUMNS])
+    counted = recipe_counts(details_df, ingredient_df)
+    if counted is None:
+        return demand
+    periods, item_counts, matched, matrix = counted
+
+    R = matrix.to_numpy()
+    point, residuals, weights = holt_error_model(item_counts.T, horizon, min_points)  # recipes x horizon
+    total = point.clip(min=0.0).T @ R
+    used = (matched.sum(axis=0) @ (R > 0)) > 0
+
+    # paths x recipes x horizon volumes -> paths x horizon x (used) ingredients
+    R_used = R[:, used]
+    paths, info = within_budget(
+        lambda n, rng: np.einsum("prh,ri->phi", simulate_paths(point, residuals, weights, n, rng).clip(min=0.0),
+                                 R_used),
+        budget_ms,
+    )
+    bands = band_columns(paths)
+
+    last = pd.Period(periods[-1], freq="M")
+    future = [str(last + h) for h in range(1, horizon + 1)]
+    h, i = np.meshgrid(np.arange(horizon), np.arange(used.sum()), indexing="ij")
+    columns = np.flatnonzero(used)[i.ravel()]
+    demand = pd.DataFrame({
+        "Month": [month_label(future[k]) for k in h.ravel()],
+        "Period": [future[k] for k in h.ravel()],
+        "Ingredient": matrix.columns[columns],
+        "Forecast_Used": total[h.ravel(), columns],
+        **{name: q[h.ravel(), i.ravel()] for name, q in bands.items()},
+    })
+    demand.attrs["bands"] = info
+    return demand.sort_values(["Period", "Ingredient"], ignore_index=True)
@@ -0,0 +1,65 @@
+import pandas as pd
+
+from monthly_store import DATA_DIR, atomic_path
+
+# ==========================================
+# Tables written by the forecast jobs and read by the dashboard
+# ==========================================
+# batch_forecast.py and backtest.py are command-line jobs; page 3 only
+# reads what they write. Paths, columns and loaders live here, so that
+# data_access and the pages do not import the job scripts.
+FORECAST_TABLE = DATA_DIR / "forecast_table.csv"
+TABLE_COLUMNS = ["Level", "Name", "Measure", "Period", "Month", "Forecast", "Variant", "Fit_ms", "Status"]
+
+# (level, cube column, measure): categories by revenue, items by units sold
+LEVELS = [("Category", "Category", "Amount"), ("Item", "Item Name", "Count")]
+
+BACKTEST_RESULTS = DATA_DIR / "backtest_results.csv"
+RESULT_COLUMNS = ["Target", "Model", "Forecasts", "MAPE_%", "RMSE", "Fit_ms", "Predict_ms"]
+
+
+def level_frames(cube_df):
+    """``{level: (measure, Period x name frame)}`` from the Details rows of the cube.
+
+    Every frame covers all periods of the cube; months without sales are 0.
+    """
+    details = cube_df[cube_df["Sheet_Type"] == "Details"]
+    periods = [str(p) for p in cube_df["Period"].cat.categories]
+    frames = {}
+    for level, column, measure in LEVELS:
+        rows = details[details[column].notna()]
+        wide = (
+            rows.assign(Period=rows["Period"].astype(str))
+            .pivot_table(index="Period", columns=column, values=measure, aggfunc="sum", observed=True)
+            .reindex(periods)
+            .fillna(0.0)
+        )
+        wide.columns = wide.columns.astype(str).rename(None)
+        frames[level] = (measure, wide)
+    return frames
+
+
+def write_table(table, path=FORECAST_TABLE):
+    with atomic_path(path) as tmp:
+        table.to_csv(tmp, index=False)
+
+
+def load_forecast_table(path=FORECAST_TABLE):
+    """The batch forecast table, or an empty one if the job has not run."""
+    try:
+        return pd.read_csv(path, dtype={"Period": str})
+    except FileNotFoundError:
+        return pd.DataFrame(columns=TABLE_COLUMNS)
+
+
+def write_results(results, path=BACKTEST_RESULTS):
+    with atomic_path(path) as tmp:
+        results.to_csv(tmp, index=False)
+
+
+def load_backtest_results(path=BACKTEST_RESULTS):
+    """The backtest table, or an empty one if backtest.py has not run."""
+    try:
+        return pd.read_csv(path)
+    except FileNotFoundError:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
@@ -0,0 +1,301 @@
+import calendar
+import os
+import re
+import pandas as pd
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    from pyarrow import feather
+except ImportError:  # optional: pages fall back to the CSV
+    feather = None
+
+# ==========================================
+# Period-partitioned store for the cleaned monthly data
+# ==========================================
+# data_processing.py discovers the monthly workbooks in data/, tags every row
+# with a year-month Period key ("2025-05") and writes one typed Arrow IPC
+# (Feather v2) file per period under data/monthly/. Month/Sheet_Type/Period
+# are stored as ordered categoricals, the text columns as dictionary-encoded
+# categoricals and Amount/Count as float64, so the pages read just the
+# periods they display instead of re-parsing and re-cleaning the CSV. The
+# files are memory-mapped, but loading is not zero-copy: to_pandas
+# materializes each partition and the concat copies them into one frame.
+# After that, re-typing and data_access's read-only wrapping reuse those
+# arrays (only the small Period/Month/text categoricals are rebuilt).
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+MONTHLY_CSV = DATA_DIR / "cleaned_monthly_data.csv"
+PERIODS_DIR = DATA_DIR / "monthly"
+CUBE_FILE = DATA_DIR / "monthly_cube.arrow"
+
+SHEET_TYPES = ["Summary", "Details"]
+TEXT_COLUMNS = ["Group", "Category", "Item Name"]
+NUMERIC_COLUMNS = ["Amount", "Count"]
+CUBE_KEYS = ["Period", "Month", "Sheet_Type", "Group", "Category", "Item Name"]
+
+# Year assumed for exports whose filename carries no year or export stamp
+# (the May–October 2025 drops).
+DEFAULT_YEAR = 2025
+
+# How many calendar months of history the pages load. Twelve keeps the
+# month-name labels of the actuals-only charts (pages 1 and 2) unique;
+# charts that add forecast months after them (page 3) label every point
+# with ``period_label`` ("Nov 2025") instead.
+DISPLAY_MONTHS = 12
+
+_MONTHS = {name.lower(): num for num, name in enumerate(calendar.month_name) if name}
+_MONTHS.update({name.lower(): num for num, name in enumerate(calendar.month_abbr) if name})
+_MONTH_WORD = re.compile(r"(?<![a-z])(" + "|".join(sorted(_MONTHS, key=len, reverse=True)) + r")(?![a-z])")
+# "2026-01" but not the year and month of a full date such as "2025-11-03",
+# which is an export stamp (with or without separators).
+_YEAR_MONTH = re.compile(r"(?<!\d)(20\d{2})[-_](0[1-9]|1[0-2])(?![-_]?\d)")
+_EXPORT_STAMP = re.compile(r"(?<!\d)(20\d{2})([-_]?)(0[1-9]|1[0-2])\2([0-3]\d)(?!\d)")
+_YEAR = re.compile(r"(?<!\d)(20\d{2})(?!\d)")
+
+
+# ==========================================
+# Discovery
+# ==========================================
+def infer_period(filename, default_year=DEFAULT_YEAR):
+    """Infer the "YYYY-MM" period a monthly workbook covers from its name.
+
+    Understands ``2026-01_Data_Matrix.xlsx``, ``January_2026_Data_Matrix.xlsx``
+    and exports stamped with their run date such as
+    ``October_Data_Matrix_20251103_214000.xlsx`` or ``..._2025-11-03.xlsx``
+    (a stamp in the following year means the month belongs to the previous
+    one). Returns None when no month can be found.
+    """
+    stem = Path(filename).stem.lower()
+
+    explicit = _YEAR_MONTH.search(stem)
+    if explicit:
+        return f"{explicit.group(1)}-{explicit.group(2)}"
+
+    word = _MONTH_WORD.search(stem)
+    if not word:
+        return None
+    month = _MONTHS[word.group(1)]
+
+    stamp = _EXPORT_STAMP.search(stem)
+    year = _YEAR.search(stem)
+    if stamp:
+        stamp_year, stamp_month = int(stamp.group(1)), int(stamp.group(3))
+        year = stamp_year if month <= stamp_month else stamp_year - 1
+    elif year:
+        year = int(year.group(1))
+    else:
+        year = default_year
+    return f"{year:04d}-{month:02d}"
+
+
+def discover_workbooks(data_dir=DATA_DIR, default_year=DEFAULT_YEAR):
+    """Return ``[(period, path), ...]`` for the monthly workbooks in ``data_dir``.
+
+    Sorted by period. Two workbooks that map to the same period raise
+    ValueError: names without a year fall back to ``default_year``, so next
+    year's ``May_Data_Matrix.xlsx`` would otherwise silently replace this
+    year's. Rename one of them with its year (``May_2026_Data_Matrix.xlsx``).
+    """
+    found = {}
+    for path in sorted(Path(data_dir).glob("*.xlsx")):
+        if path.name.startswith("~$"):  # Excel lock files
+            continue
+        period = infer_period(path.name, default_year)
+        if period is None:
+            continue
+        if period in found:
+            raise ValueError(f"{found[period].name} and {path.name} both map to {period}; "
+                             "remove the duplicate or put its year in the filename")
+        found[period] = path
+    return sorted(found.items())
+
+
+def month_label(period):
+    """Chart label for a period key: "2025-05" -> "May"."""
+    return calendar.month_name[int(str(period)[5:7])]
+
+
+def period_label(period):
+    """Year-qualified chart label for a period key or timestamp: "2025-11" -> "Nov 2025"."""
+    return pd.Period(period, freq="M").strftime("%b %Y")
+
+
+# ==========================================
+# Typing
+# ==========================================
+def to_typed(df, month_order=None):
+    """Coerce a cleaned monthly frame to the typed dashboard schema.
+
+    Files written before periods existed get a Period column derived from
+    Month and DEFAULT_YEAR. ``month_order`` defaults to period order.
+    Columns are replaced, never written in place, so the result shares the
+    arrays of columns that are already typed (e.g. a partition's Amount).
+    """
+    df = df.copy(deep=False)
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns and (df[col].dtype != "float64" or df[col].isna().any()):
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype("float64")
+
+    if "Month" in df.columns:
+        if "Period" not in df.columns:
+            month_num = df["Month"].astype(object).str.lower().map(_MONTHS)
+            df["Period"] = [
+                f"{DEFAULT_YEAR:04d}-{int(m):02d}" if pd.notna(m) else None for m in month_num
+            ]
+        df["Period"] = df["Period"].astype(str).where(df["Period"].notna())
+        periods = sorted(df["Period"].dropna().unique())
+        df["Period"] = pd.Categorical(df["Period"], categories=periods, ordered=True)
+
+        if month_order is None:
+            month_order = list(pd.unique(
+                df.sort_values("Period", kind="stable")["Month"].dropna().astype(object)
+            ))
+        df["Month"] = pd.Categorical(df["Month"], categories=month_order, ordered=True)
+    if "Sheet_Type" in df.columns:
+        df["Sheet_Type"] = pd.Categorical(df["Sheet_Type"], categories=SHEET_TYPES, ordered=True)
+    for col in TEXT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+# ==========================================
+# Partitions
+# ==========================================
+@contextmanager
+def atomic_path(path):
+    """Yield a temp path next to ``path`` and rename it over ``path`` on success.
+
+    The rename is atomic on the same filesystem, so readers see either the
+    old file or the complete new one, never a partial write.
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def period_path(period):
+    return PERIODS_DIR / f"{period}.arrow"
+
+
+def write_partitions(df):
+    """Write one typed Arrow file per period and drop partitions no longer present.
+
+    Returns the periods written, or an empty list when pyarrow is unavailable.
+    """
+    if feather is None:
+        print("⚠️ pyarrow not installed — skipping typed Arrow partitions.")
+        return []
+
+    typed = to_typed(df)
+    PERIODS_DIR.mkdir(parents=True, exist_ok=True)
+    written = []
+    for period, part in typed.groupby("Period", observed=True, sort=True):
+        # Uncompressed so readers can memory-map the buffers without decompressing
+        with atomic_path(period_path(period)) as tmp:
+            feather.write_feather(part.reset_index(drop=True), tmp, compression="uncompressed")
+        written.append(str(period))
+
+    for stale in PERIODS_DIR.glob("*.arrow"):
+        if stale.stem not in written:
+            stale.unlink()
+    return written
+
+
+def available_periods():
+    """Periods with a typed partition on disk, oldest first."""
+    if not PERIODS_DIR.exists():
+        return []
+    return sorted(p.stem for p in PERIODS_DIR.glob("*.arrow"))
+
+
+def display_periods(n=DISPLAY_MONTHS):
+    """Partitioned periods within the ``n`` calendar months ending at the newest
+    one, or None (load everything) when nothing is partitioned yet."""
+    periods = available_periods()
+    if not periods:
+        return None
+    start = pd.Period(periods[-1], freq="M") - (n - 1)
+    return [p for p in periods if pd.Period(p, freq="M") >= start]
+
+
+def load_monthly_data(periods=None, csv_path=MONTHLY_CSV):
+    """Load cleaned monthly data with dashboard dtypes applied.
+
+    Reads the requested period partitions (all of them when
+    ``periods`` is None) if they exist and are at least as new as the CSV;
+    otherwise parses the CSV and filters it. Raises FileNotFoundError when
+    there is no data at all.
+    """
+    csv_path = Path(csv_path)
+    if periods is None:
+        periods = available_periods()
+    paths = [period_path(p) for p in periods]
+    csv_mtime = csv_path.stat().st_mtime_ns if csv_path.exists() else -1
+
+    if feather is not None and paths and all(
+        p.exists() and p.stat().st_mtime_ns >= csv_mtime for p in paths
+    ):
+        frames = [feather.read_table(p, memory_map=True).to_pandas() for p in paths]
+        # Category sets differ between periods, so re-type after combining
+        return to_typed(pd.concat(frames, ignore_index=True))
+
+    df = to_typed(pd.read_csv(csv_path))
+    if periods:
+        df = to_typed(df[df["Period"].isin(periods)])
+    return df
+
+
+# ==========================================
+# Aggregate cube
+# ==========================================
+# Every chart on the pages is a sum of Amount or Count over some of the
+# CUBE_KEYS, so ingest also writes those sums once. The cube has one row per
+# distinct (period, sheet, group, category, item) cell, so page start-up and
+# callbacks scale with the menu rather than the number of POS rows.
+def build_cube(df):
+    """Sum Amount and Count per CUBE_KEYS cell of a cleaned monthly frame.
+
+    Missing keys (Category/Item Name on Summary rows, Group on Details rows)
+    are kept as cells of their own rather than dropped.
+    """
+    typed = to_typed(df)
+    cube = (
+        typed.groupby(CUBE_KEYS, observed=True, dropna=False, sort=True)[NUMERIC_COLUMNS]
+        .sum()
+        .reset_index()
+    )
+    return to_typed(cube, month_order=list(typed["Month"].cat.categories))
+
+
+def write_cube(df):
+    """Materialize the aggregate cube next to the partitions. Returns its row count."""
+    if feather is None:
+        print("⚠️ pyarrow not installed — skipping the aggregate cube.")
+        return 0
+    cube = build_cube(df)
+    with atomic_path(CUBE_FILE) as tmp:
+        feather.write_feather(cube, tmp, compression="uncompressed")
+    return len(cube)
+
+
+def load_cube(periods=None, csv_path=MONTHLY_CSV):
+    """Load the aggregate cube for ``periods`` (all when None).
+
+    Reads the materialized cube if it is at least as new as the CSV,
+    otherwise builds it from the row-level data.
+    """
+    csv_path = Path(csv_path)
+    csv_mtime = csv_path.stat().st_mtime_ns if csv_path.exists() else -1
+    if feather is not None and CUBE_FILE.exists() and CUBE_FILE.stat().st_mtime_ns >= csv_mtime:
+        cube = feather.read_table(CUBE_FILE, memory_map=True).to_pandas()
+        if periods:
+            cube = cube[cube["Period"].astype(str).isin(periods)]
+        # Re-derive the categories from the periods kept, as the row path does
+        cube = cube.astype({col: object for col in TEXT_COLUMNS})
+        return to_typed(cube.reset_index(drop=True))
+    return build_cube(load_monthly_data(periods, csv_path))
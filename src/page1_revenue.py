@@ -1,187 +1,323 @@
-import os
 import pandas as pd
+from functools import lru_cache
+from types import SimpleNamespace
 import plotly.express as px
-from dash import html, dcc, Input, Output
+from dash import html, dcc, ClientsideFunction, Input, Output, State
 import dash_bootstrap_components as dbc
 
+import clientside_months
+from data_access import data_version, get_cube
+from figure_cache import cached_figure
+from figure_json import freeze
+from monthly_store import CUBE_KEYS, month_label, to_typed
+from range_queries import PrefixSums, clamp_range, range_marks
+
 # =====================================================
-# LOAD DATA
+# DATA + FIGURES (built on first navigation, cached per data version)
 # =====================================================
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATA_PATH = os.path.join(BASE_DIR, "../data/cleaned_monthly_data.csv")
+@lru_cache(maxsize=1)
+def _page_data(version):
+    # =====================================================
+    # LOAD DATA (aggregate cube, shared and memoized — see data_access)
+    # =====================================================
+    try:
+        cube_df = get_cube()
+    except FileNotFoundError:
+        print("=" * 50)
+        print("ERROR: cleaned_monthly_data.csv not found.")
+        print("=" * 50)
+        cube_df = to_typed(pd.DataFrame(columns=[*CUBE_KEYS, "Amount", "Count"]))
 
-try:
-    monthly_df = pd.read_csv(DATA_PATH)
-except FileNotFoundError:
-    print("=" * 50)
-    print("ERROR: cleaned_monthly_data.csv not found.")
-    print("=" * 50)
-    monthly_df = pd.DataFrame(columns=["Amount", "Count", "Month", "Sheet_Type", "Category", "Item Name"])
+    # Charts read the pre-aggregated cube, not the row-level data
+    summary_df = cube_df[cube_df["Sheet_Type"] == "Summary"].reset_index(drop=True)
+    details_df = cube_df[cube_df["Sheet_Type"] == "Details"].reset_index(drop=True)
+    month_order = list(cube_df["Month"].cat.categories)
 
-# =====================================================
-# CLEANING
-# =====================================================
-monthly_df["Amount"] = pd.to_numeric(monthly_df["Amount"], errors="coerce").fillna(0)
-monthly_df["Count"] = pd.to_numeric(monthly_df["Count"], errors="coerce").fillna(0)
-month_order = ["May", "June", "July", "August", "September", "October"]
-monthly_df["Month"] = pd.Categorical(monthly_df["Month"], categories=month_order, ordered=True)
+    # =====================================================
+    # GRAPH 1 — Total Monthly Revenue Trend
+    # =====================================================
+    monthly_revenue = summary_df.groupby("Month", as_index=False, observed=False)["Amount"].sum()
+    revenue_fig = px.line(monthly_revenue, x="Month", y="Amount", markers=True,
+                          labels={"Amount": "Revenue ($)", "Month": "Month"})
+    revenue_fig.update_traces(line_color="#8B0000", line_width=3)  # dark red
+    revenue_fig.update_layout(template="plotly_white", height=430, title=None)
 
-summary_df = monthly_df[monthly_df["Sheet_Type"] == "Summary"].copy()
-details_df = monthly_df[monthly_df["Sheet_Type"] == "Details"].copy()
+    # Revenue Stats
+    revenue_insight_1, revenue_insight_2, revenue_insight_3 = "💰 No data.", "📉 No data.", ""
+    if not monthly_revenue.empty:
+        hi = monthly_revenue.loc[monthly_revenue["Amount"].idxmax()]
+        lo = monthly_revenue.loc[monthly_revenue["Amount"].idxmin()]
+        avg_val = monthly_revenue["Amount"].mean()
+        revenue_insight_1 = f"Highest revenue: **{hi['Month']}** — **${hi['Amount']:,.2f}**."
+        revenue_insight_2 = f"Lowest revenue: **{lo['Month']}** — **${lo['Amount']:,.2f}**."
 
-# =====================================================
-# GRAPH 1 — Total Monthly Revenue Trend
-# =====================================================
-monthly_revenue = summary_df.groupby("Month", as_index=False, observed=False)["Amount"].sum()
-revenue_fig = px.line(monthly_revenue, x="Month", y="Amount", markers=True,
-                      labels={"Amount": "Revenue ($)", "Month": "Month"})
-revenue_fig.update_traces(line_color="#8B0000", line_width=3)  # dark red
-revenue_fig.update_layout(template="plotly_white", height=430, title=None)
-
-# Revenue Stats
-revenue_insight_1, revenue_insight_2, revenue_insight_3 = "💰 No data.", "📉 No data.", ""
-if not monthly_revenue.empty:
-    hi = monthly_revenue.loc[monthly_revenue["Amount"].idxmax()]
-    lo = monthly_revenue.loc[monthly_revenue["Amount"].idxmin()]
-    avg_val = monthly_revenue["Amount"].mean()
-    revenue_insight_1 = f"Highest revenue: **{hi['Month']}** — **${hi['Amount']:,.2f}**."
-    revenue_insight_2 = f"Lowest revenue: **{lo['Month']}** — **${lo['Amount']:,.2f}**."
+    # =====================================================
+    # GRAPH 2 — Category Revenue by Month
+    # =====================================================
+    category_revenue = details_df.groupby(["Month", "Category"], as_index=False, observed=False)["Amount"].sum()
+    month_options = [{"label": m, "value": m} for m in month_order if m in category_revenue["Month"].unique()]
 
-# =====================================================
-# GRAPH 2 — Category Revenue by Month
-# =====================================================
-category_revenue = details_df.groupby(["Month", "Category"], as_index=False, observed=False)["Amount"].sum()
-month_options = [{"label": m, "value": m} for m in month_order if m in category_revenue["Month"].unique()]
+    # Top-8 slice per month, so the dropdown callback never filters or sorts
+    ranked = category_revenue.sort_values("Amount", ascending=False, kind="stable")
+    top_categories_by_month = {m: g.head(8) for m, g in ranked.groupby("Month", observed=True, sort=False)}
+
+    # =====================================================
+    # GRAPH 3 — Top 5 Category Trends Over Time
+    # =====================================================
+    top_categories = category_revenue.groupby("Category", observed=False)["Amount"].sum().nlargest(5).index
+    top5_df = category_revenue[category_revenue["Category"].isin(top_categories)].copy()
+    top5_df["Month"] = pd.Categorical(top5_df["Month"], categories=month_order, ordered=True)
+
+    # darker red palette
+    red_palette = ["#B71C1C", "#8B0000", "#A40000", "#C62828", "#D32F2F"]
+    trend_fig = px.line(
+        top5_df,
+        x="Month", y="Amount", color="Category", markers=True,
+        color_discrete_sequence=red_palette
+    )
+    trend_fig.update_traces(line=dict(width=3))
+    trend_fig.update_layout(template="plotly_white", height=430, title=None)
+
+    # =====================================================
+    # GRAPH 4 — Year-to-Date (Cumulative) Revenue + Stats
+    # =====================================================
+    monthly_revenue["Cumulative_Revenue"] = monthly_revenue["Amount"].cumsum()
+    cumulative_fig = px.line(monthly_revenue, x="Month", y="Cumulative_Revenue", markers=True)
+    cumulative_fig.update_traces(line_color="#6A0000", line_width=3)  # deeper crimson
+    cumulative_fig.update_layout(template="plotly_white", height=430, title=None)
+
+    # Month-on-Month Growth
+    monthly_revenue_sorted = monthly_revenue.sort_values("Month")
+    monthly_revenue_sorted["MoM_Growth_%"] = monthly_revenue_sorted["Amount"].pct_change() * 100
+    avg_growth = monthly_revenue_sorted["MoM_Growth_%"].mean()
+    growth_text = "Avg. MoM Growth: N/A"
+    if not pd.isna(avg_growth):
+        growth_text = f"Avg. Month-on-Month Growth: **{avg_growth:.2f}%**"
+
+    total_revenue = monthly_revenue["Amount"].sum()
+    total_revenue_text = f"Total YTD Revenue: **${total_revenue:,.2f}**"
+
+    # =====================================================
+    # GRAPH 5 — Date-Range Revenue (prefix sums, O(1) per range)
+    # =====================================================
+    periods = list(cube_df["Period"].cat.categories)
+    period_labels = {p: month_label(p) for p in periods}
+    revenue_prefix = PrefixSums(summary_df, None, "Amount", periods)
+    category_prefix = PrefixSums(details_df, "Category", "Amount", periods)
+
+    return SimpleNamespace(
+        month_order=month_order, monthly_revenue=monthly_revenue, category_revenue=category_revenue,
+        top_categories_by_month=top_categories_by_month,
+        revenue_fig=freeze(revenue_fig), trend_fig=freeze(trend_fig), cumulative_fig=freeze(cumulative_fig),
+        revenue_insight_1=revenue_insight_1, revenue_insight_2=revenue_insight_2,
+        revenue_insight_3=revenue_insight_3, month_options=month_options,
+        growth_text=growth_text, total_revenue_text=total_revenue_text,
+        periods=periods, period_labels=period_labels,
+        revenue_prefix=revenue_prefix, category_prefix=category_prefix,
+    )
+
+
+def page_data():
+    return _page_data(data_version())
 
-# =====================================================
-# GRAPH 3 — Top 5 Category Trends Over Time
-# =====================================================
-top_categories = category_revenue.groupby("Category", observed=False)["Amount"].sum().nlargest(5).index
-top5_df = category_revenue[category_revenue["Category"].isin(top_categories)].copy()
-top5_df["Month"] = pd.Categorical(top5_df["Month"], categories=month_order, ordered=True)
-
-# darker red palette
-red_palette = ["#B71C1C", "#8B0000", "#A40000", "#C62828", "#D32F2F"]
-trend_fig = px.line(
-    top5_df,
-    x="Month", y="Amount", color="Category", markers=True,
-    color_discrete_sequence=red_palette
-)
-trend_fig.update_traces(line=dict(width=3))
-trend_fig.update_layout(template="plotly_white", height=430, title=None)
 
 # =====================================================
-# GRAPH 4 — Year-to-Date (Cumulative) Revenue + Stats
+# PAGE 1 LAYOUT (built on first navigation)
 # =====================================================
-monthly_revenue["Cumulative_Revenue"] = monthly_revenue["Amount"].cumsum()
-cumulative_fig = px.line(monthly_revenue, x="Month", y="Cumulative_Revenue", markers=True)
-cumulative_fig.update_traces(line_color="#6A0000", line_width=3)  # deeper crimson
-cumulative_fig.update_layout(template="plotly_white", height=430, title=None)
-
-# Month-on-Month Growth
-monthly_revenue_sorted = monthly_revenue.sort_values("Month")
-monthly_revenue_sorted["MoM_Growth_%"] = monthly_revenue_sorted["Amount"].pct_change() * 100
-avg_growth = monthly_revenue_sorted["MoM_Growth_%"].mean()
-growth_text = "Avg. MoM Growth: N/A"
-if not pd.isna(avg_growth):
-    growth_text = f"Avg. Month-on-Month Growth: **{avg_growth:.2f}%**"
-
-total_revenue = monthly_revenue["Amount"].sum()
-total_revenue_text = f"Total YTD Revenue: **${total_revenue:,.2f}**"
+def build_layout():
+    data = page_data()
+    layout = html.Div([
+        html.H2("Revenue & Category Overview", className="text-center fw-bold mt-4 mb-4", style={"color": "#2B0000"}),
+
+        # ROW 1
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Total Monthly Revenue Trend", className="fw-bold text-center text-white",
+                                   style={"backgroundColor": "#8B0000"}),  # dark red
+                    dbc.CardBody([
+                        dcc.Graph(figure=data.revenue_fig, style={"height": "430px"}),
+                        html.Div([
+                            dcc.Markdown(data.revenue_insight_1, style={'fontSize': '16px', 'fontWeight': '500'}),
+                            dcc.Markdown(data.revenue_insight_2, style={'fontSize': '16px', 'fontWeight': '500'}),
+                            dcc.Markdown(data.revenue_insight_3, style={'fontSize': '16px', 'fontWeight': '500'})
+                        ], style={'textAlign': 'center', 'marginTop': '10px'})
+                    ])
+                ], className="shadow-sm")
+            ], width=7),
+
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Year-to-Date Revenue Trend", className="fw-bold text-center text-white",
+                                   style={"backgroundColor": "#8B0000"}),
+                    dbc.CardBody([
+                        dcc.Graph(figure=data.cumulative_fig, style={"height": "430px"}),
+                        html.Div([
+                            dcc.Markdown(data.total_revenue_text, style={
+                                'textAlign': 'center', 'fontSize': '16px',
+                                'fontWeight': '500', 'marginTop': '10px'
+                            }),
+                            dcc.Markdown(data.growth_text, style={
+                                'textAlign': 'center', 'fontSize': '16px',
+                                'fontWeight': '500', 'marginTop': '4px'
+                            })
+                        ])
+                    ])
+                ], className="shadow-sm")
+            ], width=5)
+        ], className="g-4 mb-4", style={"padding": "0px 30px"}),
+
+        # ROW 2
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Top 8 Category Revenue by Month", className="fw-bold text-center text-white",
+                                   style={"backgroundColor": "#8B0000"}),
+                    dbc.CardBody([
+                        html.Div([
+                            html.Label("Select Month:", style={"fontWeight": "bold", "display": "block"}),
+                            dcc.Dropdown(
+                                id="month-dropdown", options=data.month_options,
+                                value=data.month_options[0]["value"] if data.month_options else None,
+                                clearable=False, style={
+                                    "width": "40%", "margin": "10px auto 20px auto", "textAlign": "center"
+                                }
+                            )
+                        ], style={"textAlign": "center"}),
+
+                        dcc.Graph(id="category-bar-chart", style={"height": "430px"}),
+                        html.Div(id="category-insights", style={'textAlign': 'center', 'marginTop': '10px'})
+                    ])
+                ], className="shadow-sm")
+            ], width=12)
+        ], className="g-4 mb-4", style={"padding": "0px 30px"}),
+
+        # ROW 3
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Top 5 Category Trends Over Time", className="fw-bold text-center text-white",
+                                   style={"backgroundColor": "#8B0000"}),
+                    dbc.CardBody([
+                        dcc.Graph(figure=data.trend_fig, style={"height": "430px"})
+                    ])
+                ], className="shadow-sm")
+            ], width=12)
+        ], className="g-4 mb-4", style={"padding": "0px 30px"}),
+
+        # ROW 4
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Revenue for a Date Range", className="fw-bold text-center text-white",
+                                   style={"backgroundColor": "#8B0000"}),
+                    dbc.CardBody([
+                        html.Div([
+                            html.Label("Select Months:", style={"fontWeight": "bold", "display": "block"}),
+                            dcc.RangeSlider(
+                                id="revenue-range", min=0, max=max(len(data.periods) - 1, 0), step=1,
+                                value=[0, max(len(data.periods) - 1, 0)],
+                                marks=range_marks(data.periods, data.period_labels), allowCross=False
+                            )
+                        ], style={"width": "80%", "margin": "10px auto 20px auto", "textAlign": "center"}),
+
+                        dbc.Row([
+                            dbc.Col(dcc.Graph(id="range-revenue-chart", style={"height": "430px"}), width=6),
+                            dbc.Col(dcc.Graph(id="range-category-chart", style={"height": "430px"}), width=6)
+                        ]),
+                        html.Div(id="range-revenue-insights", style={'textAlign': 'center', 'marginTop': '10px'})
+                    ])
+                ], className="shadow-sm")
+            ], width=12)
+        ], className="g-4 mb-4", style={"padding": "0px 30px"})
+    ],
+    style={
+        "maxWidth": "1600px",
+        "margin": "auto",
+        "paddingBottom": "60px",
+        "overflowX": "hidden"
+    })
+
+    if clientside_months.ENABLED:
+        slices = data.top_categories_by_month
+        template = category_bar(next(iter(slices.values()), pd.DataFrame(columns=["Category", "Amount"])))
+        layout.children.append(clientside_months.month_store("category-store", slices, "Category", "Amount", template))
+    return layout
+
 
 # =====================================================
-# PAGE 1 LAYOUT
+# FIGURE HELPERS (LRU-cached per month/range and data version)
 # =====================================================
-layout = html.Div([
-    html.H2("Revenue & Category Overview", className="text-center fw-bold mt-4 mb-4", style={"color": "#2B0000"}),
-
-    # ROW 1
-    dbc.Row([
-        dbc.Col([
-            dbc.Card([
-                dbc.CardHeader("Total Monthly Revenue Trend", className="fw-bold text-center text-white",
-                               style={"backgroundColor": "#8B0000"}),  # dark red
-                dbc.CardBody([
-                    dcc.Graph(figure=revenue_fig, style={"height": "430px"}),
-                    html.Div([
-                        dcc.Markdown(revenue_insight_1, style={'fontSize': '16px', 'fontWeight': '500'}),
-                        dcc.Markdown(revenue_insight_2, style={'fontSize': '16px', 'fontWeight': '500'}),
-                        dcc.Markdown(revenue_insight_3, style={'fontSize': '16px', 'fontWeight': '500'})
-                    ], style={'textAlign': 'center', 'marginTop': '10px'})
-                ])
-            ], className="shadow-sm")
-        ], width=7),
-
-        dbc.Col([
-            dbc.Card([
-                dbc.CardHeader("Year-to-Date Revenue Trend", className="fw-bold text-center text-white",
-                               style={"backgroundColor": "#8B0000"}),
-                dbc.CardBody([
-                    dcc.Graph(figure=cumulative_fig, style={"height": "430px"}),
-                    html.Div([
-                        dcc.Markdown(total_revenue_text, style={
-                            'textAlign': 'center', 'fontSize': '16px',
-                            'fontWeight': '500', 'marginTop': '10px'
-                        }),
-                        dcc.Markdown(growth_text, style={
-                            'textAlign': 'center', 'fontSize': '16px',
-                            'fontWeight': '500', 'marginTop': '4px'
-                        })
-                    ])
-                ])
-            ], className="shadow-sm")
-        ], width=5)
-    ], className="g-4 mb-4", style={"padding": "0px 30px"}),
-
-    # ROW 2
-    dbc.Row([
-        dbc.Col([
-            dbc.Card([
-                dbc.CardHeader("Top 8 Category Revenue by Month", className="fw-bold text-center text-white",
-                               style={"backgroundColor": "#8B0000"}),
-                dbc.CardBody([
-                    html.Div([
-                        html.Label("Select Month:", style={"fontWeight": "bold", "display": "block"}),
-                        dcc.Dropdown(
-                            id="month-dropdown", options=month_options,
-                            value=month_options[0]["value"] if month_options else None,
-                            clearable=False, style={
-                                "width": "40%", "margin": "10px auto 20px auto", "textAlign": "center"
-                            }
-                        )
-                    ], style={"textAlign": "center"}),
-
-                    dcc.Graph(id="category-bar-chart", style={"height": "430px"}),
-                    html.Div(id="category-insights", style={'textAlign': 'center', 'marginTop': '10px'})
-                ])
-            ], className="shadow-sm")
-        ], width=12)
-    ], className="g-4 mb-4", style={"padding": "0px 30px"}),
-
-    # ROW 3
-    dbc.Row([
-        dbc.Col([
-            dbc.Card([
-                dbc.CardHeader("Top 5 Category Trends Over Time", className="fw-bold text-center text-white",
-                               style={"backgroundColor": "#8B0000"}),
-                dbc.CardBody([
-                    dcc.Graph(figure=trend_fig, style={"height": "430px"})
-                ])
-            ], className="shadow-sm")
-        ], width=12)
-    ], className="g-4 mb-4", style={"padding": "0px 30px"})
-],
-style={
-    "maxWidth": "1600px",
-    "margin": "auto",
-    "paddingBottom": "60px",
-    "overflowX": "hidden"
-})
+def category_bar(filtered):
+    bar_fig = px.bar(filtered, x="Category", y="Amount", text="Amount",
+                     color="Amount", color_continuous_scale=["#E57373", "#B71C1C", "#7F0000"])
+    bar_fig.update_traces(texttemplate="$%{text:,.0f}", textposition="outside")
+    bar_fig.update_layout(template="plotly_white", height=430, title=None)
+    return bar_fig
+
+
+@cached_figure("category_chart")
+def category_chart(selected_month):
+    filtered = page_data().top_categories_by_month.get(selected_month, pd.DataFrame(columns=["Category", "Amount"]))
+    bar_fig = category_bar(filtered)
+    if not filtered.empty:
+        top_cat = filtered.iloc[0]
+        insight = f"In **{selected_month}**, highest-earning category: **{top_cat['Category']}** (${top_cat['Amount']:,.2f})."
+    else:
+        insight = f"⚠️ No data for {selected_month}."
+    return bar_fig, dcc.Markdown(insight, style={'fontSize': '16px', 'fontWeight': '500'})
+
+
+@cached_figure("revenue_range")
+def revenue_range(start, end):
+    data = page_data()
+    start, end = data.periods[start], data.periods[end]
+    first, last = data.period_labels[start], data.period_labels[end]
+
+    running = data.revenue_prefix.running(start, end).rename("Revenue").rename_axis("Period").reset_index()
+    running["Month"] = running["Period"].map(data.period_labels)
+    running_fig = px.line(running, x="Month", y="Revenue", markers=True,
+                          labels={"Revenue": "Cumulative Revenue ($)"})
+    running_fig.update_traces(line_color="#6A0000", line_width=3)
+    running_fig.update_layout(template="plotly_white", height=430, title=None)
+
+    categories = data.category_prefix.totals(start, end)
+    top = categories[categories > 0].sort_values(ascending=False, kind="stable").head(8)
+    bar_fig = category_bar(top.rename("Amount").rename_axis("Category").reset_index())
+
+    total = data.revenue_prefix.total(start, end)
+    months = len(running)
+    insight = f"Revenue **{first} – {last}**: **${total:,.2f}** (avg. **${total / months:,.2f}** per month)."
+    if not top.empty:
+        insight += f" Top category: **{top.index[0]}** (${top.iloc[0]:,.2f})."
+    return running_fig, bar_fig, dcc.Markdown(insight, style={'fontSize': '16px', 'fontWeight': '500'})
+
 
 # =====================================================
 # CALLBACK
 # =====================================================
 def register_callbacks(app):
+    @app.callback(
+        [Output("range-revenue-chart", "figure"),
+         Output("range-category-chart", "figure"),
+         Output("range-revenue-insights", "children")],
+        [Input("revenue-range", "value")]
+    )
+    def update_revenue_range(selected_range):
+        if not selected_range or not page_data().periods:
+            return px.line(), px.bar(), "⚠️ No months selected."
+        return revenue_range(*clamp_range(selected_range, len(page_data().periods)))
+
+    if clientside_months.ENABLED:
+        clientside_months.register_bar_switch(app, "category-bar-chart", "month-dropdown", "category-store")
+        app.clientside_callback(
+            ClientsideFunction(namespace="months", function_name="categoryInsight"),
+            Output("category-insights", "children"),
+            Input("month-dropdown", "value"),
+            State("category-store", "data"),
+        )
+        return
+
     @app.callback(
         [Output("category-bar-chart", "figure"),
          Output("category-insights", "children")],
@@ -190,15 +326,4 @@ def register_callbacks(app):
     def update_category_chart(selected_month):
         if selected_month is None:
             return px.bar(), "⚠️ No month selected."
-        filtered = category_revenue[category_revenue["Month"] == selected_month]
-        filtered = filtered.sort_values("Amount", ascending=False).head(8)
-        bar_fig = px.bar(filtered, x="Category", y="Amount", text="Amount",
-                         color="Amount", color_continuous_scale=["#E57373", "#B71C1C", "#7F0000"])
-        bar_fig.update_traces(texttemplate="$%{text:,.0f}", textposition="outside")
-        bar_fig.update_layout(template="plotly_white", height=430, title=None)
-        if not filtered.empty:
-            top_cat = filtered.iloc[0]
-            insight = f"In **{selected_month}**, highest-earning category: **{top_cat['Category']}** (${top_cat['Amount']:,.2f})."
-        else:
-            insight = f"⚠️ No data for {selected_month}."
-        return bar_fig, dcc.Markdown(insight, style={'fontSize': '16px', 'fontWeight': '500'})
\ No newline at end of file
+        return category_chart(selected_month)
\ No newline at end of file
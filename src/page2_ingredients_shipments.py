@@ -1,263 +1,389 @@
-import os
-import re
 import pandas as pd
+from functools import lru_cache
+from types import SimpleNamespace
 import plotly.express as px
 from dash import html, dcc, Input, Output
 import dash_bootstrap_components as dbc
-from difflib import SequenceMatcher
 
-# =====================================================
-# LOAD DATA
-# =====================================================
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATA_PATH_MONTHLY = os.path.join(BASE_DIR, "../data/cleaned_monthly_data.csv")
-DATA_PATH_ING = os.path.join(BASE_DIR, "../data/ingredient.csv")
-DATA_PATH_SHIP = os.path.join(BASE_DIR, "../data/shipment.csv")
-
-try:
-    monthly_df = pd.read_csv(DATA_PATH_MONTHLY)
-    ingredient_df = pd.read_csv(DATA_PATH_ING)
-    shipment_df = pd.read_csv(DATA_PATH_SHIP)
-except FileNotFoundError:
-    print("=" * 50)
-    print("ERROR: Data files not found for page 2.")
-    print("=" * 50)
-    monthly_df = pd.DataFrame(columns=["Amount", "Count", "Month", "Sheet_Type", "Category", "Item Name"])
-    ingredient_df = pd.DataFrame(columns=["Item Name"])
-    shipment_df = pd.DataFrame(columns=["frequency", "ingredient", "quantity_per_shipment"])
+import clientside_months
+from data_access import data_version, get_cube, get_prices, get_shipments, get_supply_projection, get_usage
+from figure_cache import cached_figure
+from figure_json import freeze
+from ingredient_prices import PRICE_COLUMNS, estimate_costs
+from monthly_store import CUBE_KEYS, month_label, to_typed
+from range_queries import PrefixSums, clamp_range, range_marks
 
 # =====================================================
-# CLEANING
+# DATA + FIGURES (built on first navigation, cached per data version)
 # =====================================================
-monthly_df["Amount"] = pd.to_numeric(monthly_df["Amount"], errors="coerce").fillna(0)
-monthly_df["Count"] = pd.to_numeric(monthly_df["Count"], errors="coerce").fillna(0)
-month_order = ["May", "June", "July", "August", "September", "October"]
-monthly_df["Month"] = pd.Categorical(monthly_df["Month"], categories=month_order, ordered=True)
-details_df = monthly_df[monthly_df["Sheet_Type"] == "Details"].copy()
+@lru_cache(maxsize=1)
+def _page_data(version):
+    # =====================================================
+    # LOAD DATA (aggregate cube, shared and memoized — see data_access)
+    # =====================================================
+    try:
+        cube_df = get_cube()
+        usage_summary = get_usage()
+        prices_df = get_prices()
+        supply_df = get_supply_projection()
+        shipment_df = get_shipments()
+    except FileNotFoundError:
+        print("=" * 50)
+        print("ERROR: Data files not found for page 2.")
+        print("=" * 50)
+        cube_df = to_typed(pd.DataFrame(columns=[*CUBE_KEYS, "Amount", "Count"]))
+        usage_summary = pd.DataFrame(columns=["Month", "Period", "Ingredient", "Total_Used"])
+        prices_df = pd.DataFrame(columns=PRICE_COLUMNS)
+        supply_df = pd.DataFrame(columns=["Month", "Ingredient", "Days_Of_Supply", "Cycle_Days", "Stockout_Date"])
+        shipment_df = pd.DataFrame(columns=["frequency", "ingredient", "quantity_per_shipment"])
 
-# =====================================================
-# INGREDIENT USAGE CALCULATION
-# =====================================================
-usage_summary = pd.DataFrame(columns=["Month", "Ingredient", "Total_Used"])
-if not ingredient_df.empty and not details_df.empty:
-    ingredient_df.columns = [c.strip().lower().replace(" ", "_") for c in ingredient_df.columns]
-    ingredient_df.rename(columns={"item_name": "Item Name"}, inplace=True, errors="ignore")
-
-    def normalize(text): return re.sub(r'[^a-z0-9]+', ' ', str(text).lower()).strip()
-    details_df["key"] = details_df["Item Name"].apply(normalize)
-    ingredient_df["key"] = ingredient_df["Item Name"].apply(normalize)
-
-    def is_similar(a, b, threshold=0.85): return SequenceMatcher(None, a, b).ratio() >= threshold
-
-    merged_rows = []
-    for _, irow in ingredient_df.iterrows():
-        key_i = irow["key"]
-        matches = details_df[details_df["key"].apply(lambda x: is_similar(x, key_i))]
-        if not matches.empty:
-            tmp = matches.copy()
-            for col in ingredient_df.columns:
-                if col not in tmp.columns:
-                    tmp[col] = irow[col]
-            merged_rows.append(tmp)
-
-    if merged_rows:
-        merged_df = pd.concat(merged_rows, ignore_index=True)
-        ingredient_cols = [c for c in merged_df.columns if c not in
-                           ["source_page", "source_table", "Group", "Count", "Amount", "Month",
-                            "Sheet_Type", "Category", "Item Name", "key"]]
-        usage_records = []
-        for _, row in merged_df.iterrows():
-            for col in ingredient_cols:
-                val = pd.to_numeric(row[col], errors="coerce")
-                if pd.notna(val) and val > 0:
-                    usage_records.append({"Month": row["Month"], "Ingredient": col, "Total_Used": val * row["Count"]})
-        usage_df = pd.DataFrame(usage_records)
-        if not usage_df.empty:
-            usage_summary = usage_df.groupby(["Month", "Ingredient"], as_index=False, observed=False)["Total_Used"].sum()
-
-month_dropdown_ing = [{"label": m, "value": m} for m in month_order if m in usage_summary["Month"].unique()]
+    # Charts read the pre-aggregated cube, not the row-level data
+    month_order = list(cube_df["Month"].cat.categories)
 
-# =====================================================
-# INGREDIENT COSTS + COST GRAPHS
-# =====================================================
-ingredient_costs = {
-    "braised_beef_used_(g)": 0.0088, "braised_chicken(g)": 0.0055, "braised_pork(g)": 0.0066,
-    "egg(count)": 0.20, "rice(g)": 0.0022, "ramen_(count)": 0.35, "rice_noodles(g)": 0.0033,
-    "chicken_thigh_(pcs)": 0.50, "chicken_wings_(pcs)": 0.60, "flour_(g)": 0.0011,
-    "pickle_cabbage": 0.0044, "green_onion": 0.0026, "cilantro": 0.0044, "white_onion": 0.002,
-    "peas(g)": 0.0026, "carrot(g)": 0.0026, "boychoy(g)": 0.0040, "tapioca_starch": 0.0022
-}
-
-if not usage_summary.empty:
-    usage_summary["Estimated_Cost"] = usage_summary.apply(
-        lambda r: r["Total_Used"] * ingredient_costs.get(r["Ingredient"], 0), axis=1)
-
-monthly_cost = usage_summary.groupby("Month", as_index=False, observed=False)["Estimated_Cost"].sum()
-if not monthly_cost.empty:
-    monthly_cost["Month"] = pd.Categorical(monthly_cost["Month"], categories=month_order, ordered=True)
-    monthly_cost = monthly_cost.sort_values("Month")
+    # Month x Ingredient usage comes from the recipe matrix (see ingredient_usage)
+    month_dropdown_ing = [{"label": m, "value": m} for m in month_order if m in usage_summary["Month"].unique()]
+
+    # Top/bottom-5 slices per month, so the dropdown callbacks never filter or sort
+    usage_by_month = usage_summary.groupby("Month", sort=False)
+    top_ing_by_month = {m: g.nlargest(5, "Total_Used") for m, g in usage_by_month}
+    bottom_ing_by_month = {m: g.nsmallest(5, "Total_Used") for m, g in usage_by_month}
+
+    # =====================================================
+    # INGREDIENT COSTS + COST GRAPHS
+    # =====================================================
+    # Each month is priced at the version in effect on its first day (see ingredient_prices)
+    usage_summary = estimate_costs(usage_summary, prices_df)
+
+    monthly_cost = usage_summary.groupby("Month", as_index=False, observed=False)["Estimated_Cost"].sum()
+    if not monthly_cost.empty:
+        monthly_cost["Month"] = pd.Categorical(monthly_cost["Month"], categories=month_order, ordered=True)
+        monthly_cost = monthly_cost.sort_values("Month")
+
+    # =====================================================
+    # SHIPMENT FREQUENCY
+    # =====================================================
+    freq_grouped = pd.DataFrame(columns=["frequency", "ingredient_count", "ingredient_list"])
+    if not shipment_df.empty:
+        ship = shipment_df.copy()
+        ship.columns = [c.strip().lower().replace(" ", "_") for c in ship.columns]
+        ship["frequency"] = ship["frequency"].str.lower().str.strip()
+        freq_order = ["weekly", "biweekly", "monthly"]
+        ship["frequency"] = pd.Categorical(ship["frequency"], categories=freq_order, ordered=True)
+        freq_counts = ship.groupby("frequency", as_index=False, observed=False)["ingredient"].count()
+        freq_counts.rename(columns={"ingredient": "ingredient_count"}, inplace=True)
+        ingredient_lists = ship.groupby("frequency", observed=False)["ingredient"].apply(lambda x: ", ".join(sorted(x))).reset_index()
+        ingredient_lists.rename(columns={"ingredient": "ingredient_list"}, inplace=True)
+        freq_grouped = pd.merge(freq_counts, ingredient_lists, on="frequency", how="left")
+
+    # Darker reds for all visuals
+    cost_trend_fig = px.area(monthly_cost, x="Month", y="Estimated_Cost", color_discrete_sequence=["#8B0000"])
+    cost_trend_fig.update_layout(template="plotly_white", height=430, title=None)
+
+    ingredient_cost_totals = usage_summary.groupby("Ingredient", as_index=False, observed=False)["Estimated_Cost"].sum()
+    ingredient_cost_totals = ingredient_cost_totals.sort_values("Estimated_Cost", ascending=False).head(5)
+    top_cost_fig = px.bar(ingredient_cost_totals, x="Estimated_Cost", y="Ingredient",
+                          orientation="h", color="Estimated_Cost",
+                          color_continuous_scale=["#E57373", "#B71C1C", "#7F0000"])
+    top_cost_fig.update_layout(template="plotly_white", height=430, title=None)
+
+    freq_fig = px.bar(freq_grouped.sort_values("frequency"), x="frequency", y="ingredient_count",
+                      text="ingredient_count", color="ingredient_count",
+                      color_continuous_scale=["#E57373", "#B71C1C", "#7F0000"])
+    freq_fig.update_traces(
+        texttemplate="%{text}", textposition="outside",
+        hovertemplate="<b>%{x}</b><br><b>Ingredients:</b><br>%{customdata}<extra></extra>",
+        customdata=freq_grouped["ingredient_list"]
+    )
+    freq_fig.update_layout(template="plotly_white", height=430, title=None)
+
+    # =====================================================
+    # DAYS OF SUPPLY (see supply_projection)
+    # =====================================================
+    month_dropdown_supply = [{"label": m, "value": m} for m in month_order if m in supply_df["Month"].unique()]
+
+    # =====================================================
+    # DATE-RANGE USAGE + COST (prefix sums, O(1) per range)
+    # =====================================================
+    periods = list(cube_df["Period"].cat.categories)
+    period_labels = {p: month_label(p) for p in periods}
+    usage_prefix = PrefixSums(usage_summary, "Ingredient", "Total_Used", periods)
+    cost_prefix = PrefixSums(usage_summary, "Ingredient", "Estimated_Cost", periods)
+
+    return SimpleNamespace(
+        periods=periods,
+        period_labels=period_labels,
+        usage_prefix=usage_prefix,
+        cost_prefix=cost_prefix,
+        supply_df=supply_df,
+        month_dropdown_supply=month_dropdown_supply,
+        usage_summary=usage_summary,
+        top_ing_by_month=top_ing_by_month,
+        bottom_ing_by_month=bottom_ing_by_month,
+        month_dropdown_ing=month_dropdown_ing,
+        monthly_cost=monthly_cost,
+        freq_grouped=freq_grouped,
+        cost_trend_fig=freeze(cost_trend_fig),
+        top_cost_fig=freeze(top_cost_fig),
+        freq_fig=freeze(freq_fig),
+    )
+
+
+def page_data():
+    return _page_data(data_version())
 
-# =====================================================
-# SHIPMENT FREQUENCY
-# =====================================================
-freq_grouped = pd.DataFrame(columns=["frequency", "ingredient_count", "ingredient_list"])
-if not shipment_df.empty:
-    ship = shipment_df.copy()
-    ship.columns = [c.strip().lower().replace(" ", "_") for c in ship.columns]
-    ship["frequency"] = ship["frequency"].str.lower().str.strip()
-    freq_order = ["weekly", "biweekly", "monthly"]
-    ship["frequency"] = pd.Categorical(ship["frequency"], categories=freq_order, ordered=True)
-    freq_counts = ship.groupby("frequency", as_index=False, observed=False)["ingredient"].count()
-    freq_counts.rename(columns={"ingredient": "ingredient_count"}, inplace=True)
-    ingredient_lists = ship.groupby("frequency", observed=False)["ingredient"].apply(lambda x: ", ".join(sorted(x))).reset_index()
-    ingredient_lists.rename(columns={"ingredient": "ingredient_list"}, inplace=True)
-    freq_grouped = pd.merge(freq_counts, ingredient_lists, on="frequency", how="left")
 
 # =====================================================
-# FIGURE HELPERS
+# FIGURE HELPERS (LRU-cached per month/range and data version)
 # =====================================================
-def make_top_ing(month):
-    if month is None or usage_summary.empty:
-        return px.bar()
-    df = usage_summary[usage_summary["Month"] == month].nlargest(5, "Total_Used")
+def ingredient_bar(df):
     fig = px.bar(df, x="Ingredient", y="Total_Used",
                  color="Total_Used", color_continuous_scale=["#E57373", "#B71C1C", "#7F0000"])
     fig.update_layout(template="plotly_white", height=430, title=None)
     return fig
 
 
+@cached_figure("top_ingredients")
+def make_top_ing(month):
+    df = page_data().top_ing_by_month.get(month)
+    if df is None:
+        return px.bar()
+    return ingredient_bar(df)
+
+
+@cached_figure("bottom_ingredients")
 def make_bottom_ing(month):
-    if month is None or usage_summary.empty:
+    df = page_data().bottom_ing_by_month.get(month)
+    if df is None:
         return px.bar()
-    df = usage_summary[usage_summary["Month"] == month].nsmallest(5, "Total_Used")
-    fig = px.bar(df, x="Ingredient", y="Total_Used",
-                 color="Total_Used", color_continuous_scale=["#E57373", "#B71C1C", "#7F0000"])
-    fig.update_layout(template="plotly_white", height=430, title=None)
-    return fig
+    return ingredient_bar(df)
+
 
+@cached_figure("supply")
+def make_supply(month):
+    supply_df = page_data().supply_df
+    if month is None or supply_df.empty:
+        return px.bar(), "⚠️ No shipment data to project."
+    df = supply_df[supply_df["Month"] == month].sort_values("Days_Of_Supply")
+    df = df.assign(Status=df["Stockout_Date"].notna().map({True: "Runs out before next delivery",
+                                                          False: "Covers the delivery cycle"}))
+    fig = px.bar(df, x="Days_Of_Supply", y="Ingredient", orientation="h", color="Status",
+                 color_discrete_map={"Runs out before next delivery": "#B71C1C",
+                                     "Covers the delivery cycle": "#E57373"},
+                 hover_data={"Cycle_Days": ":.0f", "Daily_Usage": ":,.0f", "Unit": True})
+    fig.update_layout(template="plotly_white", height=430, title=None,
+                      xaxis_title="Days of supply per delivery", yaxis_title=None,
+                      legend=dict(orientation="h", y=-0.2, title=None))
 
-# Darker reds for all visuals
-cost_trend_fig = px.area(monthly_cost, x="Month", y="Estimated_Cost", color_discrete_sequence=["#8B0000"])
-cost_trend_fig.update_layout(template="plotly_white", height=430, title=None)
+    stockouts = df[df["Stockout_Date"].notna()]
+    if stockouts.empty:
+        insight = f"Every shipped ingredient lasts its full delivery cycle at **{month}** usage."
+    else:
+        items = ", ".join(f"**{r.Ingredient}** ({r.Stockout_Date:%b %d})" for r in stockouts.itertuples())
+        insight = f"At **{month}** usage, these run out before the next delivery: {items}."
+    return fig, dcc.Markdown(insight, style={'fontSize': '16px', 'fontWeight': '500', 'textAlign': 'center'})
 
-ingredient_cost_totals = usage_summary.groupby("Ingredient", as_index=False, observed=False)["Estimated_Cost"].sum()
-ingredient_cost_totals = ingredient_cost_totals.sort_values("Estimated_Cost", ascending=False).head(5)
-top_cost_fig = px.bar(ingredient_cost_totals, x="Estimated_Cost", y="Ingredient",
-                      orientation="h", color="Estimated_Cost",
+
+@cached_figure("usage_range")
+def make_usage_range(start, end):
+    data = page_data()
+    start, end = data.periods[start], data.periods[end]
+    usage = data.usage_prefix.totals(start, end)
+    usage = usage[usage > 0].sort_values(ascending=False, kind="stable").head(10)
+    usage_fig = ingredient_bar(usage.rename("Total_Used").rename_axis("Ingredient").reset_index())
+
+    costs = data.cost_prefix.totals(start, end)
+    costs = costs[costs > 0].sort_values(ascending=False, kind="stable").head(5)
+    cost_fig = px.bar(costs.rename("Estimated_Cost").rename_axis("Ingredient").reset_index(),
+                      x="Estimated_Cost", y="Ingredient", orientation="h", color="Estimated_Cost",
                       color_continuous_scale=["#E57373", "#B71C1C", "#7F0000"])
-top_cost_fig.update_layout(template="plotly_white", height=430, title=None)
-
-freq_fig = px.bar(freq_grouped.sort_values("frequency"), x="frequency", y="ingredient_count",
-                  text="ingredient_count", color="ingredient_count",
-                  color_continuous_scale=["#E57373", "#B71C1C", "#7F0000"])
-freq_fig.update_traces(
-    texttemplate="%{text}", textposition="outside",
-    hovertemplate="<b>%{x}</b><br><b>Ingredients:</b><br>%{customdata}<extra></extra>",
-    customdata=freq_grouped["ingredient_list"]
-)
-freq_fig.update_layout(template="plotly_white", height=430, title=None)
+    cost_fig.update_layout(template="plotly_white", height=430, title=None)
+
+    first, last = data.period_labels[start], data.period_labels[end]
+    insight = f"Estimated ingredient cost **{first} – {last}**: **${data.cost_prefix.total(start, end):,.2f}**."
+    if not usage.empty:
+        insight += f" Most used: **{usage.index[0]}** ({usage.iloc[0]:,.0f})."
+    return usage_fig, cost_fig, dcc.Markdown(insight, style={'fontSize': '16px', 'fontWeight': '500',
+                                                             'textAlign': 'center'})
+
 
 # =====================================================
-# PAGE 2 LAYOUT
+# PAGE 2 LAYOUT (built on first navigation)
 # =====================================================
-layout = html.Div([
-    html.H2("Ingredients & Shipments", className="text-center fw-bold mt-4 mb-4", style={"color": "#2B0000"}),
-
-    # INGREDIENT USAGE (TOP/BOTTOM)
-    dbc.Row([
-        dbc.Col([
-            dbc.Card([
-                dbc.CardHeader("Top 5 Ingredients Used Each Month",
-                               className="fw-bold text-center text-white",
-                               style={"backgroundColor": "#8B0000"}),
-                dbc.CardBody([
-                    html.Div([
-                        html.Label("Select Month:", style={"fontWeight": "bold", "display": "block"}),
-                        dcc.Dropdown(
-                            id="top-ing-month", options=month_dropdown_ing,
-                            value=month_dropdown_ing[0]["value"] if month_dropdown_ing else None,
-                            clearable=False,
-                            style={"width": "60%", "margin": "10px auto 20px auto", "textAlign": "center"}
-                        )
-                    ], style={"textAlign": "center"}),
-                    dcc.Graph(id="top-ingredients-chart",
-                              figure=make_top_ing(month_dropdown_ing[0]["value"] if month_dropdown_ing else None),
-                              style={"height": "430px"})
-                ])
-            ], className="shadow-sm")
-        ], width=6),
-
-        dbc.Col([
-            dbc.Card([
-                dbc.CardHeader("Bottom 5 Ingredients Used Each Month",
-                               className="fw-bold text-center text-white",
-                               style={"backgroundColor": "#8B0000"}),
-                dbc.CardBody([
-                    html.Div([
-                        html.Label("Select Month:", style={"fontWeight": "bold", "display": "block"}),
-                        dcc.Dropdown(
-                            id="bottom-ing-month", options=month_dropdown_ing,
-                            value=month_dropdown_ing[0]["value"] if month_dropdown_ing else None,
-                            clearable=False,
-                            style={"width": "60%", "margin": "10px auto 20px auto", "textAlign": "center"}
-                        )
-                    ], style={"textAlign": "center"}),
-                    dcc.Graph(id="bottom-ingredients-chart",
-                              figure=make_bottom_ing(month_dropdown_ing[0]["value"] if month_dropdown_ing else None),
-                              style={"height": "430px"})
-                ])
-            ], className="shadow-sm")
-        ], width=6)
-    ], className="g-4 mb-4", style={"padding": "0px 30px"}),
-
-    # COST TRENDS
-    dbc.Row([
-        dbc.Col([
-            dbc.Card([
-                dbc.CardHeader("Estimated Monthly Ingredient Cost Trend",
-                               className="fw-bold text-center text-white",
-                               style={"backgroundColor": "#8B0000"}),
-                dbc.CardBody([dcc.Graph(figure=cost_trend_fig, style={"height": "430px"})])
-            ], className="shadow-sm")
-        ], width=6),
-
-        dbc.Col([
-            dbc.Card([
-                dbc.CardHeader("Top 5 Ingredients Driving the Most Spending",
-                               className="fw-bold text-center text-white",
-                               style={"backgroundColor": "#8B0000"}),
-                dbc.CardBody([dcc.Graph(figure=top_cost_fig, style={"height": "430px"})])
-            ], className="shadow-sm")
-        ], width=6)
-    ], className="g-4 mb-4", style={"padding": "0px 30px"}),
+def build_layout():
+    data = page_data()
+    layout = html.Div([
+        html.H2("Ingredients & Shipments", className="text-center fw-bold mt-4 mb-4", style={"color": "#2B0000"}),
+
+        # INGREDIENT USAGE (TOP/BOTTOM)
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Top 5 Ingredients Used Each Month",
+                                   className="fw-bold text-center text-white",
+                                   style={"backgroundColor": "#8B0000"}),
+                    dbc.CardBody([
+                        html.Div([
+                            html.Label("Select Month:", style={"fontWeight": "bold", "display": "block"}),
+                            dcc.Dropdown(
+                                id="top-ing-month", options=data.month_dropdown_ing,
+                                value=data.month_dropdown_ing[0]["value"] if data.month_dropdown_ing else None,
+                                clearable=False,
+                                style={"width": "60%", "margin": "10px auto 20px auto", "textAlign": "center"}
+                            )
+                        ], style={"textAlign": "center"}),
+                        dcc.Graph(id="top-ingredients-chart",
+                                  figure=make_top_ing(data.month_dropdown_ing[0]["value"] if data.month_dropdown_ing else None),
+                                  style={"height": "430px"})
+                    ])
+                ], className="shadow-sm")
+            ], width=6),
+
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Bottom 5 Ingredients Used Each Month",
+                                   className="fw-bold text-center text-white",
+                                   style={"backgroundColor": "#8B0000"}),
+                    dbc.CardBody([
+                        html.Div([
+                            html.Label("Select Month:", style={"fontWeight": "bold", "display": "block"}),
+                            dcc.Dropdown(
+                                id="bottom-ing-month", options=data.month_dropdown_ing,
+                                value=data.month_dropdown_ing[0]["value"] if data.month_dropdown_ing else None,
+                                clearable=False,
+                                style={"width": "60%", "margin": "10px auto 20px auto", "textAlign": "center"}
+                            )
+                        ], style={"textAlign": "center"}),
+                        dcc.Graph(id="bottom-ingredients-chart",
+                                  figure=make_bottom_ing(data.month_dropdown_ing[0]["value"] if data.month_dropdown_ing else None),
+                                  style={"height": "430px"})
+                    ])
+                ], className="shadow-sm")
+            ], width=6)
+        ], className="g-4 mb-4", style={"padding": "0px 30px"}),
+
+        # COST TRENDS
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Estimated Monthly Ingredient Cost Trend",
+                                   className="fw-bold text-center text-white",
+                                   style={"backgroundColor": "#8B0000"}),
+                    dbc.CardBody([dcc.Graph(figure=data.cost_trend_fig, style={"height": "430px"})])
+                ], className="shadow-sm")
+            ], width=6),
+
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Top 5 Ingredients Driving the Most Spending",
+                                   className="fw-bold text-center text-white",
+                                   style={"backgroundColor": "#8B0000"}),
+                    dbc.CardBody([dcc.Graph(figure=data.top_cost_fig, style={"height": "430px"})])
+                ], className="shadow-sm")
+            ], width=6)
+        ], className="g-4 mb-4", style={"padding": "0px 30px"}),
+
+        # USAGE + COST FOR A DATE RANGE
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Ingredient Usage & Cost for a Date Range",
+                                   className="fw-bold text-center text-white",
+                                   style={"backgroundColor": "#8B0000"}),
+                    dbc.CardBody([
+                        html.Div([
+                            html.Label("Select Months:", style={"fontWeight": "bold", "display": "block"}),
+                            dcc.RangeSlider(
+                                id="usage-range", min=0, max=max(len(data.periods) - 1, 0), step=1,
+                                value=[0, max(len(data.periods) - 1, 0)],
+                                marks=range_marks(data.periods, data.period_labels), allowCross=False
+                            )
+                        ], style={"width": "80%", "margin": "10px auto 20px auto", "textAlign": "center"}),
+                        dbc.Row([
+                            dbc.Col(dcc.Graph(id="range-usage-chart", style={"height": "430px"}), width=6),
+                            dbc.Col(dcc.Graph(id="range-cost-chart", style={"height": "430px"}), width=6)
+                        ]),
+                        html.Div(id="range-usage-insights", style={"marginTop": "10px"})
+                    ])
+                ], className="shadow-sm")
+            ], width=12)
+        ], className="g-4 mb-4", style={"padding": "0px 30px"}),
+
+        # SHIPMENT FREQUENCY
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Shipment Frequency Overview",
+                                   className="fw-bold text-center text-white",
+                                   style={"backgroundColor": "#8B0000"}),
+                    dbc.CardBody([dcc.Graph(figure=data.freq_fig, style={"height": "430px"})])
+                ], className="shadow-sm")
+            ], width=12)
+        ], className="g-4 mb-4", style={"padding": "0px 30px"}),
+
+        # DAYS OF SUPPLY
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Days of Supply & Projected Stockouts",
+                                   className="fw-bold text-center text-white",
+                                   style={"backgroundColor": "#8B0000"}),
+                    dbc.CardBody([
+                        html.Div([
+                            html.Label("Select Month:", style={"fontWeight": "bold", "display": "block"}),
+                            dcc.Dropdown(
+                                id="supply-month", options=data.month_dropdown_supply,
+                                value=data.month_dropdown_supply[-1]["value"] if data.month_dropdown_supply else None,
+                                clearable=False,
+                                style={"width": "40%", "margin": "10px auto 20px auto", "textAlign": "center"}
+                            )
+                        ], style={"textAlign": "center"}),
+                        dcc.Graph(id="supply-chart", style={"height": "430px"}),
+                        html.Div(id="supply-insights", style={"marginTop": "10px"})
+                    ])
+                ], className="shadow-sm")
+            ], width=12)
+        ], className="g-4 mb-4", style={"padding": "0px 30px"})
+    ],
+    style={
+        "maxWidth": "1600px",
+        "margin": "auto",
+        "paddingBottom": "60px",
+        "overflowX": "hidden"
+    })
+
+    if clientside_months.ENABLED:
+        empty = pd.DataFrame(columns=["Ingredient", "Total_Used"])
+        for store_id, slices in [("top-ing-store", data.top_ing_by_month), ("bottom-ing-store", data.bottom_ing_by_month)]:
+            template = ingredient_bar(next(iter(slices.values()), empty))
+            layout.children.append(clientside_months.month_store(store_id, slices, "Ingredient", "Total_Used", template))
+    return layout
 
-    # SHIPMENT FREQUENCY
-    dbc.Row([
-        dbc.Col([
-            dbc.Card([
-                dbc.CardHeader("Shipment Frequency Overview",
-                               className="fw-bold text-center text-white",
-                               style={"backgroundColor": "#8B0000"}),
-                dbc.CardBody([dcc.Graph(figure=freq_fig, style={"height": "430px"})])
-            ], className="shadow-sm")
-        ], width=12)
-    ], className="g-4 mb-4", style={"padding": "0px 30px"})
-],
-style={
-    "maxWidth": "1600px",
-    "margin": "auto",
-    "paddingBottom": "60px",
-    "overflowX": "hidden"
-})
 
 # =====================================================
 # CALLBACKS
 # =====================================================
 def register_callbacks(app):
-    @app.callback(Output("top-ingredients-chart", "figure"), Input("top-ing-month", "value"))
-    def update_top(month):
-        return make_top_ing(month)
+    if clientside_months.ENABLED:
+        clientside_months.register_bar_switch(app, "top-ingredients-chart", "top-ing-month", "top-ing-store")
+        clientside_months.register_bar_switch(app, "bottom-ingredients-chart", "bottom-ing-month", "bottom-ing-store")
+    else:
+        @app.callback(Output("top-ingredients-chart", "figure"), Input("top-ing-month", "value"))
+        def update_top(month):
+            return make_top_ing(month)
+
+        @app.callback(Output("bottom-ingredients-chart", "figure"), Input("bottom-ing-month", "value"))
+        def update_bottom(month):
+            return make_bottom_ing(month)
+
+    @app.callback([Output("supply-chart", "figure"), Output("supply-insights", "children")],
+                  Input("supply-month", "value"))
+    def update_supply(month):
+        return make_supply(month)
 
-    @app.callback(Output("bottom-ingredients-chart", "figure"), Input("bottom-ing-month", "value"))
-    def update_bottom(month):
-        return make_bottom_ing(month)
\ No newline at end of file
+    @app.callback([Output("range-usage-chart", "figure"), Output("range-cost-chart", "figure"),
+                   Output("range-usage-insights", "children")],
+                  Input("usage-range", "value"))
+    def update_usage_range(selected_range):
+        if not selected_range or not page_data().periods:
+            return px.bar(), px.bar(), "⚠️ No months selected."
+        return make_usage_range(*clamp_range(selected_range, len(page_data().periods)))
\ No newline at end of file
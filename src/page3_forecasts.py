@@ -1,242 +1,429 @@
 # =====================================================
 # page3_forecasts.py — Forecasts & Predictions Page
 # =====================================================
-import os
+import time
+import numpy as np
 import pandas as pd
+from types import SimpleNamespace
 import plotly.express as px
-from dash import html, dcc
-from statsmodels.tsa.holtwinters import ExponentialSmoothing
-from sklearn.linear_model import LinearRegression
-from difflib import SequenceMatcher
-import re
+from dash import html, dcc, Input, Output, State, no_update
+from dash.exceptions import PreventUpdate
+import dash_bootstrap_components as dbc
 
-# =====================================================
-# LOAD DATA SAFELY
-# =====================================================
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATA_PATH_MONTHLY = os.path.join(BASE_DIR, "../data/cleaned_monthly_data.csv")
-DATA_PATH_ING = os.path.join(BASE_DIR, "../data/ingredient.csv")
-
-try:
-    monthly_df = pd.read_csv(DATA_PATH_MONTHLY)
-    ingredient_df = pd.read_csv(DATA_PATH_ING)
-except FileNotFoundError:
-    print("=" * 60)
-    print("ERROR: One or more data files not found for Page 3.")
-    print("=" * 60)
-    monthly_df = pd.DataFrame(columns=["Amount", "Count", "Month", "Sheet_Type", "Category", "Item Name"])
-    ingredient_df = pd.DataFrame(columns=["Item Name"])
+import forecast_jobs
 
-# =====================================================
-# CLEAN DATA
-# =====================================================
-monthly_df["Amount"] = pd.to_numeric(monthly_df["Amount"], errors="coerce").fillna(0)
-monthly_df["Count"] = pd.to_numeric(monthly_df["Count"], errors="coerce").fillna(0)
-month_order = ["May", "June", "July", "August", "September", "October"]
-monthly_df["Month"] = pd.Categorical(monthly_df["Month"], categories=month_order, ordered=True)
+from data_access import (
+    data_version, get_backtest_results, get_cube, get_demand_forecast, get_forecast_table, get_usage,
+)
+from figure_cache import cached_figure
+from figure_json import freeze
+from forecast_service import college_town_adjust, forecast
+from job_outputs import RESULT_COLUMNS, TABLE_COLUMNS, level_frames
+from monthly_store import CUBE_KEYS, period_label, to_typed
+from prediction_bands import BAND_COLUMNS, BAND_LEVELS, describe, series_bands
 
-summary_df = monthly_df[monthly_df["Sheet_Type"] == "Summary"]
-details_df = monthly_df[monthly_df["Sheet_Type"] == "Details"].copy()
+MODEL_NAMES = {"seasonal": "additive trend + season", "trend": "additive trend only"}
+BAND_FILLS = {80: "rgba(183, 28, 28, 0.25)", 95: "rgba(183, 28, 28, 0.10)"}
+
+JOB_NAME = "page3_forecasts"
+POLL_MS = 1000
 
 # =====================================================
-# GRAPH 1 — REVENUE FORECAST (HOLT-WINTERS)
+# DATA + FIGURES (computed by the background forecast job, once per data version)
 # =====================================================
-monthly_revenue = summary_df.groupby("Month", as_index=False, observed=False)["Amount"].sum()
-forecast_fig = px.line()
-forecast_df = pd.DataFrame(columns=["Month", "Forecasted_Revenue"])
-
-if len(monthly_revenue) >= 2:
-    month_map = {
-        "May": "2025-05-01", "June": "2025-06-01", "July": "2025-07-01",
-        "August": "2025-08-01", "September": "2025-09-01", "October": "2025-10-01"
-    }
-    revenue_series = monthly_revenue.copy()
-    revenue_series["ds"] = pd.to_datetime(revenue_series["Month"].map(month_map))
-    revenue_series.set_index("ds", inplace=True)
-
-    # Forecast with graceful fallback (silent)
+def add_bands(fig, x, rows):
+    """Shaded prediction bands (widest first) for forecast ``rows`` at categories ``x``."""
+    x = list(x)
+    for level in sorted(BAND_LEVELS, reverse=True):
+        fig.add_scatter(
+            x=x + x[::-1], y=list(rows[f"Upper_{level}"]) + list(rows[f"Lower_{level}"])[::-1],
+            fill="toself", fillcolor=BAND_FILLS[level], line=dict(width=0),
+            hoverinfo="skip", name=f"{level}% band"
+        )
+
+
+def _page_data(version):
+    # =====================================================
+    # LOAD DATA SAFELY (aggregate cube, shared and memoized — see data_access)
+    # =====================================================
     try:
-        model = ExponentialSmoothing(
-            revenue_series["Amount"],
-            trend="add",
-            seasonal="add",
-            seasonal_periods=6,
-            freq="MS"
+        cube_df = get_cube()
+        usage_summary = get_usage()
+        forecast_table = get_forecast_table()
+        backtest_df = get_backtest_results()
+        demand_df = get_demand_forecast()
+    except FileNotFoundError:
+        print("=" * 60)
+        print("ERROR: One or more data files not found for Page 3.")
+        print("=" * 60)
+        cube_df = to_typed(pd.DataFrame(columns=[*CUBE_KEYS, "Amount", "Count"]))
+        usage_summary = pd.DataFrame(columns=["Month", "Period", "Ingredient", "Total_Used"])
+        forecast_table = pd.DataFrame(columns=TABLE_COLUMNS)
+        backtest_df = pd.DataFrame(columns=RESULT_COLUMNS)
+        demand_df = pd.DataFrame(columns=["Month", "Period", "Ingredient", "Forecast_Used", *BAND_COLUMNS])
+
+    # Charts read the pre-aggregated cube, not the row-level data
+    summary_df = cube_df[cube_df["Sheet_Type"] == "Summary"].reset_index(drop=True)
+    month_order = list(cube_df["Month"].cat.categories)
+
+    # =====================================================
+    # GRAPH 1 — REVENUE FORECAST (HOLT-WINTERS)
+    # =====================================================
+    monthly_revenue = summary_df.groupby("Month", as_index=False, observed=False)["Amount"].sum()
+    forecast_fig = px.line()
+    forecast_df = pd.DataFrame(columns=["Month", "Forecasted_Revenue", *BAND_COLUMNS])
+    forecast_info, model_text = None, ""
+
+    if len(monthly_revenue) >= 2:
+        # Month label -> first day of its period ("2025-05" -> 2025-05-01)
+        month_map = cube_df.drop_duplicates("Month").set_index("Month")["Period"].astype(str)
+        revenue_series = monthly_revenue.copy()
+        revenue_series["ds"] = pd.to_datetime(revenue_series["Month"].astype(object).map(month_map))
+        revenue_series.set_index("ds", inplace=True)
+
+        # Fitted once per distinct series and cached on disk (see forecast_service)
+        forecast_values, forecast_info = forecast(revenue_series["Amount"])
+        model_text = (
+            f"Model: Holt-Winters, **{MODEL_NAMES[forecast_info['variant']]}** — "
+            + ("cached fit" if forecast_info["cached"] else f"fitted in {forecast_info['fit_ms']:,.0f} ms")
         )
-        fit = model.fit()
-        forecast_values = fit.forecast(3)
-    except Exception:
-        # Fallback: trend-only model silently
-        model = ExponentialSmoothing(
-            revenue_series["Amount"],
-            trend="add",
-            seasonal=None,
+
+        # Build forecast DataFrame
+        forecast_months = pd.date_range(
+            revenue_series.index[-1] + pd.offsets.MonthBegin(),
+            periods=3,
             freq="MS"
         )
-        fit = model.fit()
-        forecast_values = fit.forecast(3)
-
-    # Build forecast DataFrame
-    forecast_months = pd.date_range(
-        revenue_series.index[-1] + pd.offsets.MonthBegin(),
-        periods=3,
-        freq="MS"
+        forecast_df = pd.DataFrame({
+            "Month": forecast_months.strftime("%B"),
+            "Forecasted_Revenue": forecast_values
+        })
+
+        # =====================================================
+        # APPLY COLLEGE-TOWN SEASONAL LOGIC
+        # =====================================================
+        # December & January -> fewer students = sales dip
+        # February -> rebound when spring semester starts (see forecast_service)
+        forecast_df["Forecasted_Revenue"] = college_town_adjust(forecast_df["Month"], forecast_df["Forecasted_Revenue"])
+
+        # =====================================================
+        # PREDICTION BANDS (residual bootstrap, see prediction_bands)
+        # =====================================================
+        # Paths are simulated around the model forecast and then get the
+        # same college-town factors as the line.
+        params = forecast_info["params"]
+        bands, band_info = series_bands(
+            forecast_values.to_numpy(), forecast_info["resid"],
+            params["smoothing_level"], params.get("smoothing_trend") or 0.0,
+            scale=college_town_adjust(forecast_df["Month"], np.ones(len(forecast_df))),
+        )
+        forecast_df = forecast_df.assign(**bands)
+        model_text += f"  \nShaded: {describe(band_info)}"
+
+        # Add both actual + forecasted lines
+        forecast_fig.add_scatter(
+            x=[period_label(ts) for ts in revenue_series.index],
+            y=revenue_series["Amount"],
+            mode="lines+markers",
+            name="Actual Revenue",
+            line=dict(color="#8B0000", width=3)
+        )
+        # Year-qualified labels: a full year of actuals plus forecasts repeats month names
+        forecast_labels = [period_label(ts) for ts in forecast_months]
+        add_bands(forecast_fig, forecast_labels, forecast_df)
+        forecast_fig.add_scatter(
+            x=forecast_labels,
+            y=forecast_df["Forecasted_Revenue"],
+            mode="lines+markers",
+            name="Forecasted Revenue",
+            line=dict(color="#B71C1C", dash="dash", width=3)
+        )
+
+    forecast_fig.update_layout(
+        template="plotly_white",
+        showlegend=True,
+        title=None,
+        height=430,
+        legend=dict(orientation="h", y=-0.2, x=0.3)
     )
-    forecast_df = pd.DataFrame({
-        "Month": forecast_months.strftime("%B"),
-        "Forecasted_Revenue": forecast_values
-    })
 
     # =====================================================
-    # APPLY COLLEGE-TOWN SEASONAL LOGIC
+    # GRAPH 2 — PER-INGREDIENT DEMAND FORECAST (RECIPE MATRIX)
+    # =====================================================
+    # Forecast item volumes pushed through the recipe matrix (see
+    # ingredient_usage.demand_forecast); one precomputed table per ingredient.
+    demand_bands = demand_df.attrs.get("bands")
+    demand_text = f"Shaded: {describe(demand_bands)}" if demand_bands else ""
+    demand_table = pd.concat([
+        usage_summary.rename(columns={"Total_Used": "Quantity"}).assign(Kind="Actual"),
+        demand_df.rename(columns={"Forecast_Used": "Quantity"}).assign(Kind="Forecast"),
+    ], ignore_index=True)[["Ingredient", "Period", "Month", "Quantity", "Kind", *BAND_COLUMNS]]
+    demand_table["Period"] = demand_table["Period"].astype(str)
+    demand_table = demand_table.sort_values(["Ingredient", "Period"], kind="stable")
+    demand_by_ingredient = {ing: g for ing, g in demand_table.groupby("Ingredient", sort=False)}
+    next_month = demand_df[demand_df["Period"] == demand_df["Period"].min()]
+    ingredient_options = [
+        {"label": ing, "value": ing}
+        for ing in next_month.sort_values("Forecast_Used", ascending=False, kind="stable")["Ingredient"]
+    ]
+
+    # =====================================================
+    # GRAPH 3 — PER-CATEGORY / PER-ITEM FORECASTS (batch_forecast.py)
     # =====================================================
-    # December & January -> fewer students = sales dip
-    # February -> rebound when spring semester starts
-    forecast_df.loc[forecast_df["Month"] == "December", "Forecasted_Revenue"] *= 0.75
-    forecast_df.loc[forecast_df["Month"] == "January", "Forecasted_Revenue"] *= 0.80
-    forecast_df.loc[forecast_df["Month"] == "February", "Forecasted_Revenue"] *= 1.05
-
-    # Add both actual + forecasted lines
-    forecast_fig.add_scatter(
-        x=revenue_series.index.strftime("%B"),
-        y=revenue_series["Amount"],
-        mode="lines+markers",
-        name="Actual Revenue",
-        line=dict(color="#8B0000", width=3)
+    series_actuals = level_frames(cube_df)
+    series_forecasts = {key: g for key, g in forecast_table.groupby(["Level", "Name"], sort=False)}
+    series_options = [{"label": f"{level}: {name}", "value": f"{level}|{name}"} for level, name in series_forecasts]
+    batch_text = "⚠️ No batch forecasts yet — run `python batch_forecast.py`."
+    if series_forecasts:
+        per_series = forecast_table.drop_duplicates(["Level", "Name"])
+        counts = ", ".join(f"{n} {status}" for status, n in per_series["Status"].value_counts().items())
+        batch_text = f"{len(per_series)} series forecast ({counts})."
+
+    # =====================================================
+    # TABLE — MODEL BACKTEST (backtest.py)
+    # =====================================================
+    backtest_table = backtest_df.rename(columns={
+        "MAPE_%": "MAPE (%)", "Fit_ms": "Fit (ms)", "Predict_ms": "Predict (ms)",
+    })
+
+    return SimpleNamespace(
+        backtest_table=backtest_table,
+        series_actuals=series_actuals,
+        series_forecasts=series_forecasts,
+        series_options=series_options,
+        batch_text=batch_text,
+        monthly_revenue=monthly_revenue,
+        forecast_df=forecast_df,
+        forecast_info=forecast_info,
+        model_text=model_text,
+        usage_summary=usage_summary,
+        forecast_fig=freeze(forecast_fig),
+        demand_by_ingredient=demand_by_ingredient,
+        demand_text=demand_text,
+        ingredient_options=ingredient_options,
     )
-    forecast_fig.add_scatter(
-        x=forecast_df["Month"],
-        y=forecast_df["Forecasted_Revenue"],
-        mode="lines+markers",
-        name="Forecasted Revenue",
-        line=dict(color="#B71C1C", dash="dash", width=3)
+
+
+def forecast_result():
+    """Last completed forecast job (see forecast_jobs); queues a recompute if the data changed."""
+    return forecast_jobs.latest(JOB_NAME, data_version(), _page_data)
+
+
+def page_data(wait=False):
+    """Latest completed forecast data, None until the first job finishes.
+
+    With ``wait`` it blocks until the job for the current data version is done.
+    """
+    result = forecast_result()
+    if wait and (result is None or result.version != data_version()):
+        result = forecast_jobs.wait(JOB_NAME, data_version())
+    return result.value if result is not None else None
+
+
+def job_data(version):
+    """Data of the latest forecast job if it is for ``version``; else no update (a newer one landed)."""
+    result = forecast_result()
+    if result is None or result.version != version:
+        raise PreventUpdate
+    return result.value
+
+
+def polling_done(result):
+    """The poll can stop: the shown forecasts are current, or the job for the current data failed."""
+    version = data_version()
+    return (result is not None and result.version == version) or forecast_jobs.failure(JOB_NAME, version) is not None
+
+
+def status_text(result):
+    """"As of" line: when the shown forecasts were computed, for which data, and whether a refresh is running or failed."""
+    version = data_version()
+    failed = forecast_jobs.failure(JOB_NAME, version)
+    failed_text = failed and (
+        f"⚠️ Forecasts failed (attempt {failed.attempts}): {failed.message} — retried on the next visit after "
+        f"{time.strftime('%H:%M:%S', time.localtime(failed.retry_at))}"
     )
+    if result is None:
+        return failed_text or "⏳ Computing forecasts…"
+    text = (f"Forecasts as of {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(result.finished_at))} "
+            f"· data version `{result.version}` · computed in {result.seconds:.1f} s")
+    if result.version != version:
+        text += f" · {failed_text}" if failed else " · ⏳ refreshing for new data…"
+    return text
 
-forecast_fig.update_layout(
-    template="plotly_white",
-    showlegend=True,
-    title=None,
-    height=430,
-    legend=dict(orientation="h", y=-0.2, x=0.3)
-)
 
 # =====================================================
-# GRAPH 2 — INGREDIENT DEMAND FORECAST (REGRESSION)
+# FIGURE HELPERS (LRU-cached per series and the forecast job version they are built from)
 # =====================================================
-usage_summary = pd.DataFrame(columns=["Month", "Ingredient", "Total_Used"])
-if not ingredient_df.empty and not details_df.empty:
-    ingredient_df.columns = [c.strip().lower().replace(" ", "_") for c in ingredient_df.columns]
-    ingredient_df.rename(columns={"item_name": "Item Name"}, inplace=True, errors="ignore")
-
-    def normalize(text):
-        return re.sub(r'[^a-z0-9]+', ' ', str(text).lower()).strip()
-
-    details_df["key"] = details_df["Item Name"].apply(normalize)
-    ingredient_df["key"] = ingredient_df["Item Name"].apply(normalize)
-
-    def is_similar(a, b, threshold=0.85):
-        return SequenceMatcher(None, a, b).ratio() >= threshold
-
-    merged_rows = []
-    for _, irow in ingredient_df.iterrows():
-        key_i = irow["key"]
-        matches = details_df[details_df["key"].apply(lambda x: is_similar(x, key_i))]
-        if not matches.empty:
-            tmp = matches.copy()
-            for col in ingredient_df.columns:
-                if col not in tmp.columns:
-                    tmp[col] = irow[col]
-            merged_rows.append(tmp)
-
-    if merged_rows:
-        merged_df = pd.concat(merged_rows, ignore_index=True)
-        ingredient_cols = [col for col in merged_df.columns if col not in
-                           ["source_page", "source_table", "Group", "Count", "Amount", "Month",
-                            "Sheet_Type", "Category", "Item Name", "key"]]
-        usage_records = []
-        for _, row in merged_df.iterrows():
-            for col in ingredient_cols:
-                val = pd.to_numeric(row[col], errors="coerce")
-                if pd.notna(val) and val > 0:
-                    usage_records.append({
-                        "Month": row["Month"],
-                        "Ingredient": col,
-                        "Total_Used": val * row["Count"]
-                    })
-        if usage_records:
-            usage_df = pd.DataFrame(usage_records)
-            usage_summary = usage_df.groupby(["Month", "Ingredient"], as_index=False, observed=False)["Total_Used"].sum()
-
-ing_forecast_fig = px.line()
-if not forecast_df.empty and not usage_summary.empty:
-    total_ing_df = usage_summary.groupby("Month", as_index=False, observed=False)["Total_Used"].sum()
-    merged_forecast_data = pd.merge(monthly_revenue, total_ing_df, on="Month", how="inner")
-
-    if len(merged_forecast_data) >= 2:
-        X = merged_forecast_data[["Amount"]].values
-        y = merged_forecast_data["Total_Used"].values
-        reg = LinearRegression().fit(X, y)
-        forecast_df["Predicted_Ingredients"] = reg.predict(forecast_df[["Forecasted_Revenue"]].values)
-
-        ing_forecast_fig.add_scatter(
-            x=merged_forecast_data["Month"],
-            y=merged_forecast_data["Total_Used"],
-            mode="lines+markers",
-            name="Actual Usage",
-            line=dict(color="#8B0000", width=3)
-        )
-        ing_forecast_fig.add_scatter(
-            x=forecast_df["Month"],
-            y=forecast_df["Predicted_Ingredients"],
-            mode="lines+markers",
-            name="Forecasted Usage",
-            line=dict(color="#B71C1C", dash="dash", width=3)
-        )
+STATUS_NOTES = {
+    "fitted": "Holt-Winters fit", "cached": "Holt-Winters fit (cached)",
+    "batched": "Holt fit (batched NumPy engine)",
+    "sparse": "too few months with sales — mean of history",
+    "timeout": "fit timed out — mean of history", "error": "fit failed — mean of history",
+}
+
+
+@cached_figure("ingredient_demand")
+def ingredient_demand(ingredient, version):
+    df = job_data(version).demand_by_ingredient[ingredient]
+    actual, forecast_rows = df[df["Kind"] == "Actual"], df[df["Kind"] == "Forecast"]
+
+    fig = px.line()
+    actual_x, forecast_x = actual["Period"].map(period_label), forecast_rows["Period"].map(period_label)
+    fig.add_scatter(x=actual_x, y=actual["Quantity"], mode="lines+markers",
+                    name="Actual Usage", line=dict(color="#8B0000", width=3))
+    add_bands(fig, forecast_x, forecast_rows)
+    fig.add_scatter(x=forecast_x, y=forecast_rows["Quantity"], mode="lines+markers",
+                    name="Forecasted Usage", line=dict(color="#B71C1C", dash="dash", width=3))
+    fig.update_layout(template="plotly_white", title=None, showlegend=True, height=430,
+                      yaxis_title=ingredient, legend=dict(orientation="h", y=-0.2, x=0.3))
+
+    insight = "⚠️ No forecast for this ingredient."
+    if not forecast_rows.empty:
+        first = forecast_rows.iloc[0]
+        insight = (f"**{ingredient}**: **{first['Quantity']:,.0f}** expected in {first['Month']} "
+                   f"(80%: {first['Lower_80']:,.0f}–{first['Upper_80']:,.0f}), "
+                   f"**{forecast_rows['Quantity'].sum():,.0f}** over the next {len(forecast_rows)} months.")
+    return fig, dcc.Markdown(insight, style={"textAlign": "center", "fontSize": "16px", "fontWeight": "500"})
+
+
+@cached_figure("series_forecast")
+def series_forecast(value, version):
+    data = job_data(version)
+    level, name = value.split("|", 1)
+    measure, wide = data.series_actuals[level]
+    forecast_rows = data.series_forecasts[(level, name)]
+    label = "Revenue ($)" if measure == "Amount" else "Units Sold"
+
+    fig = px.line()
+    if name in wide.columns:
+        fig.add_scatter(x=[period_label(p) for p in wide.index], y=wide[name], mode="lines+markers",
+                        name=f"Actual {label}", line=dict(color="#8B0000", width=3))
+    fig.add_scatter(x=forecast_rows["Period"].map(period_label), y=forecast_rows["Forecast"], mode="lines+markers",
+                    name=f"Forecasted {label}", line=dict(color="#B71C1C", dash="dash", width=3))
+    fig.update_layout(template="plotly_white", title=None, showlegend=True, height=430,
+                      yaxis_title=label, legend=dict(orientation="h", y=-0.2, x=0.3))
+
+    first = forecast_rows.iloc[0]
+    insight = (f"**{name}**: next month **{first['Forecast']:,.0f}** — "
+               f"{STATUS_NOTES.get(first['Status'], first['Status'])}")
+    if first["Variant"] != "mean":
+        insight += f" ({MODEL_NAMES.get(first['Variant'], first['Variant'])}, {first['Fit_ms']:,.0f} ms)"
+    return fig, dcc.Markdown(insight + ".", style={"textAlign": "center", "fontSize": "16px", "fontWeight": "500"})
 
-ing_forecast_fig.update_layout(
-    template="plotly_white",
-    title=None,
-    showlegend=True,
-    height=430,
-    legend=dict(orientation="h", y=-0.2, x=0.3)
-)
 
 # =====================================================
-# PAGE 3 LAYOUT (Dark Red Theme)
+# PAGE 3 LAYOUT (Dark Red Theme) (built on first navigation)
 # =====================================================
-layout = html.Div([
-    html.H2("Forecasts & Predictions", className="text-center fw-bold mt-4 mb-4", style={"color": "#2B0000"}),
+def render_forecasts(data):
+    """The forecast sections for one completed job's data."""
+    return [
+        html.Div([
+            html.Div("3-Month Revenue Forecast (Holt-Winters with College-Town Adjustments)",
+                     className="fw-bold text-center text-white",
+                     style={"backgroundColor": "#8B0000", "padding": "10px", "borderRadius": "8px 8px 0 0"}),
+            html.Div([
+                dcc.Graph(figure=data.forecast_fig, style={"height": "430px"}),
+                dcc.Markdown(data.model_text, style={"textAlign": "center", "fontSize": "14px", "color": "#555"})
+            ], style={"border": "1px solid #ddd", "borderTop": "none",
+                      "padding": "20px", "borderRadius": "0 0 8px 8px"})
+        ], style={"marginBottom": "50px"}),
 
-    html.Div([
-        html.Div("3-Month Revenue Forecast (Holt-Winters with College-Town Adjustments)",
-                 className="fw-bold text-center text-white",
-                 style={"backgroundColor": "#8B0000", "padding": "10px", "borderRadius": "8px 8px 0 0"}),
         html.Div([
-            dcc.Graph(figure=forecast_fig, style={"height": "430px"})
-        ], style={"border": "1px solid #ddd", "borderTop": "none",
-                  "padding": "20px", "borderRadius": "0 0 8px 8px"})
-    ], style={"marginBottom": "50px"}),
-
-    html.Div([
-        html.Div("3-Month Ingredient Demand Forecast",
-                 className="fw-bold text-center text-white",
-                 style={"backgroundColor": "#8B0000", "padding": "10px", "borderRadius": "8px 8px 0 0"}),
+            html.Div("3-Month Ingredient Demand Forecast (Item Volumes × Recipes)",
+                     className="fw-bold text-center text-white",
+                     style={"backgroundColor": "#8B0000", "padding": "10px", "borderRadius": "8px 8px 0 0"}),
+            html.Div([
+                dcc.Dropdown(
+                    id="ingredient-forecast-select", options=data.ingredient_options,
+                    value=data.ingredient_options[0]["value"] if data.ingredient_options else None,
+                    clearable=False,
+                    style={"width": "50%", "margin": "10px auto 20px auto", "textAlign": "center"}
+                ),
+                dcc.Graph(id="ingredient-forecast-chart", style={"height": "430px"}),
+                html.Div(id="ingredient-forecast-insights", style={"marginTop": "10px"}),
+                dcc.Markdown(data.demand_text, style={"textAlign": "center", "fontSize": "14px", "color": "#555"})
+            ], style={"border": "1px solid #ddd", "borderTop": "none",
+                      "padding": "20px", "borderRadius": "0 0 8px 8px"})
+        ], style={"marginBottom": "50px"}),
+
         html.Div([
-            dcc.Graph(figure=ing_forecast_fig, style={"height": "430px"})
-        ], style={"border": "1px solid #ddd", "borderTop": "none",
-                  "padding": "20px", "borderRadius": "0 0 8px 8px"})
-    ])
-],
-style={
-    "maxWidth": "1600px",
-    "margin": "auto",
-    "paddingBottom": "60px",
-    "overflowX": "hidden"
-})
+            html.Div("3-Month Forecast by Category & Menu Item",
+                     className="fw-bold text-center text-white",
+                     style={"backgroundColor": "#8B0000", "padding": "10px", "borderRadius": "8px 8px 0 0"}),
+            html.Div([
+                dcc.Markdown(data.batch_text, style={"textAlign": "center", "fontSize": "14px", "color": "#555"}),
+                dcc.Dropdown(
+                    id="series-forecast-select", options=data.series_options,
+                    value=data.series_options[0]["value"] if data.series_options else None,
+                    clearable=False,
+                    style={"width": "50%", "margin": "10px auto 20px auto", "textAlign": "center"}
+                ),
+                dcc.Graph(id="series-forecast-chart", style={"height": "430px"}),
+                html.Div(id="series-forecast-insights", style={"marginTop": "10px"})
+            ], style={"border": "1px solid #ddd", "borderTop": "none",
+                      "padding": "20px", "borderRadius": "0 0 8px 8px"})
+        ], style={"marginBottom": "50px"}),
+
+        html.Div([
+            html.Div("Forecast Model Backtest (Rolling Origin)",
+                     className="fw-bold text-center text-white",
+                     style={"backgroundColor": "#8B0000", "padding": "10px", "borderRadius": "8px 8px 0 0"}),
+            html.Div([
+                dbc.Table.from_dataframe(data.backtest_table, striped=True, hover=True, size="sm")
+                if not data.backtest_table.empty else
+                dcc.Markdown("⚠️ No backtest results yet — run `python backtest.py`.",
+                             style={"textAlign": "center", "fontSize": "14px", "color": "#555"})
+            ], style={"border": "1px solid #ddd", "borderTop": "none",
+                      "padding": "20px", "borderRadius": "0 0 8px 8px"})
+        ])
+    ]
+
+
+def build_layout():
+    # Renders whatever forecast is ready now; the poll callback swaps in newer ones
+    result = forecast_result()
+    return html.Div([
+        html.H2("Forecasts & Predictions", className="text-center fw-bold mt-4 mb-4", style={"color": "#2B0000"}),
+        dcc.Markdown(status_text(result), id="forecast-status",
+                     style={"textAlign": "center", "fontSize": "14px", "color": "#555"}),
+        dcc.Store(id="forecast-version", data=result.version if result is not None else None),
+        dcc.Interval(id="forecast-poll", interval=POLL_MS, disabled=polling_done(result)),
+        html.Div(render_forecasts(result.value) if result is not None else [], id="forecast-body")
+    ],
+    style={
+        "maxWidth": "1600px",
+        "margin": "auto",
+        "paddingBottom": "60px",
+        "overflowX": "hidden"
+    })
 
 # =====================================================
-# CALLBACKS (none for now)
+# CALLBACKS
 # =====================================================
 def register_callbacks(app):
-    """Register callbacks for this page (currently none)."""
-    pass
\ No newline at end of file
+    @app.callback([Output("forecast-body", "children"), Output("forecast-version", "data"),
+                   Output("forecast-status", "children"), Output("forecast-poll", "disabled")],
+                  Input("forecast-poll", "n_intervals"),
+                  State("forecast-version", "data"))
+    def poll_forecasts(_, shown_version):
+        result = forecast_result()
+        done = polling_done(result)
+        if result is None or result.version == shown_version:
+            return no_update, no_update, status_text(result), done
+        return render_forecasts(result.value), result.version, status_text(result), done
+
+    @app.callback([Output("ingredient-forecast-chart", "figure"), Output("ingredient-forecast-insights", "children")],
+                  Input("ingredient-forecast-select", "value"))
+    def update_ingredient_demand(ingredient):
+        result = forecast_result()
+        if result is None or ingredient not in result.value.demand_by_ingredient:
+            return px.line(), ""
+        return ingredient_demand(ingredient, result.version)
+
+    @app.callback([Output("series-forecast-chart", "figure"), Output("series-forecast-insights", "children")],
+                  Input("series-forecast-select", "value"))
+    def update_series_forecast(value):
+        result = forecast_result()
+        if result is None or value is None or tuple(value.split("|", 1)) not in result.value.series_forecasts:
+            return px.line(), ""
+        return series_forecast(value, result.version)
\ No newline at end of file
@@ -0,0 +1,132 @@
+import time
+
+import numpy as np
+
+from holt_batch import fit_holt, forecast_holt, holt_filter
+
+# ==========================================
+# Residual-bootstrap prediction bands, simulated as one array operation
+# ==========================================
+# For additive Holt smoothing the value h steps ahead is the point forecast
+# plus a weighted sum of the future one-step errors e_1 .. e_h:
+#
+#   y_h = yhat_h + e_h + sum_{j<h} alpha * (1 + (h - j) * beta) * e_j
+#
+# (each error moves the level by alpha * e and the trend by alpha * beta * e;
+# with additive seasonality the same holds while h <= seasonal_periods).
+# So one simulated path is  yhat + C @ e,  with C a lower-triangular
+# (horizon x horizon) weight matrix, and the errors are drawn with
+# replacement from the series' own centred in-sample one-step residuals.
+# All paths for all series are one gather of residuals and one einsum;
+# nothing loops over paths or steps. Every series draws the same months, so
+# the correlation between series (e.g. items sold on the same busy month)
+# is kept when their paths are summed. Quantiles over the paths give the
+# bands.
+#
+# With only a handful of months a plain bootstrap has a handful of distinct
+# errors, and the 80% and 95% quantiles land on the same residual. Each
+# draw is therefore jittered with Gaussian noise (a smoothed bootstrap,
+# Silverman bandwidth) and rescaled so the error variance is unchanged.
+#
+# The number of paths is sized to a latency budget: a pilot batch is timed
+# and the main draw gets as many paths as fit in HEADROOM of the rest of
+# BUDGET_MS (larger draws cost a little more per path than the pilot),
+# between MIN_PATHS and MAX_PATHS.
+BAND_LEVELS = (80, 95)
+BAND_COLUMNS = [f"{side}_{level}" for level in BAND_LEVELS for side in ("Lower", "Upper")]
+BUDGET_MS = 50.0
+PILOT_PATHS = 256
+MIN_PATHS = 1_000
+MAX_PATHS = 20_000
+HEADROOM = 0.75
+SEED = 0  # fixed so the same data gives the same bands
+
+
+def error_weights(alpha, beta, horizon):
+    """(series x horizon x horizon) weights C with path = point + C @ errors."""
+    alpha = np.atleast_1d(np.asarray(alpha, dtype="float64"))[:, None, None]
+    beta = np.atleast_1d(np.asarray(beta, dtype="float64"))[:, None, None]
+    lag = np.arange(horizon)[:, None] - np.arange(horizon)[None, :]  # h - j
+    return np.where(lag > 0, alpha * (1 + lag * beta), 0.0) + (lag == 0)
+
+
+def holt_error_model(Y, horizon, min_points=2):
+    """Point forecasts, one-step residuals and error weights for every row of ``Y``.
+
+    Rows are fitted the way ``holt_batch.forecast_matrix`` fits them: Holt
+    when they have ``min_points`` positive periods, else their mean (whose
+    residuals are the deviations from it and whose errors do not carry
+    over, alpha = beta = 0). Returns ``(point, residuals, weights)``.
+    """
+    Y = np.atleast_2d(np.asarray(Y, dtype="float64"))
+    mean = Y.mean(axis=1, keepdims=True)
+    point = np.repeat(mean, horizon, axis=1)
+    residuals = Y - mean
+    alpha, beta = np.zeros(len(Y)), np.zeros(len(Y))
+    dense = (Y > 0).sum(axis=1) >= max(min_points, 2)
+    if dense.any():
+        fit = fit_holt(Y[dense])
+        fitted, _, _ = holt_filter(Y[dense], fit.alpha, fit.beta, fit.level0, fit.trend0)
+        point[dense] = forecast_holt(fit, horizon)
+        residuals[dense] = Y[dense] - fitted
+        alpha[dense], beta[dense] = fit.alpha, fit.beta
+    return point, residuals, error_weights(alpha, beta, horizon)
+
+
+def simulate_paths(point, residuals, weights, n_paths, rng):
+    """(paths x series x horizon) bootstrap paths for (series x horizon) point forecasts."""
+    point, residuals = np.atleast_2d(point), np.atleast_2d(residuals)
+    centred = residuals - residuals.mean(axis=1, keepdims=True)
+    spread = centred.std(axis=1)[:, None, None]
+    bandwidth = 1.06 * residuals.shape[1] ** -0.2
+    months = rng.integers(0, residuals.shape[1], size=(n_paths, point.shape[1]))
+    jitter = rng.standard_normal((len(point), n_paths, point.shape[1]))
+    errors = (centred[:, months] + bandwidth * spread * jitter) / np.sqrt(1 + bandwidth ** 2)  # series x paths x horizon
+    return point[None, :, :] + np.einsum("shj,spj->psh", weights, errors)
+
+
+def within_budget(simulate, budget_ms=BUDGET_MS, seed=SEED):
+    """Run ``simulate(n_paths, rng)`` (paths on axis 0) with as many paths as fit in ``budget_ms``.
+
+    Returns ``(paths, info)``; info holds the path count, the elapsed
+    milliseconds and the budget.
+    """
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    pilot = simulate(PILOT_PATHS, rng)
+    spent = (time.perf_counter() - start) * 1000
+    per_path = max(spent / PILOT_PATHS, 1e-9)
+    n = int(np.clip(HEADROOM * (budget_ms - spent) / per_path, MIN_PATHS - PILOT_PATHS, MAX_PATHS - PILOT_PATHS))
+    paths = np.concatenate([pilot, simulate(n, rng)])
+    ms = (time.perf_counter() - start) * 1000
+    return paths, {"paths": len(paths), "ms": round(ms, 2), "budget_ms": budget_ms}
+
+
+def band_columns(paths, levels=BAND_LEVELS):
+    """``{"Lower_80": ..., "Upper_80": ..., ...}``: quantiles over the paths (axis 0), one call."""
+    tails = [(100 - level) / 200 for level in levels]
+    q = np.quantile(paths, [p for t in tails for p in (t, 1 - t)], axis=0)
+    columns = {}
+    for i, level in enumerate(levels):
+        columns[f"Lower_{level}"], columns[f"Upper_{level}"] = q[2 * i], q[2 * i + 1]
+    return columns
+
+
+def series_bands(point, residuals, alpha, beta, scale=1.0, budget_ms=BUDGET_MS):
+    """Bands for one forecast (e.g. page 3 revenue): ``(band_columns, info)``.
+
+    ``scale`` multiplies every path, e.g. the college-town month factors.
+    """
+    point = np.asarray(point, dtype="float64")
+    weights = error_weights(alpha, beta, len(point))
+    residuals = np.asarray(residuals, dtype="float64")
+    paths, info = within_budget(
+        lambda n, rng: simulate_paths(point, residuals, weights, n, rng)[:, 0, :] * scale, budget_ms)
+    return band_columns(paths), info
+
+
+def describe(info, levels=BAND_LEVELS):
+    """One-line summary of how a set of bands was simulated."""
+    over = " — over budget" if info["ms"] > info["budget_ms"] else ""
+    return (f"{'/'.join(f'{level}%' for level in levels)} bands from {info['paths']:,} bootstrap paths, "
+            f"simulated in {info['ms']:,.1f} ms (budget {info['budget_ms']:,.0f} ms{over})")
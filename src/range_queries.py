@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+# =====================================================
+# Date-range totals from prefix sums
+# =====================================================
+# Totals over an arbitrary run of months are built from cumulative sums
+# along the period axis: for every series (a category, an ingredient, ...)
+# the total over periods i..j is cum[j + 1] - cum[i]. Building the table is
+# one pivot + cumsum per data version; each range query is then a single
+# vector subtraction, however many years of history there are.
+
+
+class PrefixSums:
+    """Cumulative sums of ``value`` per ``key`` over an ordered list of periods.
+
+    With ``key=None`` there is a single series named "Total".
+    """
+
+    def __init__(self, df, key, value, periods, period_col="Period"):
+        self.periods = [str(p) for p in periods]
+        if key is None:
+            df, key = df.assign(_key="Total"), "_key"
+        wide = (
+            df.assign(**{period_col: df[period_col].astype(str)})
+            .pivot_table(index=period_col, columns=key, values=value, aggfunc="sum", observed=True)
+            .reindex(self.periods)
+            .fillna(0.0)
+        )
+        self.keys = wide.columns.rename(None)
+        self.cum = np.vstack([np.zeros((1, wide.shape[1])), np.cumsum(wide.to_numpy(dtype="float64"), axis=0)])
+        self.cum_total = self.cum.sum(axis=1)
+
+    def _bounds(self, start, end):
+        i, j = self.periods.index(str(start)), self.periods.index(str(end))
+        return (i, j) if i <= j else (j, i)
+
+    def totals(self, start, end):
+        """Series of per-key totals for ``start``..``end`` inclusive."""
+        i, j = self._bounds(start, end)
+        return pd.Series(self.cum[j + 1] - self.cum[i], index=self.keys)
+
+    def total(self, start, end):
+        """Grand total over all keys for ``start``..``end`` inclusive."""
+        i, j = self._bounds(start, end)
+        return float(self.cum_total[j + 1] - self.cum_total[i])
+
+    def running(self, start, end):
+        """Per-period running total across all keys, restarting at ``start``."""
+        i, j = self._bounds(start, end)
+        return pd.Series(self.cum_total[i + 1:j + 2] - self.cum_total[i], index=self.periods[i:j + 1])
+
+
+def range_marks(periods, labels):
+    """RangeSlider marks (index -> label) for the period axis."""
+    return {i: labels.get(p, p) for i, p in enumerate(periods)}
+
+
+def clamp_range(selected, n):
+    """RangeSlider ``[start, end]`` as int indexes clamped to ``0 .. n - 1`` (values may be stale)."""
+    start, end = (min(max(int(v), 0), n - 1) for v in selected)
+    return min(start, end), max(start, end)
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+from monthly_store import DATA_DIR, atomic_path
+
+# ==========================================
+# Fuzzy matching of POS item names to recipes
+# ==========================================
+# A POS item uses a recipe row when their normalized names have a
+# SequenceMatcher ratio >= MATCH_THRESHOLD. Scoring every item against every
+# recipe is O(items x recipes) pure-Python comparisons, so instead:
+#
+#   1. distinct normalized keys are matched once, not once per POS row;
+#   2. a character-bigram index blocks candidates: for a threshold above 0.8,
+#      two keys of length >= 2 can only reach it if they share a bigram;
+#   3. the length bound (real_quick_ratio) and the character-multiset bound
+#      (quick_ratio) are applied to all candidates at once with NumPy;
+#   4. only the survivors are scored with SequenceMatcher.ratio().
+#
+# All three filters are upper bounds on ratio(), so the result is exactly
+# what the brute-force loop produced. Matches are persisted per recipe set
+# and threshold, so a worker boot only scores keys it has never seen.
+MATCH_THRESHOLD = 0.85
+MATCH_CACHE = DATA_DIR / ".match_cache" / "recipe_matches.json"
+MATCH_CACHE_VERSION = 1
+
+
+def normalize_key(text):
+    """Lower-case and collapse everything but letters and digits to single spaces."""
+    return re.sub(r'[^a-z0-9]+', ' ', str(text).lower()).strip()
+
+
+def _bigrams(key):
+    return {key[i:i + 2] for i in range(len(key) - 1)}
+
+
+class _KeyIndex:
+    """Bigram postings, lengths and character counts for a list of keys."""
+
+    def __init__(self, keys, alphabet):
+        self.keys = keys
+        self.lengths = np.fromiter((len(k) for k in keys), dtype=np.int64, count=len(keys))
+        self.char_counts = _char_counts(keys, alphabet)
+
+        postings = defaultdict(list)
+        for i, key in enumerate(keys):
+            for gram in _bigrams(key):
+                postings[gram].append(i)
+        self.postings = {gram: np.array(ids, dtype=np.int64) for gram, ids in postings.items()}
+        # Keys without a bigram can't be blocked and are always candidates
+        self.short = np.flatnonzero(self.lengths < 2)
+
+    def candidates(self, key):
+        if len(key) < 2:
+            return np.arange(len(self.keys))
+        hit = np.zeros(len(self.keys), dtype=bool)
+        hit[self.short] = True
+        for gram in _bigrams(key):
+            if gram in self.postings:
+                hit[self.postings[gram]] = True
+        return np.flatnonzero(hit)
+
+
+def _char_counts(keys, alphabet):
+    """(len(keys), len(alphabet)) matrix of per-key character counts."""
+    codes = np.frombuffer("".join(keys).encode("utf-32-le"), dtype=np.uint32)
+    columns = np.searchsorted(np.array([ord(ch) for ch in alphabet], dtype=np.uint32), codes)
+    rows = np.repeat(np.arange(len(keys)), [len(k) for k in keys])
+    counts = np.bincount(rows * len(alphabet) + columns, minlength=len(keys) * len(alphabet))
+    return counts.reshape(len(keys), len(alphabet)).astype(np.int32)
+
+
+def match_keys(keys, recipe_keys, threshold=MATCH_THRESHOLD):
+    """Map each distinct key to the distinct recipe keys it matches.
+
+    Returns ``{key: [recipe_key, ...]}`` with recipe keys in first-seen
+    order; keys that match nothing map to an empty list.
+    """
+    keys = list(dict.fromkeys(keys))
+    recipe_keys = list(dict.fromkeys(recipe_keys))
+    matches = {key: [] for key in keys}
+    if not keys or not recipe_keys:
+        return matches
+
+    alphabet = sorted(set("".join(keys)) | set("".join(recipe_keys)))
+    index = _KeyIndex(keys, alphabet)
+    recipe_counts = _char_counts(recipe_keys, alphabet)
+    blocked = threshold > 0.8
+
+    for r, recipe in enumerate(recipe_keys):
+        cand = index.candidates(recipe) if blocked else np.arange(len(keys))
+        if not len(cand):
+            continue
+
+        total = index.lengths[cand] + len(recipe)
+        # real_quick_ratio: matched chars can't exceed the shorter key
+        bound = 2.0 * np.minimum(index.lengths[cand], len(recipe))
+        keep = bound >= threshold * total
+        cand, total = cand[keep], total[keep]
+
+        # quick_ratio: nor the shared character multiset
+        shared = np.minimum(index.char_counts[cand], recipe_counts[r]).sum(axis=1)
+        keep = 2.0 * shared >= threshold * total
+        # ratio() of two empty strings is 1.0
+        keep |= total == 0
+
+        for i in cand[keep]:
+            key = keys[i]
+            if SequenceMatcher(None, key, recipe).ratio() >= threshold:
+                matches[key].append(recipe)
+    return matches
+
+
+# ==========================================
+# Persisted match table
+# ==========================================
+def recipes_hash(recipe_keys, threshold):
+    """Identifies a recipe set + threshold; a persisted table is only reused for the same one."""
+    payload = json.dumps([MATCH_CACHE_VERSION, threshold, list(recipe_keys)])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load_match_table(recipe_keys, threshold=MATCH_THRESHOLD, path=MATCH_CACHE):
+    """Persisted ``{key: [recipe_key, ...]}`` for this recipe set, or {} if absent/stale."""
+    try:
+        with open(path) as f:
+            table = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if table.get("recipes") != recipes_hash(recipe_keys, threshold):
+        return {}
+    return table.get("matches", {})
+
+
+def save_match_table(matches, recipe_keys, threshold=MATCH_THRESHOLD, path=MATCH_CACHE):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_path(path) as tmp:
+        with open(tmp, "w") as f:
+            json.dump({"recipes": recipes_hash(recipe_keys, threshold), "matches": matches}, f)
+
+
+def match_recipes(keys, recipe_keys, threshold=MATCH_THRESHOLD, path=MATCH_CACHE):
+    """``match_keys`` backed by the persisted table: only unseen keys are scored."""
+    recipe_keys = list(dict.fromkeys(recipe_keys))
+    table = load_match_table(recipe_keys, threshold, path)
+    unseen = [k for k in dict.fromkeys(keys) if k not in table]
+    if unseen:
+        table.update(match_keys(unseen, recipe_keys, threshold))
+        try:
+            save_match_table(table, recipe_keys, threshold, path)
+        except OSError as e:  # read-only deploys still get the matches
+            print(f"⚠️ Could not persist recipe matches: {e}")
+    return {k: table[k] for k in keys}
+
+
+# ==========================================
+# Row pairs
+# ==========================================
+def match_rows(details_df, ingredient_df, threshold=MATCH_THRESHOLD, path=MATCH_CACHE):
+    """Positional ``(row, recipe)`` pairs: Details row ``row`` uses recipe row ``recipe``.
+
+    ``ingredient_df`` needs an "Item Name" column. Pairs are ordered recipe
+    by recipe, then in ``details_df`` order.
+    """
+    keys = details_df["Item Name"].astype(object).apply(normalize_key)
+    recipe_keys = ingredient_df["Item Name"].apply(normalize_key)
+    table = match_recipes(keys.unique().tolist(), recipe_keys.tolist(), threshold, path)
+
+    pairs = pd.DataFrame(
+        [(key, recipe) for key, found in table.items() for recipe in found],
+        columns=["key", "recipe_key"],
+    )
+    rows = pd.DataFrame({"key": keys.to_numpy(), "row": np.arange(len(keys))})
+    recipes = pd.DataFrame({"recipe_key": recipe_keys.to_numpy(), "recipe": np.arange(len(recipe_keys))})
+    return (
+        rows.merge(pairs, on="key")
+        .merge(recipes, on="recipe_key")
+        .sort_values(["recipe", "row"], kind="stable")[["row", "recipe"]]
+        .reset_index(drop=True)
+    )
+
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+from monthly_store import DATA_DIR
+
+# ==========================================
+# Days-of-supply and stockout projection
+# ==========================================
+# shipment.csv lists, per shipped ingredient, the quantity per shipment, its
+# unit, the number of shipments per delivery cycle and the cycle frequency.
+# Two small tables turn that into recipe units:
+#
+#   shipment_ingredients.csv  shipment name -> recipe column(s) + recipe unit
+#                             ("Peas + Carrot" feeds both peas(g) and carrot(g))
+#   unit_conversions.csv      from_unit,to_unit,factor (lbs -> g, rolls -> count)
+#
+# Each delivery cycle brings quantity x shipments; a month's usage gives the
+# daily burn rate. Days of supply is how long one cycle's delivery lasts at
+# that rate, and an ingredient stocks out when that is shorter than the
+# cycle. Everything is column arithmetic over all ingredients and periods.
+SHIPMENT_MAP_CSV = DATA_DIR / "shipment_ingredients.csv"
+UNIT_CONVERSIONS_CSV = DATA_DIR / "unit_conversions.csv"
+
+FREQUENCY_DAYS = {"weekly": 7.0, "biweekly": 14.0, "monthly": 365.25 / 12}
+
+
+def load_shipment_map(path=SHIPMENT_MAP_CSV):
+    return pd.read_csv(path).apply(lambda col: col.astype(str).str.strip())
+
+
+def load_unit_conversions(path=UNIT_CONVERSIONS_CSV):
+    conversions = pd.read_csv(path)
+    for col in ["from_unit", "to_unit"]:
+        conversions[col] = conversions[col].astype(str).str.strip().str.lower()
+    return conversions
+
+
+def shipment_supply(shipments, shipment_map, conversions):
+    """Delivery per cycle for each shipped ingredient, in recipe units.
+
+    Returns one row per shipment ingredient with ``Unit``, ``Delivery_Qty``
+    (quantity x shipments, converted), ``Frequency`` and ``Cycle_Days``.
+    Rows whose unit or frequency can't be converted are reported and dropped.
+    """
+    ship = shipments.copy()
+    ship.columns = [c.strip().lower().replace(" ", "_") for c in ship.columns]
+    ship["ingredient"] = ship["ingredient"].astype(str).str.strip()
+    ship["unit"] = ship["unit_of_shipment"].astype(str).str.strip().str.lower()
+    ship["frequency"] = ship["frequency"].astype(str).str.strip().str.lower()
+
+    units = shipment_map.drop_duplicates("shipment_ingredient")[["shipment_ingredient", "recipe_unit"]]
+    ship = ship.merge(units, left_on="ingredient", right_on="shipment_ingredient", how="left")
+    ship["recipe_unit"] = ship["recipe_unit"].str.lower()
+    ship = ship.merge(conversions, left_on=["unit", "recipe_unit"], right_on=["from_unit", "to_unit"], how="left")
+    ship.loc[ship["unit"] == ship["recipe_unit"], "factor"] = 1.0
+
+    ship["Cycle_Days"] = ship["frequency"].map(FREQUENCY_DAYS)
+    ship["Delivery_Qty"] = (
+        pd.to_numeric(ship["quantity_per_shipment"], errors="coerce")
+        * pd.to_numeric(ship["number_of_shipments"], errors="coerce")
+        * ship["factor"]
+    )
+    bad = ship["Delivery_Qty"].isna() | ship["Cycle_Days"].isna()
+    for _, row in ship[bad].iterrows():
+        print(f"⚠️ No supply projection for {row['ingredient']}: "
+              f"can't convert {row['unit']} → {row['recipe_unit']} or frequency '{row['frequency']}'")
+
+    return ship.loc[~bad, ["ingredient", "recipe_unit", "Delivery_Qty", "frequency", "Cycle_Days"]].rename(
+        columns={"ingredient": "Ingredient", "recipe_unit": "Unit", "frequency": "Frequency"}
+    ).reset_index(drop=True)
+
+
+def project_supply(usage, supply, shipment_map):
+    """Days of supply and stockout date per shipped ingredient and period.
+
+    ``usage`` is the Month x Ingredient usage table (see ingredient_usage),
+    ``supply`` comes from ``shipment_supply``. Returns ``Month, Period,
+    Ingredient, Unit, Daily_Usage, Delivery_Qty, Cycle_Days, Days_Of_Supply,
+    Stockout_Date`` where Stockout_Date is the day a delivery received at
+    the start of the period runs out, or NaT when it lasts the whole cycle.
+    """
+    columns = ["Month", "Period", "Ingredient", "Unit", "Daily_Usage", "Delivery_Qty",
+               "Cycle_Days", "Days_Of_Supply", "Stockout_Date"]
+    if usage.empty or supply.empty:
+        return pd.DataFrame(columns=columns)
+
+    mapped = usage.merge(shipment_map, left_on="Ingredient", right_on="recipe_ingredient")
+    demand = (
+        mapped.groupby(["Period", "Month", "shipment_ingredient"], as_index=False)["Total_Used"].sum()
+        .rename(columns={"shipment_ingredient": "Ingredient"})
+    )
+    proj = demand.merge(supply, on="Ingredient")
+
+    period = pd.PeriodIndex(proj["Period"].astype(str), freq="M")
+    start = pd.Series(period.start_time, index=proj.index)
+    proj["Daily_Usage"] = proj["Total_Used"] / period.days_in_month.to_numpy()
+    with np.errstate(divide="ignore"):
+        proj["Days_Of_Supply"] = proj["Delivery_Qty"] / proj["Daily_Usage"].to_numpy()
+    runs_out = proj["Days_Of_Supply"] < proj["Cycle_Days"]
+    proj["Stockout_Date"] = (start + pd.to_timedelta(proj["Days_Of_Supply"].where(runs_out), unit="D")).dt.floor("D")
+
+    return proj[columns].sort_values(["Period", "Days_Of_Supply"], ignore_index=True)
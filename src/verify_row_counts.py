@@ -1,23 +1,15 @@
 import pandas as pd
 from pathlib import Path
 
-DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+from monthly_store import discover_workbooks, month_label
 
-# All your files
-files = {
-    "May": "May_Data_Matrix (1).xlsx",
-    "June": "June_Data_Matrix.xlsx",
-    "July": "July_Data_Matrix (1).xlsx",
-    "August": "August_Data_Matrix (1).xlsx",
-    "September": "September_Data_Matrix.xlsx",
-    "October": "October_Data_Matrix_20251103_214000.xlsx"
-}
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
 
 def count_raw_rows():
-    """Count rows in every sheet for every file."""
+    """Count rows in every sheet for every discovered monthly workbook."""
     raw_counts = []
-    for month, filename in files.items():
-        file_path = DATA_DIR / filename
+    for period, file_path in discover_workbooks(DATA_DIR):
+        month = month_label(period)
         xls = pd.ExcelFile(file_path)
 
         for sheet in xls.sheet_names:
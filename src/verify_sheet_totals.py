@@ -2,31 +2,16 @@ import os
 import pandas as pd
 from pathlib import Path
 
+from currency import parse_currency
+from monthly_store import discover_workbooks, month_label
+
 # -----------------------------
 #  File paths setup
 # -----------------------------
 BASE_DIR = Path(__file__).resolve().parents[1]
 DATA_DIR = BASE_DIR / "data"
 
-excel_files = [
-    ("May", DATA_DIR / "May_Data_Matrix (1).xlsx"),
-    ("June", DATA_DIR / "June_Data_Matrix.xlsx"),
-    ("July", DATA_DIR / "July_Data_Matrix (1).xlsx"),
-    ("August", DATA_DIR / "August_Data_Matrix (1).xlsx"),
-    ("September", DATA_DIR / "September_Data_Matrix.xlsx"),
-    ("October", DATA_DIR / "October_Data_Matrix_20251103_214000.xlsx")
-]
-
-# -----------------------------
-#  Helper function: Clean numeric columns
-# -----------------------------
-def clean_amount(series):
-    return (
-        series.astype(str)
-        .replace(r"[\$,]", "", regex=True)
-        .replace("nan", "0")
-        .astype(float)
-    )
+excel_files = [(month_label(period), path) for period, path in discover_workbooks(DATA_DIR)]
 
 # -----------------------------
 #  Load and clean data
@@ -51,7 +36,9 @@ for month_name, file_path in excel_files:
             print(f"   ⚠️ Skipping sheet {sheet_name} — no 'Amount' column.")
             continue
 
-        df["Amount"] = clean_amount(df["Amount"])
+        df["Amount"], coerced = parse_currency(df["Amount"])
+        if coerced:
+            print(f"   ⚠️ {coerced} Amount cells in {sheet_name} coerced to 0")
         if "Count" in df.columns:
             df["Count"] = pd.to_numeric(df["Count"], errors="coerce").fillna(0)
         else: